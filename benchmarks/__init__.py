@@ -0,0 +1 @@
+"""Performance benchmarks for the generator and the browser runtime."""
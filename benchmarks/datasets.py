@@ -0,0 +1,121 @@
+"""Synthetic and gallery datasets for benchmarks."""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+GALLERY_DIR = Path(__file__).resolve().parent.parent / "docs" / "gallery"
+
+_SYLLABLES = ["ka", "to", "mi", "ne", "ro", "sa", "li", "pu", "ve", "do", "gen", "cyt", "hep", "ato", "neu", "ron"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def synthetic_records(
+    count: int,
+    cardinality: int = 50,
+    array_width: int = 3,
+    text_words: int = 12,
+    vocabulary: int = 5000,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Generate records with controllable facet cardinality and array widths.
+
+    Args:
+        count: Number of records
+        cardinality: Distinct values of the ``category`` and ``tags`` facets
+        array_width: Maximum number of ``tags`` per record
+        text_words: Words in each ``description``
+        vocabulary: Distinct words used in text fields
+        seed: Random seed, so runs are reproducible
+    """
+    rng = random.Random(seed)
+    words = [_word(rng) for _ in range(vocabulary)]
+    categories = [f"category-{i}" for i in range(cardinality)]
+    tags = [f"tag-{i}" for i in range(cardinality)]
+    records = []
+    for i in range(count):
+        records.append({
+            "id": f"rec:{i}",
+            "title": " ".join(rng.choice(words) for _ in range(3)),
+            "description": " ".join(rng.choice(words) for _ in range(text_words)),
+            "category": rng.choice(categories),
+            "tags": rng.sample(tags, rng.randint(1, min(array_width, len(tags)))),
+            "year": rng.randint(1900, 2025),
+            "score": round(rng.random() * 10, 2),
+        })
+    return records
+
+
+def synthetic_schema() -> Dict[str, Any]:
+    """Browser schema for :func:`synthetic_records`."""
+    return {
+        "title": "Synthetic Benchmark",
+        "description": "Generated benchmark data",
+        "searchableFields": ["title", "description", "tags"],
+        "facets": [
+            {"field": "category", "label": "Category", "type": "string", "sortBy": "count"},
+            {"field": "tags", "label": "Tags", "type": "array", "sortBy": "count"},
+            {"field": "year", "label": "Year", "type": "integer", "sortBy": "alphabetical"},
+        ],
+        "displayFields": [
+            {"field": "title", "label": "Title", "type": "string"},
+            {"field": "description", "label": "Description", "type": "string"},
+            {"field": "category", "label": "Category", "type": "string"},
+            {"field": "tags", "label": "Tags", "type": "array"},
+        ],
+    }
+
+
+def synthetic_linkml_schema(classes: int, slots_per_class: int = 5, enums: int = 10, seed: int = 0) -> str:
+    """Generate a LinkML schema YAML with the given number of classes."""
+    rng = random.Random(seed)
+    slot_names = [f"slot_{i}" for i in range(max(slots_per_class, classes * 2))]
+    lines = [
+        "id: https://example.org/bench",
+        "name: bench",
+        "prefixes:",
+        "  linkml: https://w3id.org/linkml/",
+        "  ex: https://example.org/",
+        "default_prefix: ex",
+        "default_range: string",
+        "enums:",
+    ]
+    for e in range(enums):
+        lines.append(f"  Enum{e}:")
+        lines.append("    permissible_values:")
+        lines.extend(f"      value_{v}: {{}}" for v in range(5))
+    lines.append("slots:")
+    for i, name in enumerate(slot_names):
+        lines.append(f"  {name}:")
+        lines.append(f"    description: Slot {i}")
+        if i % 7 == 0:
+            lines.append(f"    range: Enum{i % enums}")
+    lines.append("classes:")
+    for c in range(classes):
+        lines.append(f"  Class{c}:")
+        lines.append(f"    description: Class number {c}")
+        if c:
+            lines.append(f"    is_a: Class{rng.randrange(c)}")
+        lines.append("    slots:")
+        lines.extend(f"      - {name}" for name in rng.sample(slot_names, slots_per_class))
+    return "\n".join(lines) + "\n"
+
+
+def _json_from_js(path: Path, start_char: str, end_char: str) -> Any:
+    text = path.read_text()
+    return json.loads(text[text.find(start_char):text.rfind(end_char) + 1])
+
+
+def gallery_datasets() -> Iterator[Tuple[str, List[Dict[str, Any]], Dict[str, Any]]]:
+    """Yield (name, records, schema) for each gallery with data.js and schema.js."""
+    for gallery in sorted(GALLERY_DIR.iterdir()):
+        data_path = gallery / "data.js"
+        schema_path = gallery / "schema.js"
+        if data_path.exists() and schema_path.exists():
+            yield gallery.name, _json_from_js(data_path, "[", "]"), _json_from_js(schema_path, "{", "}")
@@ -0,0 +1,186 @@
+// Headless benchmark of the browser search engine in index.html.
+//
+// Usage: node --expose-gc benchmarks/js_bench.mjs <index.html> <input.json>
+//
+// input.json holds {data, schema, queries: [{query, filters, sort, fuzzy,
+// reference}]} and optionally the generated indexes (as window.searchIndexes)
+// and reportOrder, to include the result positions of each query, reportFacets,
+// to include its facet counts, reportHtml, to include its result cards, and
+// completions, a list of prefixes to report search-box suggestions for, and
+// facetSearches, [{field, text}] value filters applied to the facet counts
+// of the last query, and exports, [{format, chunkSize}] exports of its
+// results reported as their chunks. With progressive, large datasets boot in
+// slices as in a page (see progressiveBootRecords): bootQueries run before the
+// first slice, and timings cover the whole boot instead of the index builds. The
+// OptimizedFacetedSearch class is extracted from the template and run in a
+// VM context with a minimal DOM stand-in, so timings cover indexing, search,
+// facet counting and result HTML generation. Results are printed as JSON.
+
+import fs from 'node:fs';
+import vm from 'node:vm';
+import { performance } from 'node:perf_hooks';
+
+const [templatePath, inputPath] = process.argv.slice(2);
+if (!templatePath || !inputPath) {
+    console.error('Usage: node js_bench.mjs <index.html> <input.json>');
+    process.exit(2);
+}
+
+function extractClassSource(html) {
+    const classStart = html.indexOf('class OptimizedFacetedSearch');
+    if (classStart === -1) {
+        throw new Error('OptimizedFacetedSearch not found in template');
+    }
+    // Include the helpers (logger, timings) declared ahead of the class in the same script
+    const start = html.lastIndexOf('<script>', classStart) + '<script>'.length;
+    // The class body is indented by 12 spaces, its closing brace by 8
+    const closing = '\n        }\n';
+    const end = html.indexOf(closing, classStart);
+    return html.slice(start, end + closing.length);
+}
+
+function fakeElement() {
+    return {
+        hidden: true,
+        style: {},
+        dataset: {},
+        classList: { add() {}, remove() {}, toggle() {}, contains() { return false; } },
+        textContent: '',
+        innerHTML: '',
+        value: '',
+        addEventListener() {},
+        removeEventListener() {},
+        appendChild() {},
+        removeChild() {},
+        remove() {},
+        setAttribute() {},
+        querySelector() { return null; },
+        querySelectorAll() { return []; },
+        closest() { return null; },
+        scrollIntoView() {}
+    };
+}
+
+function createContext() {
+    const elements = new Map();
+    const storage = new Map();
+    const noop = () => {};
+    const context = {
+        document: {
+            getElementById(id) {
+                if (!elements.has(id)) elements.set(id, fakeElement());
+                return elements.get(id);
+            },
+            createElement: fakeElement,
+            addEventListener: noop,
+            body: fakeElement(),
+            head: fakeElement()
+        },
+        localStorage: {
+            getItem(key) { return storage.has(key) ? storage.get(key) : null; },
+            setItem(key, value) { storage.set(key, String(value)); },
+            removeItem(key) { storage.delete(key); }
+        },
+        console: { log: noop, info: noop, debug: noop, warn: noop, error: noop },
+        performance,
+        setTimeout,
+        clearTimeout,
+        URLSearchParams,
+        structuredClone,
+        atob
+    };
+    context.window = context;
+    return vm.createContext(context);
+}
+
+function heapMb() {
+    if (global.gc) global.gc();
+    return process.memoryUsage().heapUsed / (1024 * 1024);
+}
+
+async function time(fn) {
+    const start = performance.now();
+    const value = await fn();
+    return { ms: performance.now() - start, value };
+}
+
+const html = fs.readFileSync(templatePath, 'utf8');
+const input = JSON.parse(fs.readFileSync(inputPath, 'utf8'));
+const context = createContext();
+vm.runInContext(`${extractClassSource(html)}\nthis.OptimizedFacetedSearch = OptimizedFacetedSearch;\nthis.perfMonitor = perfMonitor;`, context);
+const SearchClass = context.OptimizedFacetedSearch;
+
+context.searchIndexes = input.indexes;
+
+if (input.progressive) {
+    context.requestAnimationFrame = callback => setTimeout(callback, 16);
+}
+
+const heapBefore = heapMb();
+const construct = await time(() => new SearchClass(input.data, input.schema));
+const app = construct.value;
+
+const bootQueries = [];
+for (const query of input.bootQueries || []) {
+    app.currentQuery = query;
+    app.search();
+    bootQueries.push({ query, indexed: app.indexedCount, results: app.getResultTotal() });
+}
+
+const boot = input.progressive ? await time(() => app.ready) : null;
+const heapAfter = heapMb();
+
+const searchIndex = boot || await time(() => app.buildSearchIndex());
+const facetIndex = boot || await time(() => app.buildFacetIndex());
+
+const positions = input.reportOrder ? new Map(input.data.map((item, idx) => [item, idx])) : null;
+const queries = [];
+for (const { query, filters, sort, fuzzy, reference } of input.queries) {
+    app.fuzzyEnabled = !!fuzzy;
+    app.currentQuery = query || '';
+    app.currentFilters = JSON.parse(JSON.stringify(filters || {}));
+    app.currentSort = sort || null;
+    app.referenceFocus = null;
+    // A reference is the dataset of a clicked link (see followReference)
+    const run = await time(() => reference ? app.followReference(reference) : app.search());
+    const report = { query: app.currentQuery, filters: app.currentFilters, ms: run.ms, results: app.getResultTotal() };
+    if (input.reportHtml) {
+        report.html = context.document.getElementById('resultsGrid').innerHTML;
+    }
+    if (positions) {
+        report.order = app.currentFilteredData.map(item => positions.get(item));
+    }
+    if (input.reportFacets) {
+        report.facets = Object.fromEntries(Object.entries(app.currentFacetCounts).map(([field, counts]) => [field, Array.from(counts)]));
+        report.partialFacets = Array.from(app.partialFacets);
+    }
+    queries.push(report);
+}
+
+const completions = {};
+for (const prefix of input.completions || []) {
+    completions[prefix] = app.completions(prefix).map(entry => [entry.token, entry.count]);
+}
+
+const facetSearches = (input.facetSearches || []).map(({ field, text }) => {
+    app.facetFilterText[field] = text;
+    const facet = input.schema.facets.find(f => f.field === field);
+    return app.facetBuckets(facet, app.currentFacetCounts[field]).map(bucket => [bucket.key, bucket.doc_count]);
+});
+
+const exports = (input.exports || []).map(({ format, chunkSize }) =>
+    Array.from(app.exportChunks(format, app.currentFilteredData, chunkSize)));
+
+process.stdout.write(JSON.stringify({
+    node: process.version,
+    constructor_ms: construct.ms,
+    build_search_index_ms: searchIndex.ms,
+    build_facet_index_ms: facetIndex.ms,
+    heap_mb: heapAfter - heapBefore,
+    queries,
+    boot_queries: bootQueries,
+    completions,
+    facetSearches,
+    exports,
+    phases: context.perfMonitor.summary()
+}));
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Benchmark the generator and the browser runtime, and compare against a baseline.
+
+Each Python step is timed (best of ``--repeat`` runs) and then run once more
+under ``tracemalloc`` for its peak memory. The browser search engine is timed
+headlessly in Node via ``benchmarks/js_bench.mjs``.
+
+Example:
+  python benchmarks/run_benchmarks.py --sizes 1000,100000 --gallery \
+    --output bench-results.json \
+    --baseline benchmarks/baselines/baseline.json --threshold 1.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.datasets import (
+    gallery_datasets,
+    synthetic_linkml_schema,
+    synthetic_records,
+    synthetic_schema,
+)
+from linkml_browser.core import BrowserGenerator, extract_linkml_elements
+
+BENCH_DIR = Path(__file__).resolve().parent
+TEMPLATE = BENCH_DIR.parent / "src" / "linkml_browser" / "index.html"
+JS_BENCH = BENCH_DIR / "js_bench.mjs"
+
+
+def _parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    """Return (best wall seconds, peak MiB) for a callable."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def _result(benchmark: str, dataset: str, wall_s: float, **extra: Any) -> Dict[str, Any]:
+    return {"benchmark": benchmark, "dataset": dataset, "wall_s": round(wall_s, 6), **extra}
+
+
+def bench_generator(name: str, data: List[Dict[str, Any]], schema: Optional[Dict[str, Any]],
+                    workdir: Path, repeat: int) -> List[Dict[str, Any]]:
+    """Benchmark schema inference and data.js/schema.js serialization."""
+    results = []
+    generator = BrowserGenerator(data, schema)
+
+    wall, peak = _measure(lambda: generator.infer_schema(), repeat)
+    results.append(_result("python.infer_schema", name, wall, peak_mb=round(peak, 3)))
+
+    data_js = workdir / "data.js"
+    wall, peak = _measure(lambda: generator._create_data_js(data_js), repeat)
+    results.append(_result("python.create_data_js", name, wall, peak_mb=round(peak, 3),
+                           output_bytes=data_js.stat().st_size))
+
+    schema_js = workdir / "schema.js"
+    wall, peak = _measure(lambda: generator._create_schema_js(schema_js), repeat)
+    results.append(_result("python.create_schema_js", name, wall, peak_mb=round(peak, 3),
+                           output_bytes=schema_js.stat().st_size))
+    return results
+
+
+def bench_linkml(classes: int, workdir: Path, repeat: int) -> Dict[str, Any]:
+    """Benchmark extract_linkml_elements on a generated LinkML schema."""
+    path = workdir / f"schema-{classes}.yaml"
+    path.write_text(synthetic_linkml_schema(classes))
+    elements: List[Dict[str, Any]] = []
+
+    def run() -> None:
+        elements[:] = extract_linkml_elements(path)
+
+    wall, peak = _measure(run, repeat)
+    return _result("python.extract_linkml_elements", f"linkml-{classes}", wall, peak_mb=round(peak, 3),
+                   output_bytes=len(json.dumps(elements)))
+
+
+def sample_queries(data: List[Dict[str, Any]], schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Pick representative queries from the data itself."""
+    words: List[str] = []
+    for item in data[:50]:
+        for field in schema.get("searchableFields", []):
+            value = item.get(field)
+            if isinstance(value, str):
+                words.extend(value.lower().split())
+    queries: List[Dict[str, Any]] = [{"query": "", "filters": {}}]
+    if words:
+        queries.append({"query": words[0], "filters": {}})
+        queries.append({"query": words[0][:3], "filters": {}})
+        queries.append({"query": " ".join(words[:2]), "filters": {}})
+    for facet in schema.get("facets", []):
+        field = facet["field"]
+        value = next((item.get(field) for item in data if item.get(field) not in (None, "", [])), None)
+        if value is None:
+            continue
+        if facet.get("type") in ("integer", "float"):
+            queries.append({"query": "", "filters": {field: {"min": value, "max": value + 10}}})
+        else:
+            first = value[0] if isinstance(value, list) else value
+            queries.append({"query": words[0][:3] if words else "", "filters": {field: [str(first)]}})
+        break
+    return queries
+
+
+def bench_js(name: str, data: List[Dict[str, Any]], schema: Dict[str, Any],
+             workdir: Path, node: str) -> List[Dict[str, Any]]:
+    """Benchmark the browser search engine headlessly in Node."""
+    input_path = workdir / "js-input.json"
+    input_path.write_text(json.dumps({"data": data, "schema": schema, "queries": sample_queries(data, schema)}))
+    proc = subprocess.run(
+        [node, "--expose-gc", "--max-old-space-size=8192", str(JS_BENCH), str(TEMPLATE), str(input_path)],
+        capture_output=True, text=True, check=True,
+    )
+    report = json.loads(proc.stdout)
+    search_ms = sorted(q["ms"] for q in report["queries"])
+    return [
+        _result("js.constructor", name, report["constructor_ms"] / 1000, heap_mb=round(report["heap_mb"], 3)),
+        _result("js.build_search_index", name, report["build_search_index_ms"] / 1000),
+        _result("js.build_facet_index", name, report["build_facet_index_ms"] / 1000),
+        _result("js.search_median", name, search_ms[len(search_ms) // 2] / 1000, queries=report["queries"],
+                phases=report["phases"]),
+    ]
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[str]:
+    """Print a comparison table and return the regressed benchmark keys."""
+    previous = {(r["benchmark"], r["dataset"]): r for r in baseline}
+    regressions = []
+    print(f"{'benchmark':<34} {'dataset':<22} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for result in results:
+        key = (result["benchmark"], result["dataset"])
+        old = previous.get(key)
+        if old is None or not old["wall_s"]:
+            print(f"{key[0]:<34} {key[1]:<22} {'-':>10} {result['wall_s']:>10.4f} {'new':>7}")
+            continue
+        ratio = result["wall_s"] / old["wall_s"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(f"{key[0]} [{key[1]}]")
+            flag = "  REGRESSION"
+        print(f"{key[0]:<34} {key[1]:<22} {old['wall_s']:>10.4f} {result['wall_s']:>10.4f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000", help="Comma-separated synthetic dataset sizes")
+    parser.add_argument("--cardinality", type=int, default=50, help="Distinct facet values in synthetic data")
+    parser.add_argument("--array-width", type=int, default=3, help="Maximum array facet width in synthetic data")
+    parser.add_argument("--gallery", action="store_true", help="Also benchmark the docs/gallery datasets")
+    parser.add_argument("--linkml-classes", default="50,500", help="Comma-separated LinkML schema sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per Python step (best is kept)")
+    parser.add_argument("--skip-js", action="store_true", help="Skip the Node runtime benchmarks")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Compare wall times against a previous results JSON")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio counted as a regression (default: 1.25)")
+    args = parser.parse_args()
+
+    node = None if args.skip_js else shutil.which("node")
+    if not args.skip_js and node is None:
+        print("node not found; skipping JS benchmarks", file=sys.stderr)
+
+    datasets: List[Tuple[str, List[Dict[str, Any]], Optional[Dict[str, Any]]]] = []
+    for size in _parse_ints(args.sizes):
+        records = synthetic_records(size, cardinality=args.cardinality, array_width=args.array_width)
+        datasets.append((f"synthetic-{size}", records, synthetic_schema()))
+    if args.gallery:
+        datasets.extend(gallery_datasets())
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for name, data, schema in datasets:
+            print(f"Benchmarking {name} ({len(data)} records)", file=sys.stderr)
+            results.extend(bench_generator(name, data, schema, workdir, args.repeat))
+            if node:
+                results.extend(bench_js(name, data, schema or BrowserGenerator(data).schema, workdir, node))
+        for classes in _parse_ints(args.linkml_classes):
+            print(f"Benchmarking LinkML schema with {classes} classes", file=sys.stderr)
+            results.append(bench_linkml(classes, workdir, args.repeat))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text())["results"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold}x: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
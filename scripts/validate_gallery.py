@@ -4,17 +4,10 @@
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
 
-
-def _load_json_from_js(path: Path, start_char: str, end_char: str, label: str):
-    text = path.read_text()
-    start = text.find(start_char)
-    end = text.rfind(end_char)
-    if start == -1 or end == -1:
-        raise ValueError(f"{label}: could not locate JSON {start_char}...{end_char} in {path}")
-    return json.loads(text[start : end + 1])
+from linkml_browser.reader import iter_records, read_js_value
+from linkml_browser.validation import format_report, validate_records
 
 
 def main() -> None:
@@ -41,16 +34,7 @@ def main() -> None:
         raise SystemExit(1)
 
     try:
-        data = _load_json_from_js(data_path, "[", "]", "data.js")
-        if not isinstance(data, list):
-            raise ValueError("data.js JSON is not an array")
-        print(f"data.js OK: {len(data)} records")
-    except Exception as exc:
-        print(f"data.js error: {exc}")
-        raise SystemExit(1)
-
-    try:
-        schema = _load_json_from_js(schema_path, "{", "}", "schema.js")
+        schema = read_js_value(schema_path)
         if not isinstance(schema, dict):
             raise ValueError("schema.js JSON is not an object")
         print(f"schema.js OK: keys={list(schema.keys())[:10]}")
@@ -58,6 +42,16 @@ def main() -> None:
         print(f"schema.js error: {exc}")
         raise SystemExit(1)
 
+    # Records are streamed from data.js and checked against the schema in chunks
+    try:
+        report = validate_records(iter_records(data_path), schema)
+    except Exception as exc:
+        print(f"data.js error: {exc}")
+        raise SystemExit(1)
+    print(f"data.js {'OK' if not report['problems'] else 'problems'}: {format_report(report)}")
+    if report["problems"]:
+        raise SystemExit(1)
+
     print("All checks passed")
 
 
@@ -1,11 +1,23 @@
 """Core functionality for LinkML Browser."""
 
 import json
+import re
 import shutil
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union
 
-from linkml_runtime.utils.schemaview import SchemaView  # type: ignore[import-untyped]
+from .indexes import build_indexes, write_indexes_js
+from .query import parse_date, parse_datetime
+from .serialize import write_json_js, write_records_js
+
+if TYPE_CHECKING:
+    # Imported when a schema is loaded, as linkml_runtime takes most of a second to import
+    from linkml_runtime.utils.schemaview import SchemaView  # type: ignore[import-untyped]
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DATETIME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2})?$")
+
+TEMPLATE_PATH = Path(__file__).parent / "index.html"
 
 
 class BrowserGenerator:
@@ -50,8 +62,10 @@ class BrowserGenerator:
                 'has_array': False,
                 'has_string': False,
                 'has_number': False,
+                'has_bool': False,
                 'unique_values': set(),
-                'all_numbers': True
+                'all_dates': True,
+                'all_datetimes': True
             }
             
             for item in self.data[:sample_size]:
@@ -63,13 +77,19 @@ class BrowserGenerator:
                         for v in value:
                             if isinstance(v, (str, int, float)):
                                 field_info[key]['unique_values'].add(str(v))
+                    elif isinstance(value, bool):
+                        field_info[key]['has_bool'] = True
+                        field_info[key]['unique_values'].add(str(value).lower())
                     elif isinstance(value, (int, float)):
                         field_info[key]['has_number'] = True
                         field_info[key]['unique_values'].add(str(value))
                     elif isinstance(value, str):
                         field_info[key]['has_string'] = True
-                        field_info[key]['all_numbers'] = False
                         field_info[key]['unique_values'].add(value)
+                        if not (DATE_PATTERN.match(value) and parse_date(value) is not None):
+                            field_info[key]['all_dates'] = False
+                        if not (DATETIME_PATTERN.match(value) and parse_datetime(value) is not None):
+                            field_info[key]['all_datetimes'] = False
         
         # Build schema
         schema: Dict[str, Any] = {
@@ -78,6 +98,7 @@ class BrowserGenerator:
             "searchPlaceholder": "Search...",
             "searchableFields": [],
             "facets": [],
+            "sortableFields": [],
             "displayFields": []
         }
         
@@ -94,19 +115,14 @@ class BrowserGenerator:
         for key, info in field_info.items():
             unique_count = len(info['unique_values'])
             
-            # Skip fields with too many unique values (likely IDs)
-            if unique_count > 1 and unique_count < 100:
-                facet_type = "array" if info['has_array'] else "string"
-                
-                # Check if all values are integers
-                if info['all_numbers'] and not info['has_array']:
-                    try:
-                        # Try to parse all values as integers
-                        int_values = [int(v) for v in info['unique_values'] if v]
-                        if len(int_values) == len(info['unique_values']):
-                            facet_type = "integer"
-                    except ValueError:
-                        pass
+            facet_type = self._scalar_type(info)
+            
+            # Skip fields with too many unique values (likely IDs); float and
+            # date facets are range sliders over histogram bins, so any count
+            # works, but distinct integers are as likely to be IDs as strings
+            if unique_count > 1 and (unique_count < 100 or facet_type in ("float", "date", "datetime")):
+                if facet_type is None:
+                    facet_type = "array" if info['has_array'] else "string"
                 
                 schema["facets"].append({
                     "field": key,
@@ -115,6 +131,16 @@ class BrowserGenerator:
                     "sortBy": "count"
                 })
         
+        # Sort by numeric and date facets and by a name-like field
+        for facet in schema["facets"]:
+            if facet["type"] in ("integer", "float", "date", "datetime"):
+                schema["sortableFields"].append(facet["field"])
+        for key in ("name", "title", "label"):
+            info = field_info.get(key)
+            if info and info['has_string'] and not info['has_array']:
+                schema["sortableFields"].insert(0, key)
+                break
+        
         # Display all fields
         for key in sorted(all_keys):
             field_type = "array" if field_info[key]['has_array'] else "string"
@@ -126,12 +152,68 @@ class BrowserGenerator:
         
         return schema
     
-    def generate(self, output_dir: Path, force: bool = False) -> None:
+    @classmethod
+    def _scalar_type(cls, info: Dict[str, Any]) -> Optional[str]:
+        """Return a typed facet type for a field whose values all share one.
+
+        Args:
+            info: Field statistics gathered by :meth:`infer_schema`
+
+        Returns:
+            ``boolean``, ``integer``, ``float``, ``date`` or ``datetime``, or
+            None for mixed, text and array fields
+        """
+        if info['has_array']:
+            return None
+        kinds = [info['has_bool'], info['has_number'], info['has_string']]
+        if sum(kinds) != 1:
+            return None
+        if info['has_bool']:
+            return "boolean"
+        if info['has_number']:
+            numeric_type = cls._numeric_type(info['unique_values'])
+            return numeric_type if numeric_type != "string" else None
+        if info['all_dates']:
+            return "date"
+        if info['all_datetimes']:
+            return "datetime"
+        return None
+
+    @staticmethod
+    def _numeric_type(values: Set[str]) -> str:
+        """Return the facet type for a set of stringified numbers.
+
+        Args:
+            values: Unique values of the field
+
+        Returns:
+            ``integer``, ``float``, or ``string`` if some value is not a number
+        """
+        for facet_type, parse in (("integer", int), ("float", float)):
+            try:
+                for value in values:
+                    parse(value)
+            except ValueError:
+                continue
+            return facet_type
+        return "string"
+    
+    def generate(self, output_dir: Path, force: bool = False, binary_index: bool = False,
+                 sqlite: bool = False, index_html: Optional[str] = None, pretty: bool = False,
+                 workers: Optional[int] = None, offline: bool = False) -> None:
         """Generate the browser files in the specified directory.
         
         Args:
             output_dir: Directory to generate files in
             force: Whether to overwrite existing directory
+            binary_index: Also write a memory-mappable ``index.lbi`` for querying from Python
+            sqlite: Also write ``data.sqlite`` with records, facet values and a full-text index
+            index_html: Page to write instead of the packaged template, such as
+                one linking shared assets (see :mod:`linkml_browser.gallery`)
+            pretty: Indent data.js and schema.js instead of minifying them
+            workers: Processes encoding data.js (default: CPU count)
+            offline: Also write a service worker precaching the browser, so
+                repeat visits load it from the cache (see :mod:`linkml_browser.offline`)
         """
         # Create output directory
         if output_dir.exists():
@@ -143,33 +225,45 @@ class BrowserGenerator:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Copy index.html
-        template_path = Path(__file__).parent / "index.html"
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template file not found at {template_path}")
-        
-        shutil.copy(template_path, output_dir / "index.html")
+        if index_html is not None:
+            (output_dir / "index.html").write_text(index_html)
+        else:
+            if not TEMPLATE_PATH.exists():
+                raise FileNotFoundError(f"Template file not found at {TEMPLATE_PATH}")
+            shutil.copy(TEMPLATE_PATH, output_dir / "index.html")
         
         # Create data.js
-        self._create_data_js(output_dir / "data.js")
+        self._create_data_js(output_dir / "data.js", pretty, workers)
         
         # Create schema.js
-        self._create_schema_js(output_dir / "schema.js")
+        self._create_schema_js(output_dir / "schema.js", pretty)
+
+        # Create indexes.js
+        self._create_indexes_js(output_dir / "indexes.js")
+
+        if binary_index:
+            from .index_format import write_index
+            write_index(output_dir / "index.lbi", self.data, self.schema)
+
+        if sqlite:
+            from .sqlite_export import write_sqlite
+            write_sqlite(output_dir / "data.sqlite", self.data, self.schema)
+
+        if offline:
+            from .offline import write_service_worker
+            write_service_worker(output_dir)
     
-    def _create_data_js(self, output_path: Path) -> None:
-        """Create data.js file from JSON data."""
-        js_content = f"window.searchData = {json.dumps(self.data, indent=2)};\n"
-        js_content += "window.dispatchEvent(new Event('searchDataReady'));\n"
-        
-        with open(output_path, 'w') as f:
-            f.write(js_content)
+    def _create_data_js(self, output_path: Path, pretty: bool = False, workers: Optional[int] = None) -> None:
+        """Create data.js file from JSON data, streamed in chunks."""
+        write_records_js(output_path, self.data, pretty=pretty, workers=workers)
     
-    def _create_schema_js(self, output_path: Path) -> None:
+    def _create_indexes_js(self, output_path: Path) -> None:
+        """Create indexes.js with precomputed browser indexes."""
+        write_indexes_js(output_path, build_indexes(self.data, self.schema))
+
+    def _create_schema_js(self, output_path: Path, pretty: bool = False) -> None:
         """Create schema.js file from schema definition."""
-        js_content = f"window.searchSchema = {json.dumps(self.schema, indent=2)};\n"
-        js_content += "window.dispatchEvent(new Event('searchDataReady'));\n"
-        
-        with open(output_path, 'w') as f:
-            f.write(js_content)
+        write_json_js(output_path, self.schema, "window.searchSchema", pretty=pretty)
 
 
 def load_json_data(file_path: Path) -> List[Dict[str, Any]]:
@@ -229,7 +323,7 @@ LINKML_BROWSER_SCHEMA: Dict[str, Any] = {
         {"field": "classes", "label": "Used By Class", "type": "array", "sortBy": "count"},
         {"field": "slots", "label": "Used By Slot", "type": "array", "sortBy": "count"},
         {"field": "range", "label": "Range", "type": "string", "sortBy": "count"},
-        {"field": "is_a", "label": "Parent", "type": "string", "sortBy": "count"},
+        {"field": "is_a", "label": "Parent", "type": "hierarchy", "idField": "name", "sortBy": "count"},
         {"field": "required", "label": "Required", "type": "string", "sortBy": "count"},
         {"field": "multivalued", "label": "Multivalued", "type": "string", "sortBy": "count"},
         {"field": "abstract", "label": "Abstract", "type": "string", "sortBy": "count"},
@@ -253,6 +347,11 @@ LINKML_BROWSER_SCHEMA: Dict[str, Any] = {
         {"field": "keywords", "label": "Keywords", "type": "array"},
         {"field": "mappings", "label": "Mappings", "type": "array"},
     ],
+    # Fields naming other elements, shown as links (see indexes.reference_graph)
+    "references": {
+        "idField": "name",
+        "fields": ["is_a", "mixins", "range", "domain", "classes", "slots"],
+    },
 }
 
 
@@ -272,7 +371,7 @@ def _add_if_present(d: Dict[str, Any], key: str, value: Any) -> None:
         d[key] = value
 
 
-def _expand_uri(sv: SchemaView, uri: Optional[str]) -> Optional[str]:
+def _expand_uri(sv: "SchemaView", uri: Optional[str]) -> Optional[str]:
     """Expand a CURIE to a full URI if possible."""
     if not uri:
         return None
@@ -280,7 +379,7 @@ def _expand_uri(sv: SchemaView, uri: Optional[str]) -> Optional[str]:
     return expanded if expanded else uri
 
 
-def _build_slot_to_classes_map(sv: SchemaView) -> Dict[str, List[str]]:
+def _build_slot_to_classes_map(sv: "SchemaView") -> Dict[str, List[str]]:
     """Build a mapping from slot names to the classes that use them."""
     slot_to_classes: Dict[str, List[str]] = {}
     for cls_name in sv.all_classes():
@@ -291,7 +390,7 @@ def _build_slot_to_classes_map(sv: SchemaView) -> Dict[str, List[str]]:
     return slot_to_classes
 
 
-def _build_enum_to_slots_map(sv: SchemaView) -> Dict[str, List[str]]:
+def _build_enum_to_slots_map(sv: "SchemaView") -> Dict[str, List[str]]:
     """Build a mapping from enum names to slots that use them as range."""
     enum_to_slots: Dict[str, List[str]] = {}
     for slot in sv.all_slots().values():
@@ -315,6 +414,8 @@ def extract_linkml_elements(schema_paths: Union[Path, List[Path]]) -> List[Dict[
     if isinstance(schema_paths, Path):
         schema_paths = [schema_paths]
 
+    from linkml_runtime.utils.schemaview import SchemaView  # type: ignore[import-untyped]
+
     # Load and merge schemas
     sv = SchemaView(str(schema_paths[0]))
     for schema_path in schema_paths[1:]:
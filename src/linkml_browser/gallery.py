@@ -0,0 +1,420 @@
+"""Batch builds of many browsers from one manifest.
+
+A manifest (JSON or YAML) lists galleries by name; paths are relative to the
+manifest::
+
+    output: docs/gallery
+    galleries:
+      books:
+        data: ../tests/test_data.json
+        title: Books Browser
+      ai-gene-review:
+        data: ../../ai-gene-review/app/data.js
+        schema: ai-gene-review-schema.json
+        filter:
+          status_allow: [COMPLETE, DRAFT]
+          taxon_allow: ["NCBITaxon:9606"]
+          balance_by: taxon_id
+          max_records: 500
+      my-model:
+        linkml_schemas: [model.yaml]
+
+Each gallery takes ``data`` (any source :func:`~linkml_browser.reader.iter_records`
+reads, such as a JSON array or an existing ``data.js``) or
+``linkml_schemas`` (to browse the schema elements, like ``deploy-schema``),
+and optionally ``schema``, ``title``, ``description``, ``filter``,
+``validate``, ``pretty``, ``binary_index``, ``sqlite`` and ``offline``.
+
+The template's stylesheet and script are written once to content-addressed
+files in a shared assets directory, which every gallery page links, so a
+browser caches them across galleries. Galleries are built in a process
+pool, and a gallery is skipped when the fingerprint of its entry, its input
+files, the template and the package version matches the previous build.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .core import (
+    TEMPLATE_PATH,
+    BrowserGenerator,
+    extract_linkml_elements,
+    get_linkml_browser_schema,
+    load_schema,
+)
+from .reader import load_records
+
+STATE_FILE = ".linkml-browser-build.json"
+DEFAULT_ASSETS_DIR = "assets"
+
+_STYLE = re.compile(r"<style>(.*?)</style>", re.S)
+_ASSET_NAME = re.compile(r"^browser\.[0-9a-f]{16}\.(css|js)$")
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    """Load a build manifest, resolving its paths against the manifest directory.
+
+    Args:
+        path: JSON or YAML manifest
+
+    Returns:
+        Manifest with absolute ``output`` and ``assets`` paths and a
+        ``galleries`` mapping of name to entry
+
+    Raises:
+        ValueError: If the manifest lists no galleries, or an entry is not a
+            mapping or has no input
+    """
+    text = path.read_text()
+    if path.suffix in (".yaml", ".yml"):
+        import yaml
+
+        manifest = yaml.safe_load(text) or {}
+    else:
+        manifest = json.loads(text)
+
+    base = path.parent.resolve()
+    galleries = manifest.get("galleries") or {}
+    if not galleries:
+        raise ValueError(f"No galleries listed in {path}")
+    if not isinstance(galleries, dict):
+        raise ValueError(f"'galleries' in {path} must map gallery names to entries")
+    output = base / manifest.get("output", ".")
+    resolved: Dict[str, Any] = {}
+    for position, (name, entry) in enumerate(galleries.items(), 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Gallery '{name}' (entry {position} in {path}) must be a mapping")
+        entry = dict(entry)
+        if not entry.get("data") and not entry.get("linkml_schemas"):
+            raise ValueError(f"Gallery '{name}' needs 'data' or 'linkml_schemas'")
+        if entry.get("data"):
+            entry["data"] = str(base / entry["data"])
+        if entry.get("schema"):
+            entry["schema"] = str(base / entry["schema"])
+        entry["linkml_schemas"] = [str(base / p) for p in entry.get("linkml_schemas", [])]
+        resolved[name] = entry
+    return {
+        "output": output,
+        "assets": output / manifest.get("assets", DEFAULT_ASSETS_DIR),
+        "galleries": resolved,
+    }
+
+
+def filter_records(
+    records: List[Dict[str, Any]],
+    status_allow: Iterable[str] = (),
+    taxon_allow: Iterable[str] = (),
+    balance_by: Optional[str] = None,
+    max_records: int = 0,
+) -> List[Dict[str, Any]]:
+    """Select a subset of records for a gallery.
+
+    Args:
+        records: Records to filter
+        status_allow: Keep only these ``status`` values (case-insensitive)
+        taxon_allow: Keep only these ``taxon_id`` values
+        balance_by: Field whose values share ``max_records`` equally
+        max_records: Maximum records to keep (0 keeps all)
+
+    Returns:
+        The selected records
+    """
+    status_allow_set = {s.upper() for s in status_allow}
+    taxon_allow_set = set(taxon_allow)
+
+    def keep(rec: Dict[str, Any]) -> bool:
+        if status_allow_set:
+            status = str(rec.get("status", "")).upper()
+            if status not in status_allow_set:
+                return False
+        if taxon_allow_set:
+            taxon = str(rec.get("taxon_id", ""))
+            if taxon not in taxon_allow_set:
+                return False
+        return True
+
+    filtered = [rec for rec in records if keep(rec)]
+
+    if not max_records or len(filtered) <= max_records:
+        return filtered
+
+    if balance_by:
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for rec in filtered:
+            key = str(rec.get(balance_by, ""))
+            groups.setdefault(key, []).append(rec)
+
+        keys = list(groups.keys())
+        if not keys:
+            return filtered[:max_records]
+
+        per_group = max_records // len(keys)
+        sample: List[Dict[str, Any]] = []
+        for key in keys:
+            sample.extend(groups[key][:per_group])
+
+        if len(sample) < max_records:
+            seen = {rec.get("id") for rec in sample if rec.get("id")}
+            for rec in filtered:
+                rid = rec.get("id")
+                if rid in seen:
+                    continue
+                sample.append(rec)
+                if len(sample) >= max_records:
+                    break
+
+        return sample[:max_records]
+
+    return filtered[:max_records]
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def split_template(html: str) -> Tuple[str, str, str]:
+    """Split the browser template into its page, stylesheet and script.
+
+    Args:
+        html: Template HTML
+
+    Returns:
+        ``(page, css, js)``, where ``page`` links ``__ASSET_CSS__`` and
+        ``__ASSET_JS__`` in place of the inline style and application script
+    """
+    style = _STYLE.search(html)
+    script_start = html.rindex("<script>")
+    script_end = html.index("</script>", script_start)
+    if style is None or style.end() > script_start:
+        raise ValueError("Template does not have an inline style followed by the application script")
+    js = html[script_start + len("<script>"):script_end]
+    page = (
+        html[:style.start()]
+        + '<link rel="stylesheet" href="__ASSET_CSS__">'
+        + html[style.end():script_start]
+        + '<script src="__ASSET_JS__"></script>'
+        + html[script_end + len("</script>"):]
+    )
+    return page, style.group(1), js
+
+
+def write_shared_assets(assets_dir: Path, html: str) -> Tuple[str, Dict[str, str]]:
+    """Write the template's stylesheet and script as content-addressed files.
+
+    Files that already exist are left alone, since their name is their hash.
+
+    Args:
+        assets_dir: Shared assets directory
+        html: Template HTML
+
+    Returns:
+        The page with asset placeholders, and the asset file names by kind
+        (``css`` and ``js``)
+    """
+    page, css, js = split_template(html)
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    names = {}
+    for kind, content in (("css", css), ("js", js)):
+        names[kind] = f"browser.{_digest(content)}.{kind}"
+        target = assets_dir / names[kind]
+        if not target.exists():
+            tmp = target.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(content)
+            tmp.replace(target)
+    return page, names
+
+
+def gallery_page(page: str, names: Dict[str, str], gallery_dir: Path, assets_dir: Path) -> str:
+    """Fill the asset placeholders of a page with paths relative to a gallery.
+
+    Args:
+        page: Page returned by :func:`write_shared_assets`
+        names: Asset file names returned by :func:`write_shared_assets`
+        gallery_dir: Directory the page is written to
+        assets_dir: Shared assets directory
+
+    Returns:
+        The gallery's ``index.html``
+    """
+    prefix = Path(os.path.relpath(assets_dir, gallery_dir)).as_posix()
+    return page.replace("__ASSET_CSS__", f"{prefix}/{names['css']}").replace("__ASSET_JS__", f"{prefix}/{names['js']}")
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _package_version() -> str:
+    try:
+        return version("linkml-browser")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def gallery_fingerprint(entry: Dict[str, Any], index_html: str) -> str:
+    """Fingerprint everything a gallery's output depends on.
+
+    Args:
+        entry: Resolved manifest entry
+        index_html: Gallery page, which names the assets by their hash
+
+    Returns:
+        Hex digest of the entry, the contents of its input files, the page
+        and the package version
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps(entry, sort_keys=True).encode())
+    h.update(index_html.encode())
+    h.update(_package_version().encode())
+    for path in [entry.get("data"), entry.get("schema"), *entry["linkml_schemas"]]:
+        if path:
+            path = Path(path)
+            if path.is_dir():
+                # A deployed browser is read from its data.js, as load_records does
+                path = path / "data.js"
+            # A missing input fails the build, which leaves no fingerprint to match
+            h.update((_file_digest(path) if path.is_file() else "missing").encode())
+    return h.hexdigest()
+
+
+def build_gallery(name: str, entry: Dict[str, Any], gallery_dir: Path, index_html: str) -> Dict[str, Any]:
+    """Build one gallery.
+
+    Args:
+        name: Gallery name
+        entry: Resolved manifest entry
+        gallery_dir: Output directory, replaced if it exists
+        index_html: Page to write as ``index.html``
+
+    Returns:
+        ``{"name", "records", "seconds"}``
+
+    Raises:
+        ValueError: If validation is requested and finds problems
+    """
+    start = time.perf_counter()
+    if entry.get("linkml_schemas"):
+        data = extract_linkml_elements([Path(p) for p in entry["linkml_schemas"]])
+        schema = load_schema(Path(entry["schema"])) if entry.get("schema") else \
+            get_linkml_browser_schema(entry.get("title") or f"{name} Schema Browser", entry.get("description"))
+    else:
+        data = load_records(Path(entry["data"]))
+        options = entry.get("filter") or {}
+        if options:
+            data = filter_records(data, options.get("status_allow", ()), options.get("taxon_allow", ()),
+                                  options.get("balance_by"), options.get("max_records", 0))
+        if entry.get("schema"):
+            schema = load_schema(Path(entry["schema"]))
+        else:
+            schema = BrowserGenerator(data).infer_schema(entry.get("title", "Data Browser"),
+                                                         entry.get("description", "Browse and filter data"))
+
+    if entry.get("validate"):
+        from .validation import format_report, validate_records
+
+        report = validate_records(data, schema, workers=1)
+        if report["problems"]:
+            raise ValueError(format_report(report))
+
+    # Galleries are built in parallel already, so each encodes its data.js serially
+    BrowserGenerator(data, schema).generate(gallery_dir, force=True, binary_index=entry.get("binary_index", False),
+                                            sqlite=entry.get("sqlite", False), index_html=index_html,
+                                            pretty=entry.get("pretty", False), workers=1,
+                                            offline=entry.get("offline", False))
+    return {"name": name, "records": len(data), "seconds": time.perf_counter() - start}
+
+
+def _read_state(path: Path) -> Dict[str, str]:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _prune_assets(assets_dir: Path, keep: Iterable[str]) -> None:
+    keep = set(keep)
+    for path in assets_dir.iterdir():
+        if _ASSET_NAME.match(path.name) and path.name not in keep:
+            path.unlink()
+
+
+def build_all(
+    manifest: Dict[str, Any],
+    workers: Optional[int] = None,
+    force: bool = False,
+    only: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Build the galleries of a manifest.
+
+    Args:
+        manifest: Manifest returned by :func:`load_manifest`
+        workers: Worker processes (default: CPU count; 1 builds in-process)
+        force: Rebuild galleries whose inputs have not changed
+        only: Names of the galleries to consider (default: all)
+
+    Returns:
+        One result per gallery, in manifest order: ``{"name", "status"}``
+        with ``status`` one of ``built``, ``unchanged`` or ``failed``, plus
+        ``records`` and ``seconds`` when built or ``error`` when failed
+    """
+    output: Path = manifest["output"]
+    assets_dir: Path = manifest["assets"]
+    galleries = manifest["galleries"]
+    names = [name for name in galleries if not only or name in only]
+
+    page, asset_names = write_shared_assets(assets_dir, TEMPLATE_PATH.read_text())
+
+    state_path = output / STATE_FILE
+    state = _read_state(state_path)
+    results: Dict[str, Dict[str, Any]] = {}
+    todo: List[Tuple[str, str, Path, str]] = []
+    for name in names:
+        gallery_dir = output / name
+        html = gallery_page(page, asset_names, gallery_dir, assets_dir)
+        try:
+            fingerprint = gallery_fingerprint(galleries[name], html)
+        except Exception as e:
+            results[name] = {"name": name, "status": "failed", "error": str(e)}
+            state.pop(name, None)
+            continue
+        if not force and state.get(name) == fingerprint and (gallery_dir / "index.html").exists():
+            results[name] = {"name": name, "status": "unchanged"}
+        else:
+            todo.append((name, fingerprint, gallery_dir, html))
+
+    def record(name: str, fingerprint: str, run: Callable[[], Dict[str, Any]]) -> None:
+        try:
+            results[name] = {**run(), "status": "built"}
+            state[name] = fingerprint
+        except Exception as e:
+            results[name] = {"name": name, "status": "failed", "error": str(e)}
+            state.pop(name, None)
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(name, fingerprint, pool.submit(build_gallery, name, galleries[name], gallery_dir, html))
+                       for name, fingerprint, gallery_dir, html in todo]
+            for name, fingerprint, future in futures:
+                record(name, fingerprint, future.result)
+    else:
+        for name, fingerprint, gallery_dir, html in todo:
+            record(name, fingerprint, partial(build_gallery, name, galleries[name], gallery_dir, html))
+
+    state_path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n")
+    # Galleries built from an older template link its assets until rebuilt
+    if not only and all(result["status"] != "failed" for result in results.values()):
+        _prune_assets(assets_dir, asset_names.values())
+    return [results[name] for name in names]
@@ -0,0 +1,323 @@
+"""Memory-mapped on-disk index format for querying datasets from Python.
+
+An index file holds everything needed to answer browser queries without
+parsing the dataset:
+
+* ``records``: the compact JSON of every record, concatenated, plus a
+  ``uint64`` offset array into that blob
+* ``tokens``: a sorted string dictionary of search tokens with ``uint32``
+  postings lists
+* ``facet.<field>``: a sorted string dictionary of facet values with
+  ``uint32`` postings lists and the value id of each posting
+
+All sections are fixed-width arrays aligned to 8 bytes, so :class:`MappedIndex`
+exposes them as zero-copy NumPy views over an ``mmap``. Worker processes that
+open the same file share its pages through the OS page cache.
+
+File layout::
+
+    MAGIC | sections... | header JSON | uint64 header length | MAGIC
+"""
+
+import json
+import mmap
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .query import NUMERIC_FACET_TYPES, DatasetIndex, parse_number
+
+MAGIC = b"LMLBIDX1"
+FORMAT_VERSION = 1
+_TRAILER = struct.Struct("<Q8s")
+
+
+class _SectionWriter:
+    """Appends aligned sections to an index file and records their location."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.sections: Dict[str, Dict[str, Any]] = {}
+
+    def align(self) -> None:
+        padding = -self.f.tell() % 8
+        if padding:
+            self.f.write(b"\0" * padding)
+
+    def add(self, name: str, array: np.ndarray) -> None:
+        self.align()
+        self.sections[name] = {"offset": self.f.tell(), "dtype": array.dtype.str, "count": len(array)}
+        self.f.write(array.tobytes())
+
+    def add_dictionary(self, name: str, postings: Dict[str, Set[int]], with_value_ids: bool = False) -> None:
+        """Write a sorted string dictionary with its postings lists."""
+        encoded = sorted((key.encode("utf-8"), indices) for key, indices in postings.items())
+        string_offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+        postings_offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+        for i, (key, indices) in enumerate(encoded):
+            string_offsets[i + 1] = string_offsets[i] + len(key)
+            postings_offsets[i + 1] = postings_offsets[i] + len(indices)
+
+        self.add(f"{name}.strings", np.frombuffer(b"".join(key for key, _ in encoded), dtype="u1"))
+        self.add(f"{name}.offsets", string_offsets)
+        self.add(f"{name}.postings_offsets", postings_offsets)
+        self.add(f"{name}.postings", np.fromiter(
+            (idx for _, indices in encoded for idx in sorted(indices)),
+            dtype="<u4", count=int(postings_offsets[-1]),
+        ))
+        if with_value_ids:
+            counts = np.diff(postings_offsets).astype(np.int64)
+            self.add(f"{name}.value_ids", np.repeat(np.arange(len(encoded), dtype="<u4"), counts))
+
+
+def write_index(output_path: Path, data: List[Dict[str, Any]], schema: Dict[str, Any]) -> None:
+    """Write a memory-mappable index file for a dataset.
+
+    Args:
+        output_path: Path of the index file to create
+        data: List of JSON objects
+        schema: Browser schema with searchableFields and facets
+    """
+    index = DatasetIndex(data, schema)
+    with open(output_path, "wb") as f:
+        f.write(MAGIC)
+        writer = _SectionWriter(f)
+
+        writer.align()
+        data_offset = f.tell()
+        record_offsets = np.zeros(len(data) + 1, dtype="<u8")
+        for i, item in enumerate(data):
+            blob = json.dumps(item, separators=(",", ":")).encode("utf-8")
+            f.write(blob)
+            record_offsets[i + 1] = record_offsets[i] + len(blob)
+        writer.sections["records.data"] = {"offset": data_offset, "dtype": "|u1", "count": int(record_offsets[-1])}
+        writer.add("records.offsets", record_offsets)
+
+        writer.add_dictionary("tokens", index.search_index)
+        for field, values in index.facet_index.items():
+            writer.add_dictionary(f"facet.{field}", values, with_value_ids=True)
+
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "count": len(data),
+            "schema": schema,
+            "facets": list(index.facet_index),
+            "sections": writer.sections,
+        }).encode("utf-8")
+        f.write(header)
+        f.write(_TRAILER.pack(len(header), MAGIC))
+
+
+class _Dictionary:
+    """Sorted string dictionary with postings, viewed over a mapped file."""
+
+    def __init__(self, index: "MappedIndex", name: str):
+        strings = index.sections[f"{name}.strings"]
+        self._mmap = index._mmap
+        self._start = strings["offset"]
+        self._end = strings["offset"] + strings["count"]
+        self.offsets = index.section(f"{name}.offsets")
+        self.postings_offsets = index.section(f"{name}.postings_offsets")
+        self.postings = index.section(f"{name}.postings")
+        self.value_ids = index.section(f"{name}.value_ids") if f"{name}.value_ids" in index.sections else None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def key_bytes(self, i: int) -> bytes:
+        return self._mmap[self._start + int(self.offsets[i]):self._start + int(self.offsets[i + 1])]
+
+    def key(self, i: int) -> str:
+        return self.key_bytes(i).decode("utf-8")
+
+    def lookup(self, key: str) -> Optional[int]:
+        """Return the id of an exact key by binary search, or None."""
+        target = key.encode("utf-8")
+        i = bisect_left(range(len(self)), target, key=self.key_bytes)
+        if i < len(self) and self.key_bytes(i) == target:
+            return i
+        return None
+
+    def postings_for(self, i: int) -> np.ndarray:
+        return self.postings[int(self.postings_offsets[i]):int(self.postings_offsets[i + 1])]
+
+    def find_substring(self, needle: str) -> List[int]:
+        """Return the ids of keys containing ``needle`` by scanning the string blob in place."""
+        target = needle.encode("utf-8")
+        ids: List[int] = []
+        pos = self._mmap.find(target, self._start, self._end)
+        while pos >= 0:
+            relative = pos - self._start
+            i = int(np.searchsorted(self.offsets, relative, side="right")) - 1
+            key_end = int(self.offsets[i + 1])
+            if relative + len(target) <= key_end:
+                # Keys are concatenated without separators, so only count matches inside one key
+                ids.append(i)
+                pos = self._mmap.find(target, self._start + key_end, self._end)
+            else:
+                pos = self._mmap.find(target, pos + 1, self._end)
+        return ids
+
+
+class MappedIndex:
+    """Read-only query engine over an index file written by :func:`write_index`.
+
+    Opening maps the file and parses only the small header, so cold start does
+    not depend on dataset size. Results follow the same semantics as
+    :class:`~linkml_browser.query.DatasetIndex`.
+    """
+
+    def __init__(self, path: Path):
+        """Open an index file.
+
+        Args:
+            path: Path to the index file
+
+        Raises:
+            ValueError: If the file is not a valid index
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC or len(self._mmap) < len(MAGIC) + _TRAILER.size:
+            raise ValueError(f"{path} is not a LinkML Browser index file")
+        header_len, magic = _TRAILER.unpack_from(self._mmap, len(self._mmap) - _TRAILER.size)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is truncated or corrupt")
+        header_start = len(self._mmap) - _TRAILER.size - header_len
+        header = json.loads(self._mmap[header_start:header_start + header_len])
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format version {header['version']}")
+
+        self.schema: Dict[str, Any] = header["schema"]
+        self.count: int = header["count"]
+        self.sections: Dict[str, Dict[str, Any]] = header["sections"]
+        self.facets: Dict[str, Dict[str, Any]] = {
+            facet["field"]: facet for facet in self.schema.get("facets", []) if facet["field"] in header["facets"]
+        }
+        self.record_offsets = self.section("records.offsets")
+        self._records_start = self.sections["records.data"]["offset"]
+        self.tokens = _Dictionary(self, "tokens")
+        self.facet_dictionaries = {field: _Dictionary(self, f"facet.{field}") for field in self.facets}
+
+    def section(self, name: str) -> np.ndarray:
+        """Return a zero-copy NumPy view of a section."""
+        info = self.sections[name]
+        return np.frombuffer(self._mmap, dtype=np.dtype(info["dtype"]), count=info["count"], offset=info["offset"])
+
+    def close(self) -> None:
+        """Release the mapping once no NumPy views of it remain alive."""
+        self.record_offsets = self.tokens = self.facet_dictionaries = None  # type: ignore[assignment]
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_record(self, idx: int) -> Dict[str, Any]:
+        """Decode the record at a position."""
+        start = self._records_start + int(self.record_offsets[idx])
+        end = self._records_start + int(self.record_offsets[idx + 1])
+        return json.loads(self._mmap[start:end])
+
+    def match_token(self, token: str) -> np.ndarray:
+        """Return sorted indices of items with an indexed token containing ``token``."""
+        ids = self.tokens.find_substring(token)
+        if not ids:
+            return np.empty(0, dtype="<u4")
+        return np.unique(np.concatenate([self.tokens.postings_for(i) for i in ids]))
+
+    def facet_postings(self, field: str, value: str) -> np.ndarray:
+        """Return sorted indices of items having a facet value."""
+        dictionary = self.facet_dictionaries.get(field)
+        i = dictionary.lookup(value) if dictionary is not None else None
+        if i is None:
+            return np.empty(0, dtype="<u4")
+        return dictionary.postings_for(i)  # type: ignore[union-attr]
+
+    def facet_value_items(self, field: str) -> Iterable[Tuple[str, np.ndarray]]:
+        """Iterate over (value, indices) pairs of a facet."""
+        dictionary = self.facet_dictionaries[field]
+        for i in range(len(dictionary)):
+            yield dictionary.key(i), dictionary.postings_for(i)
+
+    def search(self, query: str = "", filters: Optional[Dict[str, Any]] = None) -> List[int]:
+        """Run a text query combined with facet filters.
+
+        Args:
+            query: Whitespace-separated search tokens
+            filters: Mapping of facet field to selected values or ``{"min", "max"}``
+
+        Returns:
+            Sorted list of matching record indices
+        """
+        result: Optional[np.ndarray] = None
+        for token in query.lower().split():
+            matches = self.match_token(token)
+            result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+            if not len(result):
+                return []
+
+        for field, selected in (filters or {}).items():
+            facet = self.facets.get(field)
+            if facet is None:
+                continue
+            if facet.get("type") in NUMERIC_FACET_TYPES:
+                if not isinstance(selected, dict):
+                    continue
+                low = selected.get("min", float("-inf"))
+                high = selected.get("max", float("inf"))
+                lists = [postings for key, postings in self.facet_value_items(field)
+                         if (n := parse_number(key, facet["type"])) is not None and low <= n <= high]
+                matches = np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype="<u4")
+            elif not selected:
+                continue
+            elif facet.get("type") == "array":
+                matches = self.facet_postings(field, str(selected[0]))
+                for value in selected[1:]:
+                    matches = np.intersect1d(matches, self.facet_postings(field, str(value)), assume_unique=True)
+            else:
+                matches = np.unique(np.concatenate([self.facet_postings(field, str(v)) for v in selected]))
+            result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+            if not len(result):
+                return []
+
+        if result is None:
+            return list(range(self.count))
+        return result.tolist()
+
+    def facet_counts(self, indices: List[int]) -> Dict[str, Dict[str, int]]:
+        """Count facet values over a result set with one vectorized pass per facet."""
+        mask = np.zeros(self.count, dtype=bool)
+        mask[np.asarray(indices, dtype=np.int64)] = True
+        counts: Dict[str, Dict[str, int]] = {}
+        for field, dictionary in self.facet_dictionaries.items():
+            hits = np.bincount(dictionary.value_ids[mask[dictionary.postings]], minlength=len(dictionary))
+            counts[field] = {dictionary.key(int(i)): int(hits[i]) for i in np.flatnonzero(hits)}
+        return counts
+
+    def facet_ranges(self) -> Dict[str, Dict[str, int]]:
+        """Return the global min/max of each numeric facet."""
+        ranges: Dict[str, Dict[str, int]] = {}
+        for field, facet in self.facets.items():
+            if facet.get("type") not in NUMERIC_FACET_TYPES:
+                continue
+            numbers = [n for n in (parse_number(k, facet["type"]) for k, _ in self.facet_value_items(field))
+                       if n is not None]
+            if numbers:
+                ranges[field] = {"min": min(numbers), "max": max(numbers)}
+        return ranges
+
+
+def open_index(path: Path) -> MappedIndex:
+    """Open a memory-mapped index file.
+
+    Args:
+        path: Path to the index file
+
+    Returns:
+        Query engine backed by the mapped file
+    """
+    return MappedIndex(path)
@@ -0,0 +1,439 @@
+"""Precomputed indexes shipped to the browser alongside data.js.
+
+``indexes.js`` sets ``window.searchIndexes`` to a JSON object holding work
+the browser would otherwise redo on every page load:
+
+* ``count``: number of records the indexes were built for, so the browser
+  can ignore a stale file
+* ``sort``: for each field in the schema's ``sortableFields``, the record
+  positions in ascending order (``order``) and how many of them have a value
+  (``present``; records without one come last)
+* ``hierarchy``: for each ``hierarchy`` facet, the node ids, each node's
+  parents and each record's ancestor closure (itself included), so that
+  "X and all descendants" is a single lookup and tree-shaped facet counts
+  are rolled up without walking the tree per query
+* ``histogram``: for each numeric facet, equal-width bins with a bin code
+  per record (``-1`` when the value is missing), prefix sums of the bin
+  counts and the observed value bounds of each bin. The browser filters
+  ranges by bin, reading values only in the two partially covered bins,
+  and counts a slider position in O(bins)
+* ``columns``: for each numeric, date and boolean facet, its parsed values
+  as a little-endian typed array (base64): ``float64`` (NaN when missing),
+  ``int32`` integers or epoch days (``-2**31`` when missing) or ``uint8``
+  flags (``255`` when missing). Range filters, histograms and sorting read
+  these instead of parsing record values
+* ``references``: when the schema has a ``references`` setting, the
+  records each record's reference fields name (``forward``), the records
+  naming it (``reverse``) and a table from record id to record positions
+  (``ids``), so the browser links references and follows them in either
+  direction by lookup rather than by search
+* ``completions``: for every prefix of up to ``maxPrefix`` characters of the
+  search vocabulary, its ``topK`` most frequent completions as a flat
+  ``[token, document frequency, ...]`` list, so that a search-box suggestion
+  is a single lookup. Longer prefixes are completed in the browser
+
+Bin codes are shipped as typed arrays too, in the smallest integer type
+that holds them.
+"""
+
+import array
+import base64
+import json
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from .query import NUMERIC_FACET_TYPES, js_string, parse_number, tokenize_item
+
+INDEXES_VERSION = 1
+DEFAULT_HISTOGRAM_BINS = 32
+INT32_MISSING = -(2 ** 31)
+UINT8_MISSING = 255
+DEFAULT_COMPLETION_PREFIX = 3
+DEFAULT_COMPLETIONS = 8
+
+_ARRAY_TYPECODES = {"int8": "b", "int16": "h", "int32": "i", "uint8": "B", "float64": "d"}
+
+
+def sort_key(value: Any) -> Tuple[Any, ...]:
+    """Sort key matching the browser's ordering.
+
+    Numbers sort numerically before strings, strings sort case-insensitively,
+    and arrays sort by their first element.
+
+    Args:
+        value: Field value
+
+    Returns:
+        Comparable tuple, or ``()`` for missing values
+    """
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if value is None or value == "" or isinstance(value, dict):
+        return ()
+    if isinstance(value, bool):
+        value = str(value).lower()
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    text = str(value)
+    return (1, text.lower(), text)
+
+
+def sort_permutation(data: List[Dict[str, Any]], field: str) -> Dict[str, Any]:
+    """Compute the ascending order of records by one field.
+
+    Args:
+        data: List of JSON objects
+        field: Field to sort by
+
+    Returns:
+        ``{"order": [...], "present": n}`` where ties keep data order
+    """
+    keys = [sort_key(item.get(field)) for item in data]
+    present = [idx for idx, key in enumerate(keys) if key]
+    missing = [idx for idx, key in enumerate(keys) if not key]
+    present.sort(key=keys.__getitem__)
+    return {"order": present + missing, "present": len(present)}
+
+
+def _parent_ids(value: Any) -> List[str]:
+    values = value if isinstance(value, list) else [value]
+    return [str(v) for v in values if v is not None and v != ""]
+
+
+def hierarchy_closure(data: List[Dict[str, Any]], facet: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the ancestor closure of every record for a hierarchy facet.
+
+    Each record is a node identified by ``facet["idField"]`` (default ``id``)
+    whose parents are listed in the facet field, as with ``is_a``. Multiple
+    parents and parents that are not themselves records are allowed, and
+    cycles are tolerated.
+
+    Args:
+        data: List of JSON objects
+        facet: Facet configuration with ``type: hierarchy``
+
+    Returns:
+        ``{"nodes": [...], "parents": [[...]], "ancestors": [[...]]}`` where
+        ``parents`` is per node and ``ancestors`` per record, both as node
+        positions
+    """
+    id_field = facet.get("idField", "id")
+    nodes: List[str] = []
+    node_index: Dict[str, int] = {}
+
+    def node(node_id: str) -> int:
+        if node_id not in node_index:
+            node_index[node_id] = len(nodes)
+            nodes.append(node_id)
+        return node_index[node_id]
+
+    record_nodes: List[Optional[int]] = []
+    record_parents: List[List[int]] = []
+    parents: Dict[int, List[int]] = {}
+    for item in data:
+        record_id = item.get(id_field)
+        own = node(str(record_id)) if record_id is not None and record_id != "" else None
+        item_parents = [node(parent) for parent in _parent_ids(item.get(facet["field"]))]
+        record_nodes.append(own)
+        record_parents.append(item_parents)
+        if own is not None:
+            parents.setdefault(own, item_parents)
+
+    closure: Dict[int, Set[int]] = {}
+
+    def ancestors(start: int) -> Set[int]:
+        # Iterative post-order DFS; a parent still on the path (a cycle) counts as itself
+        stack = [(start, False)]
+        on_path: Set[int] = set()
+        while stack:
+            current, expanded = stack.pop()
+            if current in closure:
+                continue
+            if expanded:
+                result = {current}
+                for parent in parents.get(current, []):
+                    result |= closure.get(parent, {parent})
+                closure[current] = result
+                on_path.discard(current)
+            elif current not in on_path:
+                on_path.add(current)
+                stack.append((current, True))
+                stack.extend((parent, False) for parent in parents.get(current, [])
+                             if parent not in closure and parent not in on_path)
+        return closure[start]
+
+    record_ancestors = []
+    for own, item_parents in zip(record_nodes, record_parents):
+        if own is not None:
+            result = ancestors(own)
+        else:
+            result = set().union(*(ancestors(parent) for parent in item_parents))
+        record_ancestors.append(sorted(result))
+
+    return {
+        "nodes": nodes,
+        "parents": [parents.get(i, []) for i in range(len(nodes))],
+        "ancestors": record_ancestors,
+    }
+
+
+def reference_graph(data: List[Dict[str, Any]], references: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve the references between records.
+
+    Each record is identified by ``references["idField"]`` (default ``id``),
+    and the values of each field in ``references["fields"]`` name other
+    records, as ``is_a``, ``range`` and ``slots`` do in a schema browser.
+    Values that name no record, such as built-in types, are left out.
+
+    Args:
+        data: List of JSON objects
+        references: ``{"idField": ..., "fields": [...]}`` from the browser schema
+
+    Returns:
+        ``{"ids": {id: [...]}, "forward": [[...]], "reverse": [[...]]}`` where
+        ``ids`` maps record ids (as JavaScript strings) to record positions,
+        and ``forward`` and ``reverse`` are per record, ascending positions
+        of the records it references and that reference it, without itself
+    """
+    id_field = references.get("idField", "id")
+    ids: Dict[str, List[int]] = {}
+    for idx, item in enumerate(data):
+        record_id = item.get(id_field)
+        if record_id is not None and record_id != "":
+            ids.setdefault(js_string(record_id), []).append(idx)
+
+    forward: List[List[int]] = []
+    reverse: List[List[int]] = [[] for _ in data]
+    for idx, item in enumerate(data):
+        targets: Set[int] = set()
+        for field in references.get("fields", []):
+            value = item.get(field)
+            for name in value if isinstance(value, list) else [value]:
+                if name is not None:
+                    targets.update(ids.get(js_string(name), ()))
+        targets.discard(idx)
+        forward.append(sorted(targets))
+        for target in forward[-1]:
+            reverse[target].append(idx)
+    return {"ids": ids, "forward": forward, "reverse": reverse}
+
+
+def encode_array(values: List[Union[int, float]], dtype: str) -> Dict[str, str]:
+    """Encode numbers as a base64 little-endian typed array.
+
+    Args:
+        values: Numbers that fit ``dtype``
+        dtype: ``int8``, ``int16``, ``int32``, ``uint8`` or ``float64``
+
+    Returns:
+        ``{"dtype": ..., "data": ...}``, decoded by the browser into the
+        matching ``TypedArray``
+    """
+    packed = array.array(_ARRAY_TYPECODES[dtype], values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return {"dtype": dtype, "data": base64.b64encode(packed.tobytes()).decode("ascii")}
+
+
+def decode_array(encoded: Dict[str, str]) -> List[Union[int, float]]:
+    """Decode an array written by :func:`encode_array`.
+
+    Args:
+        encoded: ``{"dtype": ..., "data": ...}``
+
+    Returns:
+        List of numbers
+    """
+    packed = array.array(_ARRAY_TYPECODES[encoded["dtype"]])
+    packed.frombytes(base64.b64decode(encoded["data"]))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def _facet_numbers(data: List[Dict[str, Any]], facet: Dict[str, Any]) -> List[Optional[Union[int, float]]]:
+    facet_type = facet.get("type", "integer")
+    numbers: List[Optional[Union[int, float]]] = []
+    for item in data:
+        value = item.get(facet["field"])
+        number = None if value is None else parse_number(js_string(value), facet_type)
+        numbers.append(number if number is not None and math.isfinite(number) else None)
+    return numbers
+
+
+def typed_column(data: List[Dict[str, Any]], facet: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Encode the parsed values of a numeric, date or boolean facet.
+
+    Args:
+        data: List of JSON objects
+        facet: Facet configuration
+
+    Returns:
+        Encoded typed array (see :func:`encode_array`), or None for other
+        facet types
+    """
+    facet_type = facet.get("type")
+    if facet_type == "boolean":
+        values = [item.get(facet["field"]) for item in data]
+        return encode_array([int(v) if isinstance(v, bool) else UINT8_MISSING for v in values], "uint8")
+    if facet_type not in NUMERIC_FACET_TYPES:
+        return None
+    numbers = _facet_numbers(data, facet)
+    if facet_type in ("integer", "date") and all(
+        n is None or (isinstance(n, int) and INT32_MISSING < n < 2 ** 31) for n in numbers
+    ):
+        return encode_array([INT32_MISSING if n is None else n for n in numbers], "int32")
+    return encode_array([math.nan if n is None else n for n in numbers], "float64")
+
+
+def _code_dtype(bins: int) -> str:
+    if bins <= 0x7F:
+        return "int8"
+    return "int16" if bins <= 0x7FFF else "int32"
+
+
+def histogram(data: List[Dict[str, Any]], facet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Bin the values of a numeric facet.
+
+    Values are parsed like the browser parses them (``parseInt`` for
+    ``integer`` facets, ``parseFloat`` for ``float``, epoch days for ``date``
+    and epoch milliseconds for ``datetime``). Integer and date facets spanning
+    at most ``bins`` values get one bin per value, so their counts are exact.
+
+    Args:
+        data: List of JSON objects
+        facet: Facet configuration, optionally with ``bins``
+
+    Returns:
+        ``{"min", "max", "width", "edges", "low", "high", "prefix", "codes"}``,
+        or None if no record has a value
+    """
+    facet_type = facet.get("type", "integer")
+    numbers = _facet_numbers(data, facet)
+    present = [n for n in numbers if n is not None]
+    if not present:
+        return None
+
+    low, high = min(present), max(present)
+    bins = max(1, int(facet.get("bins", DEFAULT_HISTOGRAM_BINS)))
+    if facet_type in ("integer", "date") and high - low + 1 <= bins:
+        bins, width = int(high - low + 1), 1
+    elif high == low:
+        bins, width = 1, 1
+    else:
+        width = (high - low) / bins
+
+    codes: List[int] = []
+    counts = [0] * bins
+    bin_low: List[Optional[float]] = [None] * bins
+    bin_high: List[Optional[float]] = [None] * bins
+    for number in numbers:
+        if number is None:
+            codes.append(-1)
+            continue
+        code = min(bins - 1, math.floor((number - low) / width))
+        codes.append(code)
+        counts[code] += 1
+        if bin_low[code] is None or number < bin_low[code]:
+            bin_low[code] = number
+        if bin_high[code] is None or number > bin_high[code]:
+            bin_high[code] = number
+
+    prefix = [0]
+    for count in counts:
+        prefix.append(prefix[-1] + count)
+    return {
+        "min": low,
+        "max": high,
+        "width": width,
+        "edges": [low + i * width for i in range(bins)] + [high if width != 1 else low + bins],
+        "low": bin_low,
+        "high": bin_high,
+        "prefix": prefix,
+        "codes": codes,
+    }
+
+
+def prefix_completions(
+    data: List[Dict[str, Any]],
+    searchable_fields: List[str],
+    max_prefix: int = DEFAULT_COMPLETION_PREFIX,
+    top_k: int = DEFAULT_COMPLETIONS,
+) -> Dict[str, Any]:
+    """Tabulate the most frequent search tokens for each short prefix.
+
+    Tokens are ranked by the number of records containing them, ties broken
+    alphabetically, as the browser ranks the completions it computes itself.
+
+    Args:
+        data: List of JSON objects
+        searchable_fields: Fields tokenized by the search index
+        max_prefix: Longest prefix to tabulate
+        top_k: Completions kept per prefix
+
+    Returns:
+        ``{"maxPrefix": ..., "topK": ..., "prefixes": {prefix: [token, count, ...]}}``
+    """
+    frequency: Counter = Counter()
+    for item in data:
+        frequency.update(set(tokenize_item(item, searchable_fields)))
+
+    prefixes: Dict[str, List[Any]] = {}
+    for token, count in sorted(frequency.items(), key=lambda entry: (-entry[1], entry[0])):
+        for length in range(1, min(max_prefix, len(token)) + 1):
+            entries = prefixes.setdefault(token[:length], [])
+            if len(entries) < 2 * top_k:
+                entries.extend((token, count))
+    return {"maxPrefix": max_prefix, "topK": top_k, "prefixes": prefixes}
+
+
+def build_indexes(data: List[Dict[str, Any]], schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the browser indexes for a dataset.
+
+    Args:
+        data: List of JSON objects
+        schema: Browser schema
+
+    Returns:
+        JSON-serializable indexes object
+    """
+    indexes: Dict[str, Any] = {
+        "version": INDEXES_VERSION,
+        "count": len(data),
+        "sort": {field: sort_permutation(data, field) for field in schema.get("sortableFields", [])},
+        "hierarchy": {
+            facet["field"]: hierarchy_closure(data, facet)
+            for facet in schema.get("facets", [])
+            if facet.get("type") == "hierarchy"
+        },
+        "histogram": {
+            facet["field"]: {**bins, "codes": encode_array(bins["codes"], _code_dtype(len(bins["prefix"]) - 1))}
+            for facet in schema.get("facets", [])
+            if facet.get("type") in NUMERIC_FACET_TYPES and (bins := histogram(data, facet)) is not None
+        },
+        "columns": {
+            facet["field"]: column
+            for facet in schema.get("facets", [])
+            if (column := typed_column(data, facet)) is not None
+        },
+        "completions": prefix_completions(data, schema.get("searchableFields", [])),
+    }
+    if schema.get("references"):
+        indexes["references"] = reference_graph(data, schema["references"])
+    return indexes
+
+
+def write_indexes_js(output_path: Path, indexes: Dict[str, Any]) -> None:
+    """Write indexes as a script that sets ``window.searchIndexes``.
+
+    Args:
+        output_path: Path of the ``indexes.js`` file
+        indexes: Object returned by :func:`build_indexes`
+    """
+    with open(output_path, "w") as f:
+        f.write("window.searchIndexes = ")
+        json.dump(indexes, f, separators=(",", ":"))
+        f.write(";\n")
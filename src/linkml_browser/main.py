@@ -19,14 +19,38 @@ from .core import (
 app = typer.Typer(help="LinkML Browser: Generate standalone faceted browsers for tabular JSON datasets")
 
 
+def _validate_or_exit(
+    data: List, schema: Dict, linkml_schema: Optional[Path] = None,
+    target_class: Optional[str] = None, workers: Optional[int] = None,
+) -> None:
+    """Validate records before generation, exiting with status 1 on problems."""
+    from .validation import format_report, validate_records
+
+    if linkml_schema and not linkml_schema.exists():
+        typer.echo(f"Error: LinkML schema '{linkml_schema}' not found", err=True)
+        raise typer.Exit(1)
+    report = validate_records(data, schema, linkml_schema, target_class, workers)
+    typer.echo(format_report(report))
+    if report["problems"]:
+        raise typer.Exit(1)
+
+
 @app.command()
 def deploy(
-    data_file: Annotated[Path, typer.Argument(help="Path to JSON data file")],
+    data_file: Annotated[Path, typer.Argument(help="Path to JSON data file (or data.js, JSON Lines, data.sqlite, index.lbi or a deployed browser)")],
     output_dir: Annotated[Path, typer.Argument(help="Output directory for the browser")],
     schema_file: Annotated[Optional[Path], typer.Option("--schema", "-s", help="Path to schema JSON file")] = None,
     title: Annotated[str, typer.Option("--title", "-t", help="Browser title")] = "Data Browser",
     description: Annotated[str, typer.Option("--description", "-d", help="Browser description")] = "Browse and filter data",
-    force: Annotated[bool, typer.Option("--force", "-f", help="Overwrite existing output directory")] = False
+    force: Annotated[bool, typer.Option("--force", "-f", help="Overwrite existing output directory")] = False,
+    binary_index: Annotated[bool, typer.Option("--binary-index", help="Also write a memory-mappable index.lbi")] = False,
+    sqlite: Annotated[bool, typer.Option("--sqlite", help="Also write data.sqlite with a full-text index")] = False,
+    validate: Annotated[bool, typer.Option("--validate", help="Check records against the schema before generating")] = False,
+    linkml_schema: Annotated[Optional[Path], typer.Option("--linkml-schema", help="Also validate records against this LinkML schema")] = None,
+    target_class: Annotated[Optional[str], typer.Option("--target-class", help="LinkML class of the records (defaults to the tree root)")] = None,
+    workers: Annotated[Optional[int], typer.Option("--workers", help="Processes for validation and writing data.js (defaults to the CPU count)")] = None,
+    pretty: Annotated[bool, typer.Option("--pretty", help="Indent data.js and schema.js instead of minifying them")] = False,
+    offline: Annotated[bool, typer.Option("--offline", help="Also write a service worker so the browser is cached and works offline (when served over HTTP)")] = False,
 ):
     """Deploy a standalone faceted browser for your JSON data."""
     
@@ -35,9 +59,13 @@ def deploy(
         typer.echo(f"Error: Data file '{data_file}' not found", err=True)
         raise typer.Exit(1)
     
-    # Load data
+    # Load data, which may come from a deployed browser or another export
     try:
-        data = load_json_data(data_file)
+        if data_file.suffix == ".json":
+            data = load_json_data(data_file)
+        else:
+            from .reader import load_records
+            data = load_records(data_file)
     except (json.JSONDecodeError, ValueError) as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
@@ -63,10 +91,14 @@ def deploy(
         schema = generator.infer_schema(title, description)
         typer.echo(f"Inferred schema with {len(schema['facets'])} facets")
     
+    if validate or linkml_schema:
+        _validate_or_exit(data, schema, linkml_schema, target_class, workers)
+    
     # Generate browser
     try:
         generator = BrowserGenerator(data, schema)
-        generator.generate(output_dir, force)
+        generator.generate(output_dir, force, binary_index=binary_index, sqlite=sqlite, pretty=pretty, workers=workers,
+                           offline=offline)
     except FileExistsError as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
@@ -77,6 +109,12 @@ def deploy(
     typer.echo("Copied index.html")
     typer.echo(f"Created data.js with {len(data)} items")
     typer.echo("Created schema.js")
+    if binary_index:
+        typer.echo("Created index.lbi")
+    if sqlite:
+        typer.echo("Created data.sqlite")
+    if offline:
+        typer.echo("Created sw.js")
     
     typer.echo(f"\n✅ Browser deployed to: {output_dir}")
     typer.echo(f"To view, open: {output_dir / 'index.html'}")
@@ -124,6 +162,9 @@ def deploy_schema(
     title: Annotated[Optional[str], typer.Option("--title", "-t", help="Browser title (defaults to schema name)")] = None,
     description: Annotated[Optional[str], typer.Option("--description", "-d", help="Browser description")] = None,
     force: Annotated[bool, typer.Option("--force", "-f", help="Overwrite existing output directory")] = False,
+    validate: Annotated[bool, typer.Option("--validate", help="Check elements against the browser schema before generating")] = False,
+    pretty: Annotated[bool, typer.Option("--pretty", help="Indent data.js and schema.js instead of minifying them")] = False,
+    offline: Annotated[bool, typer.Option("--offline", help="Also write a service worker so the browser is cached and works offline (when served over HTTP)")] = False,
 ):
     """Deploy a faceted browser for LinkML schema(s).
 
@@ -162,18 +203,211 @@ def deploy_schema(
         browser_title = "Combined Schema Browser"
     browser_schema = get_linkml_browser_schema(browser_title, description)
 
+    if validate:
+        _validate_or_exit(elements, browser_schema)
+
     # Generate browser
     generator = BrowserGenerator(elements, browser_schema)
-    generator.generate(output_dir, force)
+    generator.generate(output_dir, force, pretty=pretty, offline=offline)
 
     typer.echo("Copied index.html")
     typer.echo(f"Created data.js with {len(elements)} elements")
     typer.echo("Created schema.js")
+    if offline:
+        typer.echo("Created sw.js")
 
     typer.echo(f"\n✅ Browser deployed to: {output_dir}")
     typer.echo(f"To view, open: {output_dir / 'index.html'}")
 
 
+@app.command()
+def build_all(
+    manifest_file: Annotated[Path, typer.Argument(help="Path to the JSON or YAML build manifest")],
+    workers: Annotated[Optional[int], typer.Option("--workers", "-w", help="Galleries built at once (defaults to the CPU count)")] = None,
+    force: Annotated[bool, typer.Option("--force", "-f", help="Rebuild galleries whose inputs have not changed")] = False,
+    only: Annotated[Optional[List[str]], typer.Option("--only", help="Build only this gallery (repeatable)")] = None,
+):
+    """Build every browser listed in a manifest.
+
+    Galleries are built in parallel and share one copy of the browser's
+    stylesheet and script. Galleries whose data, schema, options and template
+    are unchanged since the last build are skipped.
+    """
+    from .gallery import build_all as build_galleries
+    from .gallery import load_manifest
+
+    if not manifest_file.exists():
+        typer.echo(f"Error: Manifest '{manifest_file}' not found", err=True)
+        raise typer.Exit(1)
+    try:
+        manifest = load_manifest(manifest_file)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    unknown = sorted(set(only or []) - set(manifest["galleries"]))
+    if unknown:
+        typer.echo(f"Error: Unknown galleries: {', '.join(unknown)}", err=True)
+        raise typer.Exit(1)
+
+    results = build_galleries(manifest, workers=workers, force=force, only=only)
+    for result in results:
+        if result["status"] == "built":
+            typer.echo(f"Built {result['name']} ({result['records']} items, {result['seconds']:.1f}s)")
+        elif result["status"] == "unchanged":
+            typer.echo(f"Unchanged {result['name']}")
+        else:
+            typer.echo(f"Error building {result['name']}: {result['error']}", err=True)
+
+    failed = sum(result["status"] == "failed" for result in results)
+    if failed:
+        typer.echo(f"\n{failed} of {len(results)} galleries failed", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"\n✅ Galleries up to date in: {manifest['output']}")
+
+
+@app.command()
+def records(
+    source: Annotated[Path, typer.Argument(help="data.js, JSON, JSON Lines, data.sqlite or index.lbi file, or a deployed browser directory")],
+    output: Annotated[Optional[Path], typer.Option("--output", "-o", help="Write to a .jsonl, .json or .js file instead of JSON Lines on stdout")] = None,
+    where: Annotated[Optional[List[str]], typer.Option("--where", help="Keep records whose FIELD equals (or whose array contains) VALUE, as FIELD=VALUE (repeatable)")] = None,
+    limit: Annotated[Optional[int], typer.Option("--limit", help="Stop after this many matching records")] = None,
+    sample: Annotated[Optional[int], typer.Option("--sample", help="Keep a uniform random sample of this many matching records, in their original order")] = None,
+    seed: Annotated[int, typer.Option("--seed", help="Random seed for --sample")] = 0,
+    pretty: Annotated[bool, typer.Option("--pretty", help="Indent .json and .js output")] = False,
+):
+    """Stream the records of a dataset or deployed browser.
+
+    Records are read one at a time, so filtering, sampling and converting
+    large galleries runs in constant memory (apart from --sample, which
+    holds the sample).
+    """
+    import sys
+    from itertools import islice
+
+    from .reader import iter_records, match_records, sample_records, write_json_lines
+    from .serialize import write_records_js
+
+    if not source.exists():
+        typer.echo(f"Error: Source '{source}' not found", err=True)
+        raise typer.Exit(1)
+
+    conditions = []
+    for condition in where or []:
+        field, sep, value = condition.partition("=")
+        if not sep or not field:
+            typer.echo(f"Error: --where expects FIELD=VALUE, got '{condition}'", err=True)
+            raise typer.Exit(1)
+        conditions.append((field, value))
+
+    selected = match_records(iter_records(source), conditions)
+    if sample is not None:
+        selected = iter(sample_records(selected, sample, seed))
+    if limit is not None:
+        selected = islice(selected, limit)
+
+    count = 0
+
+    def counted():
+        nonlocal count
+        for record in selected:
+            count += 1
+            yield record
+
+    try:
+        if output is None:
+            write_json_lines(counted(), sys.stdout)
+        elif output.suffix in (".jsonl", ".ndjson"):
+            with open(output, "w") as f:
+                write_json_lines(counted(), f)
+        else:
+            write_records_js(output, counted(), variable="window.searchData" if output.suffix == ".js" else None,
+                             pretty=pretty)
+    except (json.JSONDecodeError, ValueError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    if output is not None:
+        typer.echo(f"Wrote {count} records to {output}")
+
+
+@app.command()
+def serve(
+    data_file: Annotated[Path, typer.Argument(help="Path to JSON data file, index.lbi or data.sqlite")],
+    schema_file: Annotated[Optional[Path], typer.Option("--schema", "-s", help="Path to schema JSON file")] = None,
+    host: Annotated[str, typer.Option("--host", help="Interface to bind")] = "127.0.0.1",
+    port: Annotated[int, typer.Option("--port", "-p", help="Port to listen on")] = 8000,
+    max_concurrency: Annotated[int, typer.Option("--max-concurrency", help="Maximum queries evaluated at once")] = 4,
+    title: Annotated[str, typer.Option("--title", "-t", help="Browser title")] = "Data Browser",
+    description: Annotated[str, typer.Option("--description", "-d", help="Browser description")] = "Browse and filter data",
+):
+    """Serve a browser backed by a local search API instead of static files.
+
+    The dataset is indexed in memory once, memory-mapped when given an
+    index.lbi written by `deploy --binary-index`, or queried with SQL when
+    given a data.sqlite written by `deploy --sqlite`. Results are served page
+    by page, so the dataset does not have to fit in a browser tab.
+    """
+    from .query import DatasetIndex, SearchEngine
+    from .server import run_server
+
+    if not data_file.exists():
+        typer.echo(f"Error: Data file '{data_file}' not found", err=True)
+        raise typer.Exit(1)
+
+    stat = data_file.stat()
+    version = f"{data_file.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    index: SearchEngine
+
+    if data_file.suffix == ".lbi":
+        from .index_format import open_index
+
+        try:
+            index = open_index(data_file)
+        except ValueError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+        schema = index.schema
+        typer.echo(f"Mapped index of {len(index)} items from {data_file}")
+    elif data_file.suffix in (".sqlite", ".db"):
+        from .sqlite_export import open_sqlite
+
+        try:
+            index = open_sqlite(data_file)
+        except ValueError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+        schema = index.schema
+        typer.echo(f"Opened SQLite dataset of {len(index)} items from {data_file}")
+    else:
+        try:
+            data = load_json_data(data_file)
+        except (json.JSONDecodeError, ValueError) as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+
+        typer.echo(f"Loaded {len(data)} items from {data_file}")
+
+        if schema_file:
+            if not schema_file.exists():
+                typer.echo(f"Error: Schema file '{schema_file}' not found", err=True)
+                raise typer.Exit(1)
+            try:
+                schema = load_schema(schema_file)
+            except json.JSONDecodeError as e:
+                typer.echo(f"Error: Invalid JSON in '{schema_file}': {e}", err=True)
+                raise typer.Exit(1)
+        else:
+            schema = BrowserGenerator(data).infer_schema(title, description)
+
+        index = DatasetIndex(data, schema)
+        typer.echo(f"Indexed {len(data)} items")
+
+    typer.echo(f"\n✅ Serving on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        run_server(index, schema, host=host, port=port, version=version, max_concurrency=max_concurrency)
+    except KeyboardInterrupt:
+        pass
+
+
 def main():
     """Main entry point for the CLI."""
     app()
@@ -0,0 +1,193 @@
+"""Offline support for deployed browsers.
+
+:func:`write_service_worker` adds a service worker (``sw.js``) to a
+generated browser. Its precache manifest lists the page, ``data.js``,
+``schema.js``, ``indexes.js`` and the local stylesheets and scripts the page
+links (such as a gallery's shared assets), each with a revision hashed from
+its content. The worker caches every file under its revision when it
+installs, and serves them from Cache Storage, so repeat visits do not
+download the data again and work offline. A new deploy changes ``sw.js``
+only where revisions changed; the browser installs the new worker in the
+background, and it fetches just the changed files and drops the stale ones.
+
+The page is given two ``<meta>`` tags: one naming the worker, which the
+page registers when served over HTTP(S), and the revision of ``data.js`` and
+``schema.js``, under which the page keeps the search and facet indexes it
+builds in IndexedDB.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List
+
+SERVICE_WORKER = "sw.js"
+
+PRECACHE_FILES = ("index.html", "data.js", "schema.js", "indexes.js")
+
+_HEAD_END = re.compile(r"</head>", re.I)
+_LOCAL_ASSET = re.compile(r"""<(?:script|link)\b[^>]*?\b(?:src|href)=["']([^"'#?:/][^"'#?:]*\.(?:css|js))["']""", re.I)
+_OFFLINE_META = re.compile(r'\s*<meta name="linkml-browser-(?:service-worker|index-revision)"[^>]*>')
+
+SERVICE_WORKER_TEMPLATE = """\
+// Generated by linkml-browser. Precaches the browser by content revision.
+const PRECACHE_MANIFEST = __MANIFEST__;
+
+const CACHE_NAME = 'linkml-browser-precache:' + self.registration.scope;
+const REVISION_PARAM = '__linkml_browser_revision';
+
+const revisions = new Map(PRECACHE_MANIFEST.map(entry => [new URL(entry.url, self.location).href, entry.revision]));
+
+function cacheKey(url, revision) {
+    const key = new URL(url);
+    key.searchParams.set(REVISION_PARAM, revision);
+    return key.href;
+}
+
+function precachedUrl(request) {
+    const url = new URL(request.url);
+    url.search = '';
+    url.hash = '';
+    if (request.mode === 'navigate' && url.pathname.endsWith('/')) {
+        url.pathname += 'index.html';
+    }
+    return revisions.has(url.href) ? url.href : null;
+}
+
+// Fetch only the files whose revision is not cached yet
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        await Promise.all([...revisions].map(async ([url, revision]) => {
+            const key = cacheKey(url, revision);
+            if (await cache.match(key)) return;
+            const response = await fetch(url, { cache: 'no-cache' });
+            if (!response.ok) throw new Error(`Precaching ${url} failed: ${response.status}`);
+            await cache.put(key, response);
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+// Drop the files of earlier revisions
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        const current = new Set([...revisions].map(([url, revision]) => cacheKey(url, revision)));
+        const keys = await cache.keys();
+        await Promise.all(keys.filter(request => !current.has(request.url)).map(request => cache.delete(request)));
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET') return;
+    const url = precachedUrl(event.request);
+    if (!url) return;
+    event.respondWith((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        const cached = await cache.match(cacheKey(url, revisions.get(url)));
+        return cached || fetch(event.request);
+    })());
+});
+"""
+
+
+def file_revision(path: Path) -> str:
+    """Hash a file's content into a short revision.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        First 16 hex digits of the file's SHA-256
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+def local_assets(page: str) -> List[str]:
+    """List the local stylesheets and scripts a page links.
+
+    Args:
+        page: Page HTML
+
+    Returns:
+        Relative URLs of linked ``.css`` and ``.js`` files, in order, without
+        duplicates
+    """
+    return list(dict.fromkeys(_LOCAL_ASSET.findall(page)))
+
+
+def precache_manifest(output_dir: Path) -> List[Dict[str, str]]:
+    """Build the precache manifest of a generated browser.
+
+    Args:
+        output_dir: Directory holding the generated browser
+
+    Returns:
+        ``{"url", "revision"}`` entries for each precached file that exists,
+        with URLs relative to the page
+    """
+    page = (output_dir / "index.html").read_text(encoding="utf-8")
+    urls = list(dict.fromkeys([*PRECACHE_FILES, *local_assets(page)]))
+    return [
+        {"url": url, "revision": file_revision(output_dir / url)}
+        for url in urls
+        if (output_dir / url).is_file()
+    ]
+
+
+def add_offline_meta(page: str, index_revision: str, service_worker: str = SERVICE_WORKER) -> str:
+    """Point a page at its service worker and index revision.
+
+    Tags from an earlier call are replaced.
+
+    Args:
+        page: Page HTML
+        index_revision: Revision of the data and schema the page's indexes
+            are built from
+        service_worker: URL of the service worker, relative to the page
+
+    Returns:
+        The page with the ``<meta>`` tags added before ``</head>``
+
+    Raises:
+        ValueError: If the page has no ``</head>``
+    """
+    page = _OFFLINE_META.sub("", page)
+    head_end = _HEAD_END.search(page)
+    if head_end is None:
+        raise ValueError("Page has no </head> to add the service worker to")
+    tags = (
+        f'    <meta name="linkml-browser-service-worker" content="{service_worker}">\n'
+        f'    <meta name="linkml-browser-index-revision" content="{index_revision}">\n'
+    )
+    return page[:head_end.start()] + tags + page[head_end.start():]
+
+
+def write_service_worker(output_dir: Path) -> List[Dict[str, str]]:
+    """Make a generated browser work offline.
+
+    Adds the offline ``<meta>`` tags to ``index.html`` and writes ``sw.js``
+    with the precache manifest.
+
+    Args:
+        output_dir: Directory holding the generated browser
+
+    Returns:
+        The precache manifest
+    """
+    revisions = [file_revision(output_dir / name) for name in ("data.js", "schema.js")]
+    index_revision = hashlib.sha256(":".join(revisions).encode()).hexdigest()[:16]
+    page_path = output_dir / "index.html"
+    page_path.write_text(add_offline_meta(page_path.read_text(encoding="utf-8"), index_revision), encoding="utf-8")
+
+    manifest = precache_manifest(output_dir)
+    script = SERVICE_WORKER_TEMPLATE.replace("__MANIFEST__", json.dumps(manifest, indent=2))
+    (output_dir / SERVICE_WORKER).write_text(script, encoding="utf-8")
+    return manifest
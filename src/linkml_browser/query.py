@@ -0,0 +1,368 @@
+"""Server-side query engine mirroring the browser's search semantics.
+
+The engines answer plain-word queries: every whitespace-separated word must
+be a substring of an indexed word. The search box's richer syntax (fields,
+phrases, ``OR``, exclusions, groups and ``~`` typos) is parsed only in the
+browser; :func:`search_syntax` detects it so the server can refuse such
+queries rather than answer them as literal words.
+"""
+
+import re
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Set, Tuple, Union
+
+# Facets filtered by {"min", "max"} ranges; dates range over epoch days and
+# datetimes over epoch milliseconds
+NUMERIC_FACET_TYPES = ("integer", "float", "date", "datetime")
+
+_FLOAT_PREFIX = re.compile(r"[+-]?(?:Infinity|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)")
+_EPOCH_DATE = date(1970, 1, 1)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Lexer rules of parseSearchQuery in index.html
+_FIELD_PREFIX = re.compile(r"([A-Za-z_][\w.]*):(?=\S)")
+_FUZZY_SUFFIX = re.compile(r".+?~[0-2]?$")
+
+
+def js_string(value: Any) -> str:
+    """Convert a JSON value to a string the same way JavaScript's ``String()`` does.
+
+    Facet keys in the browser are built with ``String(value)``, so the server
+    has to produce identical keys for filters to round-trip.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, list):
+        return ",".join("" if v is None else js_string(v) for v in value)
+    if isinstance(value, dict):
+        return "[object Object]"
+    return str(value)
+
+
+def tokenize_item(item: Dict[str, Any], searchable_fields: List[str]) -> List[str]:
+    """Tokenize the searchable fields of an item like ``buildSearchIndex`` does."""
+    parts = []
+    for field in searchable_fields:
+        value = item.get(field)
+        if value is None:
+            parts.append("")
+        elif isinstance(value, list):
+            parts.append(" ".join(js_string(v) for v in value))
+        else:
+            parts.append(js_string(value))
+    return " ".join(parts).lower().split()
+
+
+def search_syntax(query: str, fields: Iterable[str]) -> Optional[str]:
+    """Name the search-box syntax a query uses beyond plain words.
+
+    Follows the browser's lexer: prefixes that are not known fields, and
+    quotes, dashes or tildes inside a word, are part of the word.
+
+    Args:
+        query: Search box text
+        fields: Searchable and facet fields, which may be used as prefixes
+
+    Returns:
+        Description of the first syntax feature found, or None for a query
+        of plain words
+    """
+    fields = set(fields)
+    for word in query.split():
+        if word.startswith("("):
+            return "grouping with parentheses"
+        if word in ("OR", "AND"):
+            return f"the {word} operator"
+        if word.startswith("-") and len(word) > 1:
+            return "excluding words with -"
+        prefix = _FIELD_PREFIX.match(word)
+        if prefix and prefix.group(1) in fields:
+            return "field:value terms"
+        if word.startswith('"'):
+            return "quoted phrases"
+        if _FUZZY_SUFFIX.match(word):
+            return "typo-tolerant ~ terms"
+    return None
+
+
+def facet_keys(value: Any, facet_type: str) -> List[str]:
+    """Return the index keys contributed by a facet value.
+
+    A value repeated within one record's array gives one key, so every
+    engine counts records rather than occurrences.
+    """
+    if value is None:
+        return []
+    if facet_type == "array":
+        values = value if isinstance(value, list) else [value]
+        return list(dict.fromkeys(js_string(v) for v in values if v is not None))
+    return [js_string(value)]
+
+
+def hierarchy_keys(data: List[Dict[str, Any]], facet: Dict[str, Any]) -> List[List[str]]:
+    """Return the facet keys of every record for a hierarchy facet.
+
+    As in the browser, a record is keyed by its ancestor closure, itself
+    included, so selecting a node matches its whole subtree and each node's
+    count rolls up its descendants.
+
+    Args:
+        data: List of JSON objects
+        facet: Facet configuration with ``type: hierarchy``
+
+    Returns:
+        Node ids per record
+    """
+    # Imported here as indexes builds on this module
+    from .indexes import hierarchy_closure
+
+    closure = hierarchy_closure(data, facet)
+    nodes = closure["nodes"]
+    return [[nodes[i] for i in ancestors] for ancestors in closure["ancestors"]]
+
+
+class SearchEngine(Protocol):
+    """Query interface shared by the in-memory and memory-mapped indexes."""
+
+    schema: Dict[str, Any]
+
+    def __len__(self) -> int: ...
+
+    def get_record(self, idx: int) -> Dict[str, Any]: ...
+
+    def search(self, query: str = "", filters: Optional[Dict[str, Any]] = None) -> List[int]: ...
+
+    def facet_counts(self, indices: List[int]) -> Dict[str, Dict[str, int]]: ...
+
+    def facet_ranges(self) -> Dict[str, Dict[str, int]]: ...
+
+
+class DatasetIndex:
+    """In-memory inverted indexes over a dataset, queried with browser semantics.
+
+    Text queries are split on whitespace and every query token must be a
+    substring of some indexed token (implicit AND). Facet filters follow the
+    browser: ``array`` facets require all selected values, scalar facets match
+    any selected value, ``hierarchy`` facets match the subtrees of the selected
+    nodes, and numeric (``integer`` and ``float``) facets take a
+    ``{"min", "max"}`` range.
+    """
+
+    token_cache_size = 256
+
+    def __init__(self, data: List[Dict[str, Any]], schema: Dict[str, Any]):
+        """Build the indexes.
+
+        Args:
+            data: List of JSON objects
+            schema: Browser schema with searchableFields and facets
+        """
+        self.data = data
+        self.schema = schema
+        self.facets: Dict[str, Dict[str, Any]] = {
+            facet["field"]: facet for facet in schema.get("facets", []) if not facet["field"].startswith("__")
+        }
+        # Ancestor closures of hierarchy facets, per record
+        self.hierarchy_keys: Dict[str, List[List[str]]] = {
+            field: hierarchy_keys(data, facet)
+            for field, facet in self.facets.items()
+            if facet.get("type") == "hierarchy"
+        }
+        self.search_index = self._build_search_index()
+        self.facet_index = self._build_facet_index()
+        self._token_cache: "OrderedDict[str, Set[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _build_search_index(self) -> Dict[str, Set[int]]:
+        index: Dict[str, Set[int]] = {}
+        fields = self.schema.get("searchableFields", [])
+        for idx, item in enumerate(self.data):
+            for token in tokenize_item(item, fields):
+                index.setdefault(token, set()).add(idx)
+        return index
+
+    def _build_facet_index(self) -> Dict[str, Dict[str, Set[int]]]:
+        index: Dict[str, Dict[str, Set[int]]] = {}
+        for field, facet in self.facets.items():
+            values: Dict[str, Set[int]] = {}
+            for idx in range(len(self.data)):
+                for key in self.record_facet_keys(idx, field):
+                    values.setdefault(key, set()).add(idx)
+            index[field] = values
+        return index
+
+    def get_record(self, idx: int) -> Dict[str, Any]:
+        """Return the record at a position."""
+        return self.data[idx]
+
+    def record_facet_keys(self, idx: int, field: str) -> List[str]:
+        """Return the facet keys of the record at a position."""
+        if field in self.hierarchy_keys:
+            return self.hierarchy_keys[field][idx]
+        return facet_keys(self.data[idx].get(field), self.facets[field].get("type", "string"))
+
+    def match_token(self, token: str) -> Set[int]:
+        """Return the indices of items with an indexed token containing ``token``."""
+        cached = self._token_cache.get(token)
+        if cached is not None:
+            self._token_cache.move_to_end(token)
+            return cached
+        matches: Set[int] = set()
+        for index_token, indices in self.search_index.items():
+            if token in index_token:
+                matches |= indices
+        self._token_cache[token] = matches
+        if len(self._token_cache) > self.token_cache_size:
+            self._token_cache.popitem(last=False)
+        return matches
+
+    def facet_postings(self, field: str, value: str) -> Set[int]:
+        """Return the indices of items having a facet value."""
+        return self.facet_index.get(field, {}).get(value, set())
+
+    def facet_value_items(self, field: str) -> Iterable[Tuple[str, Set[int]]]:
+        """Iterate over (value, indices) pairs of a facet."""
+        return self.facet_index.get(field, {}).items()
+
+    def search(self, query: str = "", filters: Optional[Dict[str, Any]] = None) -> List[int]:
+        """Run a text query combined with facet filters.
+
+        Args:
+            query: Whitespace-separated search tokens
+            filters: Mapping of facet field to selected values or ``{"min", "max"}``
+
+        Returns:
+            Sorted list of matching record indices
+        """
+        result: Optional[Set[int]] = None
+        for token in query.lower().split():
+            matches = self.match_token(token)
+            result = set(matches) if result is None else result & matches
+            if not result:
+                return []
+
+        for field, selected in (filters or {}).items():
+            facet = self.facets.get(field)
+            if facet is None:
+                continue
+            if facet.get("type") in NUMERIC_FACET_TYPES:
+                if not isinstance(selected, dict):
+                    continue
+                matches = self._range_matches(field, selected)
+            elif not selected:
+                continue
+            elif facet.get("type") == "array":
+                matches = set.intersection(*(self.facet_postings(field, str(v)) for v in selected))
+            else:
+                matches = set().union(*(self.facet_postings(field, str(v)) for v in selected))
+            result = set(matches) if result is None else result & matches
+            if not result:
+                return []
+
+        if result is None:
+            return list(range(len(self)))
+        return sorted(result)
+
+    def _range_matches(self, field: str, selected: Dict[str, Any]) -> Set[int]:
+        low = selected.get("min", float("-inf"))
+        high = selected.get("max", float("inf"))
+        matches: Set[int] = set()
+        facet_type = self.facets[field].get("type", "integer")
+        for key, indices in self.facet_value_items(field):
+            number = parse_number(key, facet_type)
+            if number is not None and low <= number <= high:
+                matches |= indices
+        return matches
+
+    def facet_counts(self, indices: List[int]) -> Dict[str, Dict[str, int]]:
+        """Count facet values over a result set."""
+        counts: Dict[str, Dict[str, int]] = {}
+        for field in self.facets:
+            field_counts: Dict[str, int] = {}
+            for idx in indices:
+                for key in self.record_facet_keys(idx, field):
+                    field_counts[key] = field_counts.get(key, 0) + 1
+            counts[field] = field_counts
+        return counts
+
+    def facet_ranges(self) -> Dict[str, Dict[str, int]]:
+        """Return the global min/max of each numeric facet."""
+        ranges: Dict[str, Dict[str, int]] = {}
+        for field, facet in self.facets.items():
+            if facet.get("type") not in NUMERIC_FACET_TYPES:
+                continue
+            numbers = [n for n in (parse_number(k, facet["type"]) for k, _ in self.facet_value_items(field))
+                       if n is not None]
+            if numbers:
+                ranges[field] = {"min": min(numbers), "max": max(numbers)}
+        return ranges
+
+
+def parse_int(value: str) -> Optional[int]:
+    """Parse a leading integer like JavaScript's ``parseInt``."""
+    text = value.strip()
+    end = 1 if text[:1] in "+-" else 0
+    while end < len(text) and text[end].isdigit():
+        end += 1
+    digits = text[:end]
+    if digits in ("", "+", "-"):
+        return None
+    return int(digits)
+
+
+def parse_float(value: str) -> Optional[float]:
+    """Parse a leading number like JavaScript's ``parseFloat``."""
+    match = _FLOAT_PREFIX.match(value.strip())
+    if match is None:
+        return None
+    return float(match.group().replace("Infinity", "inf"))
+
+
+def parse_date(value: str) -> Optional[int]:
+    """Parse an ISO date (or the date part of a datetime) to days since 1970-01-01."""
+    try:
+        return (date.fromisoformat(value.strip()[:10]) - _EPOCH_DATE).days
+    except ValueError:
+        return None
+
+
+def parse_datetime(value: str) -> Optional[int]:
+    """Parse an ISO datetime to milliseconds since the epoch.
+
+    Datetimes without a UTC offset are read as UTC, as the browser does.
+    """
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    delta = parsed - _EPOCH
+    return delta.days * 86_400_000 + delta.seconds * 1000 + delta.microseconds // 1000
+
+
+def parse_number(value: str, facet_type: str) -> Optional[Union[int, float]]:
+    """Parse a range facet key the way the browser does for its facet type.
+
+    Args:
+        value: Facet key
+        facet_type: ``integer`` (``parseInt``), ``float`` (``parseFloat``),
+            ``date`` (epoch days) or ``datetime`` (epoch milliseconds)
+
+    Returns:
+        The number, or None if the key does not start with one
+    """
+    if facet_type == "float":
+        return parse_float(value)
+    if facet_type == "date":
+        return parse_date(value)
+    if facet_type == "datetime":
+        return parse_datetime(value)
+    return parse_int(value)
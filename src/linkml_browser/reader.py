@@ -0,0 +1,268 @@
+"""Streaming access to the records of deployed browsers.
+
+:func:`iter_records` reads records one at a time from any artifact the
+package writes or reads, so tools can filter, sample or re-deploy large
+galleries in constant memory:
+
+* ``data.js`` (``window.searchData = [...]``) and JSON arrays, parsed
+  incrementally a block at a time with the standard library's C scanner
+* JSON Lines (``.jsonl``, ``.ndjson``)
+* ``data.sqlite`` written by ``deploy --sqlite``
+* ``index.lbi`` written by ``deploy --binary-index``
+* a deployed browser directory, read from its ``data.js``
+"""
+
+import json
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from .query import js_string
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+_VALUE_START = re.compile(r"[\[{]")
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_json_array(f: TextIO, source: str = "input", block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Any]:
+    """Parse the elements of the first JSON array in a stream, one at a time.
+
+    Anything before the array, such as a ``window.searchData =`` assignment,
+    is skipped, as is anything after it. Only the unparsed part of the
+    current block and the element being parsed are held in memory.
+
+    Args:
+        f: Text stream
+        source: Name used in error messages
+        block_size: Characters read at a time
+
+    Yields:
+        Array elements
+
+    Raises:
+        ValueError: If the stream holds no array, or the array is malformed
+    """
+    decode = json.JSONDecoder().raw_decode
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def more() -> bool:
+        nonlocal buffer, pos, eof
+        block = f.read(block_size)
+        if not block:
+            eof = True
+            return False
+        buffer = buffer[pos:] + block
+        pos = 0
+        return True
+
+    while True:
+        start = _VALUE_START.search(buffer, pos)
+        if start:
+            break
+        pos = len(buffer)
+        if not more():
+            raise ValueError(f"No JSON array found in {source}")
+    if start.group() == "{":
+        raise ValueError(f"{source} holds a JSON object, not an array of records")
+    pos = start.end()
+
+    expect_value = True
+    first = True
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()  # type: ignore[union-attr]
+        if pos == len(buffer):
+            if not more():
+                raise ValueError(f"Unterminated JSON array in {source}")
+            continue
+        char = buffer[pos]
+        if char == "]":
+            if expect_value and not first:
+                raise ValueError(f"Trailing comma in JSON array in {source}")
+            return
+        if not expect_value:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array in {source}, found {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+        try:
+            value, end = decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise ValueError(f"Invalid JSON in {source}: {e.msg}") from e
+            # The element continues in the next block
+            more()
+            continue
+        if end == len(buffer) and not eof:
+            # A number at the end of the block may have more digits
+            more()
+            continue
+        yield value
+        pos = end
+        expect_value = False
+        first = False
+
+
+def _iter_json_lines(path: Path) -> Iterator[Any]:
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON on line {number} of {path}: {e.msg}") from e
+
+
+def _iter_sqlite(path: Path) -> Iterator[Any]:
+    import sqlite3
+
+    conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        for (text,) in conn.execute("SELECT json FROM records ORDER BY id"):
+            yield json.loads(text)
+    finally:
+        conn.close()
+
+
+def _iter_binary_index(path: Path) -> Iterator[Any]:
+    from .index_format import open_index
+
+    index = open_index(path)
+    try:
+        for idx in range(len(index)):
+            yield index.get_record(idx)
+    finally:
+        index.close()
+
+
+def iter_records(path: Path, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Stream the records of a dataset or deployed browser.
+
+    Args:
+        path: ``data.js``, JSON array, JSON Lines, ``data.sqlite`` or
+            ``index.lbi`` file, or a deployed browser directory
+        block_size: Characters read at a time from JSON files
+
+    Yields:
+        Records, in order
+
+    Raises:
+        ValueError: If the file cannot be parsed as records
+    """
+    path = Path(path)
+    if path.is_dir():
+        path = path / "data.js"
+    suffix = path.suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        yield from _iter_json_lines(path)
+    elif suffix in (".sqlite", ".db"):
+        yield from _iter_sqlite(path)
+    elif suffix == ".lbi":
+        yield from _iter_binary_index(path)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from iter_json_array(f, str(path), block_size)
+
+
+def load_records(path: Path) -> List[Dict[str, Any]]:
+    """Load all the records of a dataset or deployed browser.
+
+    Args:
+        path: Any source accepted by :func:`iter_records`
+
+    Returns:
+        List of records
+    """
+    return list(iter_records(path))
+
+
+def read_js_value(path: Path) -> Any:
+    """Read the JSON value assigned by a small script such as ``schema.js``.
+
+    Args:
+        path: Script of the form ``window.name = <JSON>;``
+
+    Returns:
+        The assigned value
+
+    Raises:
+        ValueError: If the script assigns no JSON value
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    start = _VALUE_START.search(text)
+    if start is None:
+        raise ValueError(f"No JSON value found in {path}")
+    try:
+        return json.JSONDecoder().raw_decode(text, start.start())[0]
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in {path}: {e.msg}") from e
+
+
+def match_records(records: Iterable[Any], conditions: List[Tuple[str, str]]) -> Iterator[Any]:
+    """Keep the records matching every condition.
+
+    Args:
+        records: Records to filter
+        conditions: ``(field, value)`` pairs; a record matches when the
+            field's value, or any element of an array value, has the string
+            form ``value`` (as facet values do in the browser)
+
+    Yields:
+        Matching records
+    """
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for field, value in conditions:
+            actual = record.get(field)
+            values = actual if isinstance(actual, list) else [actual]
+            if not any(v is not None and js_string(v) == value for v in values):
+                break
+        else:
+            yield record
+
+
+def sample_records(records: Iterable[Any], size: int, seed: int = 0) -> List[Any]:
+    """Draw a uniform random sample in one pass (reservoir sampling).
+
+    Args:
+        records: Records to sample
+        size: Sample size
+        seed: Random seed
+
+    Returns:
+        Up to ``size`` records, in their original order
+    """
+    rng = random.Random(seed)
+    reservoir: List[Tuple[int, Any]] = []
+    for i, record in enumerate(records):
+        if i < size:
+            reservoir.append((i, record))
+        else:
+            j = rng.randrange(i + 1)
+            if j < size:
+                reservoir[j] = (i, record)
+    reservoir.sort(key=lambda pair: pair[0])
+    return [record for _, record in reservoir]
+
+
+def write_json_lines(records: Iterable[Any], f: TextIO) -> int:
+    """Write records as JSON Lines.
+
+    Args:
+        records: Records to write
+        f: Text stream
+
+    Returns:
+        Records written
+    """
+    count = 0
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        f.write("\n")
+        count += 1
+    return count
@@ -0,0 +1,190 @@
+"""Streaming serialization of records to ``data.js`` style scripts.
+
+Records are encoded in chunks and each chunk is written as soon as it is
+encoded, so peak memory is bounded by the chunk size rather than by the
+output, which for large datasets is several times the size of the records.
+Output is minified unless ``pretty`` is requested; pretty output matches
+``json.dumps(records, indent=2, ensure_ascii=False)``.
+
+Chunks are encoded with ``orjson`` when it is installed (the ``fast`` extra),
+and with the standard library otherwise. The standard library is made to
+agree with ``orjson``: non-ASCII text is written as UTF-8 rather than
+escaped, and NaN and infinities, which JSON cannot represent, are written as
+``null``. The two then write the same bytes, except that floats with an
+exponent may be spelled differently (``1e+16`` and ``1e16``), which parse to
+the same value.
+
+With more than one worker, chunks are encoded in a process pool and written
+in order. Where processes are forked, the pool inherits the records and
+tasks are just record ranges; elsewhere each chunk is sent to its worker.
+"""
+
+import json
+import math
+import os
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Iterable, Optional, Sequence
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+DEFAULT_CHUNK_SIZE = 5000
+
+READY_EVENT = "window.dispatchEvent(new Event('searchDataReady'));\n"
+
+# Records shared with forked workers (see _encode_range)
+_shared_records: Sequence[Any] = ()
+
+
+def encode_chunk(records: Sequence[Any], pretty: bool = False) -> bytes:
+    """Encode records as the elements of a JSON array, without the brackets.
+
+    Args:
+        records: Records to encode (at least one)
+        pretty: Indent like ``json.dumps(..., indent=2)`` for elements of a
+            top-level array
+
+    Returns:
+        UTF-8 encoded elements, separated by commas
+    """
+    if orjson is not None:
+        try:
+            text = orjson.dumps(list(records), option=orjson.OPT_INDENT_2 if pretty else 0)
+            return text[2:-2] if pretty else text[1:-1]
+        except TypeError:
+            # Values orjson rejects, such as integers beyond 64 bits
+            pass
+    if pretty:
+        return _dumps(list(records), indent=2)[2:-2]
+    return _dumps(list(records), separators=(",", ":"))[1:-1]
+
+
+def _dumps(value: Any, **options: Any) -> bytes:
+    """Encode with the standard library the way orjson does."""
+    try:
+        text = json.dumps(value, ensure_ascii=False, allow_nan=False, **options)
+    except ValueError:
+        text = json.dumps(_finite(value), ensure_ascii=False, **options)
+    try:
+        return text.encode()
+    except UnicodeEncodeError:
+        # Lone surrogates have no UTF-8 encoding; keep them as escapes
+        return json.dumps(_finite(value), **options).encode()
+
+
+def _finite(value: Any) -> Any:
+    """Replace NaN and infinities with None, as orjson does."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _encode_range(start: int, end: int, pretty: bool) -> bytes:
+    return encode_chunk(_shared_records[start:end], pretty)
+
+
+def _chunk_encodings(records: Iterable[Any], pretty: bool, workers: int, chunk_size: int) -> Iterable[bytes]:
+    if not isinstance(records, Sequence):
+        # Streamed records are encoded as they arrive
+        iterator = iter(records)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield encode_chunk(chunk, pretty)
+
+    ranges = [(start, min(start + chunk_size, len(records))) for start in range(0, len(records), chunk_size)]
+    if workers <= 1 or len(ranges) <= 1:
+        for start, end in ranges:
+            yield encode_chunk(records[start:end], pretty)
+        return
+
+    # Imported here as multiprocessing is slow to import and most writes are serial
+    import multiprocessing
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    global _shared_records
+    forked = "fork" in multiprocessing.get_all_start_methods()
+    if forked:
+        _shared_records = records
+    try:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("fork") if forked else None) as pool:
+            # A bounded number of chunks in flight keeps memory flat
+            pending: Deque[Future] = deque()
+            for start, end in ranges:
+                if forked:
+                    pending.append(pool.submit(_encode_range, start, end, pretty))
+                else:
+                    pending.append(pool.submit(encode_chunk, records[start:end], pretty))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        _shared_records = ()
+
+
+def write_records_js(
+    output_path: Path,
+    records: Iterable[Any],
+    variable: Optional[str] = "window.searchData",
+    pretty: bool = False,
+    workers: Optional[int] = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    footer: str = READY_EVENT,
+) -> int:
+    """Write records as a script assigning a JSON array, chunk by chunk.
+
+    Args:
+        output_path: Script to write
+        records: Records to serialize; a sequence can be encoded in
+            parallel, other iterables are encoded as they are consumed
+        variable: Assignment target, or None to write a plain JSON array
+            (without ``footer``)
+        pretty: Indent the JSON instead of minifying it
+        workers: Encoding processes (None: the CPU count)
+        chunk_size: Records per chunk
+        footer: Text written after the assignment
+
+    Returns:
+        Bytes written
+    """
+    workers = workers or os.cpu_count() or 1
+    separator = b",\n" if pretty else b","
+    written = 0
+    with open(output_path, "wb") as f:
+        written += f.write(f"{variable} = [".encode() if variable else b"[")
+        empty = True
+        for chunk in _chunk_encodings(records, pretty, workers, chunk_size):
+            written += f.write((b"\n" if pretty else b"") if empty else separator)
+            written += f.write(chunk)
+            empty = False
+        end = b"]" if empty or not pretty else b"\n]"
+        written += f.write(end + (b";\n" + footer.encode() if variable else b"\n"))
+    return written
+
+
+def write_json_js(output_path: Path, value: Any, variable: str, pretty: bool = False,
+                  footer: str = READY_EVENT) -> None:
+    """Write a small JSON value as a script assignment.
+
+    Args:
+        output_path: Script to write
+        value: JSON value
+        variable: Assignment target
+        pretty: Indent the JSON instead of minifying it
+        footer: Text written after the assignment
+    """
+    text = json.dumps(value, indent=2) if pretty else json.dumps(value, separators=(",", ":"))
+    with open(output_path, "w") as f:
+        f.write(f"{variable} = {text};\n{footer}")
+
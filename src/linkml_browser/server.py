@@ -0,0 +1,296 @@
+"""Local HTTP server exposing a paginated search API for large datasets."""
+
+import asyncio
+import hashlib
+import json
+import logging
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .query import NUMERIC_FACET_TYPES, SearchEngine, search_syntax
+
+logger = logging.getLogger(__name__)
+
+Response = Tuple[int, str, bytes]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+class BadRequest(ValueError):
+    """Raised for malformed API parameters."""
+
+
+class BrowserServer:
+    """Serves the browser UI in remote-backend mode plus a JSON query API.
+
+    Endpoints:
+        ``/api/search``: records page, total and facet counts for a query
+        ``/api/facets``: facet counts for a query
+        ``/api/records``: page of records in dataset order
+        ``/api/schema``: the browser schema
+
+    Responses carry an ETag derived from the dataset version and the request
+    URL, so repeated requests are answered with ``304 Not Modified`` without
+    re-running the query. Query work runs in a thread pool behind a semaphore
+    that bounds how many queries execute at once.
+    """
+
+    def __init__(self,
+                 index: SearchEngine,
+                 schema: Dict[str, Any],
+                 version: Optional[str] = None,
+                 max_concurrency: int = 4):
+        """Initialize the server.
+
+        Args:
+            index: Query engine over the dataset
+            schema: Browser schema
+            version: Identifier of the dataset contents, used in ETags
+            max_concurrency: Maximum number of queries evaluated at once
+        """
+        self.index = index
+        self.schema = schema
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        if version is None:
+            version = str(len(index))
+        fingerprint = f"{version}|{json.dumps(schema, sort_keys=True)}"
+        self.version = hashlib.sha1(fingerprint.encode()).hexdigest()[:12]
+        self._routes: Dict[str, Callable[[Dict[str, List[str]]], Response]] = {
+            "/": self._index_html,
+            "/index.html": self._index_html,
+            "/data.js": self._data_js,
+            "/schema.js": self._schema_js,
+            "/indexes.js": self._indexes_js,
+            "/api/schema": self._api_schema,
+            "/api/search": self._api_search,
+            "/api/facets": self._api_facets,
+            "/api/records": self._api_records,
+        }
+
+    def etag(self, target: str) -> str:
+        """Return the ETag for a request target."""
+        digest = hashlib.sha1(f"{self.version}|{target}".encode()).hexdigest()[:16]
+        return f'"{digest}"'
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on a connection until it is closed."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._write(writer, HTTPStatus.BAD_REQUEST, "text/plain", b"Bad request", {})
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                status, content_type, body, extra = await self.respond(method, target, headers)
+                extra["Connection"] = "keep-alive" if keep_alive else "close"
+                await self._write(writer, status, content_type, b"" if method == "HEAD" else body, extra,
+                                  content_length=len(body))
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def respond(self, method: str, target: str,
+                      headers: Dict[str, str]) -> Tuple[int, str, bytes, Dict[str, str]]:
+        """Produce the response for a single request."""
+        if method not in ("GET", "HEAD"):
+            return HTTPStatus.METHOD_NOT_ALLOWED, "text/plain", b"Method not allowed", {"Allow": "GET, HEAD"}
+        url = urlsplit(target)
+        handler = self._routes.get(url.path)
+        if handler is None:
+            return HTTPStatus.NOT_FOUND, "text/plain", b"Not found", {}
+
+        etag = self.etag(target)
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if headers.get("if-none-match") == etag:
+            return HTTPStatus.NOT_MODIFIED, "", b"", cache_headers
+
+        params = parse_qs(url.query)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            try:
+                status, content_type, body = await loop.run_in_executor(None, handler, params)
+            except BadRequest as e:
+                return HTTPStatus.BAD_REQUEST, "application/json", _json_bytes({"error": str(e)}), {}
+            except Exception:
+                logger.exception("Error handling %s", target)
+                payload = _json_bytes({"error": "Internal server error"})
+                return HTTPStatus.INTERNAL_SERVER_ERROR, "application/json", payload, {}
+        return status, content_type, body, cache_headers
+
+    async def _write(self, writer: asyncio.StreamWriter, status: int, content_type: str, body: bytes,
+                     extra: Dict[str, str], content_length: Optional[int] = None) -> None:
+        reason = HTTPStatus(status).phrase
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        lines.append(f"Content-Length: {len(body) if content_length is None else content_length}")
+        lines.extend(f"{name}: {value}" for name, value in extra.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8000,
+                            on_ready: Optional[Callable[[asyncio.AbstractServer], None]] = None) -> None:
+        """Listen for connections until cancelled."""
+        server = await asyncio.start_server(self.handle, host, port)
+        if on_ready:
+            on_ready(server)
+        async with server:
+            await server.serve_forever()
+
+    # Route handlers
+
+    def _index_html(self, params: Dict[str, List[str]]) -> Response:
+        template = (Path(__file__).parent / "index.html").read_bytes()
+        return HTTPStatus.OK, "text/html; charset=utf-8", template
+
+    def _data_js(self, params: Dict[str, List[str]]) -> Response:
+        remote = {"endpoint": "api", "total": len(self.index)}
+        js_content = "window.searchData = [];\n"
+        js_content += f"window.searchRemote = {json.dumps(remote)};\n"
+        js_content += "window.dispatchEvent(new Event('searchDataReady'));\n"
+        return HTTPStatus.OK, "application/javascript; charset=utf-8", js_content.encode()
+
+    def _schema_js(self, params: Dict[str, List[str]]) -> Response:
+        js_content = f"window.searchSchema = {json.dumps(self.schema)};\n"
+        js_content += "window.dispatchEvent(new Event('searchDataReady'));\n"
+        return HTTPStatus.OK, "application/javascript; charset=utf-8", js_content.encode()
+
+    def _indexes_js(self, params: Dict[str, List[str]]) -> Response:
+        # Records are fetched page by page, so the page has no precomputed indexes to load
+        js_content = "window.searchIndexes = null;\n"
+        return HTTPStatus.OK, "application/javascript; charset=utf-8", js_content.encode()
+
+    def _api_schema(self, params: Dict[str, List[str]]) -> Response:
+        return HTTPStatus.OK, "application/json", _json_bytes(self.schema)
+
+    def _api_search(self, params: Dict[str, List[str]]) -> Response:
+        indices = self._run_query(params)
+        offset, limit = _page_params(params)
+        payload = {
+            "total": len(indices),
+            "offset": offset,
+            "limit": limit,
+            "records": [self.index.get_record(idx) for idx in indices[offset:offset + limit]],
+        }
+        if _param(params, "facets", "1") != "0":
+            payload["facets"] = _sorted_counts(self.index.facet_counts(indices))
+            payload["ranges"] = self.index.facet_ranges()
+        return HTTPStatus.OK, "application/json", _json_bytes(payload)
+
+    def _api_facets(self, params: Dict[str, List[str]]) -> Response:
+        indices = self._run_query(params)
+        payload = {
+            "total": len(indices),
+            "facets": _sorted_counts(self.index.facet_counts(indices)),
+            "ranges": self.index.facet_ranges(),
+        }
+        return HTTPStatus.OK, "application/json", _json_bytes(payload)
+
+    def _api_records(self, params: Dict[str, List[str]]) -> Response:
+        offset, limit = _page_params(params)
+        end = min(offset + limit, len(self.index))
+        payload = {
+            "total": len(self.index),
+            "offset": offset,
+            "limit": limit,
+            "records": [self.index.get_record(idx) for idx in range(offset, end)],
+        }
+        return HTTPStatus.OK, "application/json", _json_bytes(payload)
+
+    def _run_query(self, params: Dict[str, List[str]]) -> List[int]:
+        query = _param(params, "q", "")
+        fields = [*self.schema.get("searchableFields", []), *(f["field"] for f in self.schema.get("facets", []))]
+        syntax = search_syntax(query, fields)
+        if syntax:
+            raise BadRequest(f"The server does not support {syntax}; search for plain words instead")
+        try:
+            filters = json.loads(_param(params, "filters", "{}"))
+        except json.JSONDecodeError as e:
+            raise BadRequest(f"Invalid filters JSON: {e}")
+        if not isinstance(filters, dict):
+            raise BadRequest("filters must be a JSON object")
+        facet_types = {facet["field"]: facet.get("type", "string") for facet in self.schema.get("facets", [])}
+        for field, selected in filters.items():
+            if facet_types.get(field) in NUMERIC_FACET_TYPES and isinstance(selected, dict):
+                for bound in ("min", "max"):
+                    if bound in selected and not _is_number(selected[bound]):
+                        raise BadRequest(f"{bound} of the {field} filter must be a number")
+            elif not isinstance(selected, list) or not all(_is_scalar(v) for v in selected):
+                raise BadRequest(f"The {field} filter must be a list of values")
+        return self.index.search(query, filters)
+
+
+def _param(params: Dict[str, List[str]], name: str, default: str) -> str:
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def _page_params(params: Dict[str, List[str]]) -> Tuple[int, int]:
+    try:
+        offset = int(_param(params, "offset", "0"))
+        limit = int(_param(params, "limit", str(DEFAULT_PAGE_SIZE)))
+    except ValueError:
+        raise BadRequest("offset and limit must be integers")
+    if offset < 0 or limit < 0:
+        raise BadRequest("offset and limit must be non-negative")
+    return offset, min(limit, MAX_PAGE_SIZE)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+def _sorted_counts(counts: Dict[str, Dict[str, int]]) -> Dict[str, List[List[Any]]]:
+    return {
+        field: [[key, count] for key, count in sorted(values.items(), key=lambda kv: -kv[1])]
+        for field, values in counts.items()
+    }
+
+
+def _json_bytes(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def run_server(index: SearchEngine,
+               schema: Dict[str, Any],
+               host: str = "127.0.0.1",
+               port: int = 8000,
+               version: Optional[str] = None,
+               max_concurrency: int = 4,
+               on_ready: Optional[Callable[[asyncio.AbstractServer], None]] = None) -> None:
+    """Run the browser server until interrupted.
+
+    Args:
+        index: Query engine over the dataset
+        schema: Browser schema
+        host: Interface to bind
+        port: Port to listen on
+        version: Identifier of the dataset contents, used in ETags
+        max_concurrency: Maximum number of queries evaluated at once
+        on_ready: Optional callback invoked once the socket is listening
+    """
+    server = BrowserServer(index, schema, version=version, max_concurrency=max_concurrency)
+    asyncio.run(server.serve_forever(host, port, on_ready))
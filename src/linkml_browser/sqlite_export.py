@@ -0,0 +1,235 @@
+"""SQLite export backend for deployed datasets.
+
+The database holds everything needed to answer browser queries:
+
+* ``records``: the compact JSON of every record, keyed by its position
+* ``facet_values``: one row per (record, facet, value), indexed on
+  ``(field, value)`` and ``(field, num)`` so filters are index lookups and
+  facet counts are ``GROUP BY`` queries
+* ``search``: an FTS5 table over the lowercased searchable text using the
+  trigram tokenizer, which supports the browser's substring matching
+* ``meta``: format version and browser schema
+
+The file is written with a small page size, a rollback journal and a final
+``VACUUM``, a layout suited to future sql.js/HTTP-VFS use; no browser reader
+exists yet. From Python it is queried with the standard library through
+:class:`SqliteIndex`.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .query import NUMERIC_FACET_TYPES, facet_keys, hierarchy_keys, parse_number, tokenize_item
+
+FORMAT_VERSION = 1
+PAGE_SIZE = 4096
+
+_SCHEMA_SQL = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE records (id INTEGER PRIMARY KEY, json TEXT NOT NULL);
+CREATE TABLE facet_values (record_id INTEGER NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, num INTEGER);
+CREATE VIRTUAL TABLE search USING fts5(content, tokenize='trigram');
+"""
+
+_INDEX_SQL = """
+CREATE INDEX facet_values_by_value ON facet_values (field, value, record_id);
+CREATE INDEX facet_values_by_num ON facet_values (field, num, record_id) WHERE num IS NOT NULL;
+CREATE INDEX facet_values_by_record ON facet_values (record_id);
+"""
+
+
+def write_sqlite(output_path: Path, data: List[Dict[str, Any]], schema: Dict[str, Any]) -> None:
+    """Write a dataset to a single SQLite file.
+
+    Args:
+        output_path: Path of the database to create (overwritten if present)
+        data: List of JSON objects
+        schema: Browser schema with searchableFields and facets
+    """
+    output_path = Path(output_path)
+    if output_path.exists():
+        output_path.unlink()
+    facets = [facet for facet in schema.get("facets", []) if not facet["field"].startswith("__")]
+    searchable_fields = schema.get("searchableFields", [])
+    hierarchies = {facet["field"]: hierarchy_keys(data, facet) for facet in facets if facet.get("type") == "hierarchy"}
+
+    conn = sqlite3.connect(output_path)
+    try:
+        conn.execute(f"PRAGMA page_size = {PAGE_SIZE}")
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.executescript(_SCHEMA_SQL)
+        with conn:
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("version", str(FORMAT_VERSION)),
+                ("count", str(len(data))),
+                ("schema", json.dumps(schema)),
+            ])
+            for idx, item in enumerate(data):
+                conn.execute("INSERT INTO records VALUES (?, ?)", (idx, json.dumps(item, separators=(",", ":"))))
+                conn.execute("INSERT INTO search (rowid, content) VALUES (?, ?)",
+                             (idx, " ".join(tokenize_item(item, searchable_fields))))
+                rows = []
+                for facet in facets:
+                    facet_type = facet.get("type", "string")
+                    is_numeric = facet_type in NUMERIC_FACET_TYPES
+                    if facet["field"] in hierarchies:
+                        keys = hierarchies[facet["field"]][idx]
+                    else:
+                        keys = facet_keys(item.get(facet["field"]), facet_type)
+                    for key in keys:
+                        rows.append((idx, facet["field"], key, parse_number(key, facet_type) if is_numeric else None))
+                conn.executemany("INSERT INTO facet_values VALUES (?, ?, ?, ?)", rows)
+        conn.executescript(_INDEX_SQL)
+        conn.execute("INSERT INTO search (search) VALUES ('optimize')")
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+class SqliteIndex:
+    """Query engine over a database written by :func:`write_sqlite`.
+
+    Results follow the same semantics as :class:`~linkml_browser.query.DatasetIndex`.
+    The connection is shared between threads behind a lock, so an instance can
+    back the ``serve`` command.
+    """
+
+    def __init__(self, path: Path):
+        """Open a database read-only.
+
+        Args:
+            path: Path to the SQLite file
+
+        Raises:
+            ValueError: If the file is not an exported dataset
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        try:
+            meta = dict(self.conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"{path} is not a LinkML Browser SQLite export: {e}")
+        if meta.get("version") != str(FORMAT_VERSION):
+            raise ValueError(f"Unsupported SQLite export version {meta.get('version')}")
+        self.count = int(meta["count"])
+        self.schema: Dict[str, Any] = json.loads(meta["schema"])
+        self.facets: Dict[str, Dict[str, Any]] = {
+            facet["field"]: facet for facet in self.schema.get("facets", []) if not facet["field"].startswith("__")
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_record(self, idx: int) -> Dict[str, Any]:
+        """Decode the record at a position."""
+        with self._lock:
+            row = self.conn.execute("SELECT json FROM records WHERE id = ?", (idx,)).fetchone()
+        if row is None:
+            raise IndexError(idx)
+        return json.loads(row[0])
+
+    def _conditions(self, query: str, filters: Optional[Dict[str, Any]]) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for token in query.lower().split():
+            if len(token) >= 3:
+                # Trigram FTS answers substring matches from the index
+                clauses.append("id IN (SELECT rowid FROM search WHERE search MATCH ?)")
+                params.append('"' + token.replace('"', '""') + '"')
+            else:
+                escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                clauses.append("id IN (SELECT rowid FROM search WHERE content LIKE ? ESCAPE '\\')")
+                params.append(f"%{escaped}%")
+
+        for field, selected in (filters or {}).items():
+            facet = self.facets.get(field)
+            if facet is None:
+                continue
+            if facet.get("type") in NUMERIC_FACET_TYPES:
+                if not isinstance(selected, dict):
+                    continue
+                clauses.append("id IN (SELECT record_id FROM facet_values WHERE field = ? AND num BETWEEN ? AND ?)")
+                params.extend([field, selected.get("min", -(2 ** 63)), selected.get("max", 2 ** 63 - 1)])
+            elif not selected:
+                continue
+            elif facet.get("type") == "array":
+                for value in selected:
+                    clauses.append("id IN (SELECT record_id FROM facet_values WHERE field = ? AND value = ?)")
+                    params.extend([field, str(value)])
+            else:
+                placeholders = ", ".join("?" for _ in selected)
+                clauses.append(
+                    f"id IN (SELECT record_id FROM facet_values WHERE field = ? AND value IN ({placeholders}))"
+                )
+                params.append(field)
+                params.extend(str(value) for value in selected)
+        return clauses, params
+
+    def search(self, query: str = "", filters: Optional[Dict[str, Any]] = None) -> List[int]:
+        """Run a text query combined with facet filters.
+
+        Args:
+            query: Whitespace-separated search tokens
+            filters: Mapping of facet field to selected values or ``{"min", "max"}``
+
+        Returns:
+            Sorted list of matching record indices
+        """
+        clauses, params = self._conditions(query, filters)
+        sql = "SELECT id FROM records"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        with self._lock:
+            return [row[0] for row in self.conn.execute(sql, params)]
+
+    def facet_counts(self, indices: List[int]) -> Dict[str, Dict[str, int]]:
+        """Count facet values over a result set with a single ``GROUP BY``."""
+        counts: Dict[str, Dict[str, int]] = {field: {} for field in self.facets}
+        with self._lock:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS hits (id INTEGER PRIMARY KEY)")
+            self.conn.execute("DELETE FROM hits")
+            self.conn.executemany("INSERT INTO hits VALUES (?)", ((idx,) for idx in indices))
+            rows = self.conn.execute(
+                "SELECT field, value, COUNT(*) FROM facet_values JOIN hits ON record_id = hits.id "
+                "GROUP BY field, value"
+            ).fetchall()
+        for field, value, count in rows:
+            if field in counts:
+                counts[field][value] = count
+        return counts
+
+    def facet_ranges(self) -> Dict[str, Dict[str, int]]:
+        """Return the global min/max of each numeric facet."""
+        ranges: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for field, facet in self.facets.items():
+                if facet.get("type") not in NUMERIC_FACET_TYPES:
+                    continue
+                low, high = self.conn.execute(
+                    "SELECT MIN(num), MAX(num) FROM facet_values WHERE field = ? AND num IS NOT NULL", (field,)
+                ).fetchone()
+                if low is not None:
+                    ranges[field] = {"min": low, "max": high}
+        return ranges
+
+
+def open_sqlite(path: Path) -> SqliteIndex:
+    """Open an exported SQLite dataset.
+
+    Args:
+        path: Path to the SQLite file
+
+    Returns:
+        Query engine backed by the database
+    """
+    return SqliteIndex(path)
@@ -0,0 +1,297 @@
+"""Validation of records against a browser schema before deployment.
+
+Records are checked in chunks, in a process pool when there are enough of
+them, and the problems are aggregated by class: every record whose ``year``
+facet holds text counts towards one ``year: not a valid integer`` entry,
+which keeps a bounded sample of the offending records. A chunk result only
+carries these aggregates, so the report stays small however many records
+fail.
+
+Checks against the browser schema cover what the browser would otherwise
+discover at runtime:
+
+* single-value facets (``string``, ``boolean``, numeric) holding arrays or
+  objects, and ``array`` facets holding objects
+* ``integer``, ``float``, ``date`` and ``datetime`` values the browser cannot
+  parse, and ``boolean`` values that are not JSON booleans
+* searchable fields holding objects, which index as ``[object Object]``
+
+Records can also be validated against a LinkML schema with
+``linkml``'s JSON Schema validator, given a target class.
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .query import NUMERIC_FACET_TYPES, js_string, parse_number
+
+DEFAULT_CHUNK_SIZE = 20000
+DEFAULT_SAMPLE_SIZE = 5
+
+_SCALAR_TYPES = (str, int, float, bool)
+
+# Set in each worker by _init_worker, so the schemas are sent once per process
+_worker_state: Dict[str, Any] = {}
+
+# JSON Schema messages start with the offending value ("'x' is not of type ..."),
+# which is replaced so that one problem class covers every such value; a
+# missing property is named the same way but is the class itself
+_LEADING_VALUE = re.compile(r"^(?:'(?:[^'\\]|\\.)*'|\S+) is (?!a required property)")
+
+
+def _describe(value: Any) -> str:
+    text = repr(value)
+    return text if len(text) <= 80 else text[:77] + "..."
+
+
+def _shape_problem(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        return "expected a single value, got an array"
+    if isinstance(value, dict):
+        return "expected a single value, got an object"
+    return None
+
+
+def _holds_objects(value: Any) -> bool:
+    if type(value) is list:
+        return any(type(v) is dict for v in value)
+    return type(value) is dict
+
+
+def _facet_check(facet_type: str) -> Callable[[Any], Optional[str]]:
+    """Build the check of one facet's values, with fast paths for JSON-native values."""
+    if facet_type in ("array", "hierarchy"):
+        return lambda value: "holds objects" if _holds_objects(value) else None
+    if facet_type == "boolean":
+        return lambda value: None if value is True or value is False else _shape_problem(value) or "not a boolean"
+    if facet_type in NUMERIC_FACET_TYPES:
+        problem = f"not a valid {facet_type}"
+        native = (int, float) if facet_type in ("integer", "float") else ()
+
+        def check_number(value: Any) -> Optional[str]:
+            if type(value) in native:
+                return None
+            if type(value) is bool:
+                return problem
+            shape = _shape_problem(value)
+            if shape:
+                return shape
+            return problem if parse_number(js_string(value), facet_type) is None else None
+
+        return check_number
+    return lambda value: None if type(value) in _SCALAR_TYPES else _shape_problem(value)
+
+
+def _compile_checks(schema: Dict[str, Any]) -> List[Tuple[str, Callable[[Any], Optional[str]]]]:
+    checks = [(facet["field"], _facet_check(facet.get("type", "string"))) for facet in schema.get("facets", [])]
+    for field in schema.get("searchableFields", []):
+        checks.append((field, lambda value: "searchable field holds objects" if _holds_objects(value) else None))
+    return checks
+
+
+def _record_problems(record: Any, checks: List[Tuple[str, Callable[[Any], Optional[str]]]]) -> Iterator[Tuple[str, Any]]:
+    if type(record) is not dict:
+        yield "record: not a JSON object", record
+        return
+    for field, check in checks:
+        value = record.get(field)
+        if value is not None:
+            problem = check(value)
+            if problem:
+                yield f"{field}: {problem}", value
+
+
+def check_record(record: Any, schema: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """Check one record against a browser schema.
+
+    Args:
+        record: JSON value that should be an object
+        schema: Browser schema
+
+    Yields:
+        ``(problem class, offending value)`` pairs
+    """
+    return _record_problems(record, _compile_checks(schema))
+
+
+def empty_report() -> Dict[str, Any]:
+    """Create a report with no records.
+
+    Returns:
+        ``{"records": 0, "problems": {}}``, where ``problems`` maps a problem
+        class to ``{"count": n, "samples": [[record index, value], ...]}``
+    """
+    return {"records": 0, "problems": {}}
+
+
+def _add(report: Dict[str, Any], problem: str, index: int, value: str, sample_size: int) -> None:
+    entry = report["problems"].setdefault(problem, {"count": 0, "samples": []})
+    entry["count"] += 1
+    if len(entry["samples"]) < sample_size:
+        entry["samples"].append([index, value])
+
+
+def merge_reports(report: Dict[str, Any], other: Dict[str, Any], sample_size: int = DEFAULT_SAMPLE_SIZE) -> None:
+    """Add the counts and samples of ``other`` to ``report``.
+
+    Args:
+        report: Report updated in place
+        other: Report of further records
+        sample_size: Samples kept per problem class
+    """
+    report["records"] += other["records"]
+    for problem, entry in other["problems"].items():
+        target = report["problems"].setdefault(problem, {"count": 0, "samples": []})
+        target["count"] += entry["count"]
+        target["samples"].extend(entry["samples"][: max(0, sample_size - len(target["samples"]))])
+
+
+def validate_chunk(
+    records: List[Any],
+    offset: int,
+    schema: Dict[str, Any],
+    linkml_validator: Any = None,
+    target_class: Optional[str] = None,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> Dict[str, Any]:
+    """Validate a chunk of records.
+
+    Args:
+        records: Records to check
+        offset: Position of the first record in the dataset
+        schema: Browser schema
+        linkml_validator: Optional ``linkml.validator.Validator``
+        target_class: LinkML class the records instantiate
+        sample_size: Samples kept per problem class
+
+    Returns:
+        Report for the chunk (see :func:`empty_report`)
+    """
+    report = empty_report()
+    report["records"] = len(records)
+    checks = _compile_checks(schema)
+    for i, record in enumerate(records, offset):
+        for problem, value in _record_problems(record, checks):
+            _add(report, problem, i, _describe(value), sample_size)
+        if linkml_validator is not None and type(record) is dict:
+            for result in linkml_validator.iter_results(record, target_class):
+                problem = _LEADING_VALUE.sub("value is ", result.message)
+                _add(report, f"linkml: {problem}", i, _describe(record.get("id", record)), sample_size)
+    return report
+
+
+def _linkml_validator(linkml_schema: Path) -> Any:
+    from linkml.validator import Validator  # type: ignore[import-untyped]
+    from linkml.validator.plugins import JsonschemaValidationPlugin  # type: ignore[import-untyped]
+
+    return Validator(str(linkml_schema), validation_plugins=[JsonschemaValidationPlugin(closed=False)])
+
+
+def _init_worker(schema: Dict[str, Any], linkml_schema: Optional[Path], target_class: Optional[str],
+                 sample_size: int) -> None:
+    _worker_state.update(
+        schema=schema,
+        validator=_linkml_validator(linkml_schema) if linkml_schema else None,
+        target_class=target_class,
+        sample_size=sample_size,
+    )
+
+
+def _validate_in_worker(records: List[Any], offset: int) -> Dict[str, Any]:
+    return validate_chunk(records, offset, _worker_state["schema"], _worker_state["validator"],
+                          _worker_state["target_class"], _worker_state["sample_size"])
+
+
+def _chunks(records: Iterable[Any], chunk_size: int) -> Iterator[Tuple[List[Any], int]]:
+    iterator = iter(records)
+    offset = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk, offset
+        offset += len(chunk)
+
+
+def validate_records(
+    data: Iterable[Any],
+    schema: Dict[str, Any],
+    linkml_schema: Optional[Path] = None,
+    target_class: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> Dict[str, Any]:
+    """Validate records against a browser schema, and optionally a LinkML schema.
+
+    Records are read in chunks as they are consumed from ``data``, which may
+    be a generator. Datasets of more than one chunk are checked in a process
+    pool with a bounded number of chunks in flight, each worker building its
+    LinkML validator once.
+
+    Args:
+        data: Records to check
+        schema: Browser schema
+        linkml_schema: Optional LinkML schema YAML file
+        target_class: LinkML class the records instantiate (defaults to the
+            schema's ``tree_root`` class)
+        workers: Worker processes (default: CPU count; 1 checks in-process)
+        chunk_size: Records per task
+        sample_size: Samples kept per problem class
+
+    Returns:
+        Aggregated report (see :func:`empty_report`)
+    """
+    report = empty_report()
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(data, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        return report
+    second = next(chunks, None) if workers > 1 else None
+
+    if second is None:
+        validator = _linkml_validator(linkml_schema) if linkml_schema else None
+        for records, offset in chain([first], chunks):
+            merge_reports(report, validate_chunk(records, offset, schema, validator, target_class, sample_size),
+                          sample_size)
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(schema, linkml_schema, target_class, sample_size)) as pool:
+        # Results are merged in submission order, so samples list the earliest records
+        pending: Deque[Future] = deque()
+        for records, offset in chain([first, second], chunks):
+            pending.append(pool.submit(_validate_in_worker, records, offset))
+            if len(pending) >= 2 * workers:
+                merge_reports(report, pending.popleft().result(), sample_size)
+        while pending:
+            merge_reports(report, pending.popleft().result(), sample_size)
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a report for the console.
+
+    Args:
+        report: Report returned by :func:`validate_records`
+
+    Returns:
+        One line per problem class, most frequent first, each followed by
+        its samples
+    """
+    problems = report["problems"]
+    if not problems:
+        return f"Validated {report['records']} records: no problems found"
+    total = sum(entry["count"] for entry in problems.values())
+    lines = [f"Validated {report['records']} records: {total} problems in {len(problems)} classes"]
+    for problem, entry in sorted(problems.items(), key=lambda item: (-item[1]["count"], item[0])):
+        lines.append(f"  {problem} ({entry['count']} records)")
+        for index, value in entry["samples"]:
+            lines.append(f"    record {index}: {value}")
+    return "\n".join(lines)
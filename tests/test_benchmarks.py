@@ -0,0 +1,57 @@
+"""Smoke tests for the benchmark suite."""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+RUNNER = ROOT / "benchmarks" / "run_benchmarks.py"
+
+
+def run_benchmarks(tmp_path, *extra):
+    """Run the benchmark script at a tiny size and return its results."""
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [sys.executable, str(RUNNER), "--sizes", "50", "--linkml-classes", "3", "--repeat", "1",
+         "--output", str(output), *extra],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(output.read_text())["results"]
+
+
+def test_python_benchmarks(tmp_path):
+    """Test that generator benchmarks report wall time, memory and output size."""
+    results = run_benchmarks(tmp_path, "--skip-js")
+    by_name = {r["benchmark"]: r for r in results}
+    assert by_name["python.create_data_js"]["output_bytes"] > 0
+    assert by_name["python.infer_schema"]["peak_mb"] >= 0
+    assert by_name["python.extract_linkml_elements"]["dataset"] == "linkml-3"
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_js_benchmarks(tmp_path):
+    """Test that the browser engine runs headlessly and answers the sample queries."""
+    results = run_benchmarks(tmp_path)
+    search = next(r for r in results if r["benchmark"] == "js.search_median")
+    assert search["queries"][0]["results"] == 50
+    # Phase timings recorded by the in-page instrumentation
+    assert search["phases"]["text-match"]["count"] == len(search["queries"]) + 1
+    assert set(search["phases"]["total"]) == {"count", "p50", "p90", "p99", "max"}
+
+
+def test_baseline_regression_exit_code(tmp_path):
+    """Test that a slower run than the baseline fails the comparison."""
+    results = run_benchmarks(tmp_path, "--skip-js")
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": [dict(r, wall_s=r["wall_s"] / 1000) for r in results]}))
+    proc = subprocess.run(
+        [sys.executable, str(RUNNER), "--sizes", "50", "--linkml-classes", "3", "--repeat", "1", "--skip-js",
+         "--output", str(tmp_path / "current.json"), "--baseline", str(baseline)],
+        capture_output=True, text=True,
+    )
+    assert proc.returncode == 1
+    assert "REGRESSION" in proc.stdout
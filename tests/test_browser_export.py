@@ -0,0 +1,73 @@
+"""Tests for exporting the browser's current results, run headlessly in Node."""
+
+import csv
+import io
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+TEMPLATE = ROOT / "src" / "linkml_browser" / "index.html"
+JS_BENCH = ROOT / "benchmarks" / "js_bench.mjs"
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+DATA = [
+    {"id": f"r{i}", "name": f"Item {i}" if i % 3 else f'Item, "quoted" {i}\nnext line',
+     "tags": ["a", "b"] if i % 2 else [], "score": i / 2, "hidden": "not displayed"}
+    for i in range(25)
+]
+SCHEMA = {
+    "title": "Export test",
+    "searchableFields": ["name"],
+    "facets": [],
+    "displayFields": [
+        {"field": "id", "label": "ID"},
+        {"field": "name", "label": "Name"},
+        {"field": "tags", "label": "Tags", "type": "array"},
+        {"field": "score", "label": "Score"},
+        {"field": "missing", "label": "Missing"},
+    ],
+}
+
+
+def run_exports(tmp_path, query, exports):
+    """Run a query and return its results' indices and the chunks of each export."""
+    input_path = tmp_path / "input.json"
+    input_path.write_text(json.dumps({"data": DATA, "schema": SCHEMA, "queries": [{"query": query}],
+                                      "reportOrder": True, "exports": exports}))
+    proc = subprocess.run(["node", str(JS_BENCH), str(TEMPLATE), str(input_path)],
+                          check=True, capture_output=True, text=True)
+    report = json.loads(proc.stdout)
+    return report["queries"][0]["order"], report["exports"]
+
+
+def projected(idx):
+    return {k: v for k, v in DATA[idx].items() if k in ("id", "name", "tags", "score")}
+
+
+@pytest.mark.parametrize("query", ["", "item", "nothing"])
+def test_json_and_jsonl(tmp_path, query):
+    """Test that JSON and JSON Lines hold the displayed fields of every result."""
+    order, (as_json, as_jsonl) = run_exports(tmp_path, query, [{"format": "json", "chunkSize": 4},
+                                                                {"format": "jsonl", "chunkSize": 4}])
+    expected = [projected(idx) for idx in order]
+    assert json.loads("".join(as_json)) == expected
+    assert [json.loads(line) for line in "".join(as_jsonl).splitlines()] == expected
+    assert len(as_json) == max(1, -(-len(order) // 4))
+
+
+def test_csv(tmp_path):
+    """Test that CSV quotes special characters and joins arrays with |."""
+    order, (chunks,) = run_exports(tmp_path, "", [{"format": "csv", "chunkSize": 10}])
+    rows = list(csv.reader(io.StringIO("".join(chunks), newline="")))
+    assert rows[0] == ["ID", "Name", "Tags", "Score", "Missing"]
+    assert len(chunks) == 3
+    for idx, row in zip(order, rows[1:], strict=True):
+        item = DATA[idx]
+        score = item["score"]
+        assert row == [item["id"], item["name"], "|".join(item["tags"]),
+                       str(int(score)) if score == int(score) else str(score), ""]
@@ -73,6 +73,37 @@ class TestBrowserGenerator:
         assert "title" in display_field_names
         assert "author" in display_field_names
     
+    def test_typed_schema_inference(self):
+        """Test that booleans, floats, dates and datetimes get typed facets."""
+        data = [
+            {
+                "flag": i % 2 == 0,
+                "score": i / 4,
+                "day": f"2024-03-{i % 28 + 1:02d}",
+                "seen": f"2024-03-01T{i % 24:02d}:15:00Z",
+                "code": f"2024-03-{i % 28 + 1:02d}x",
+                "mixed": True if i % 2 else 1,
+            }
+            for i in range(150)
+        ]
+        facets = {f["field"]: f["type"] for f in BrowserGenerator(data).schema["facets"]}
+        assert facets["flag"] == "boolean"
+        assert facets["score"] == "float"
+        assert facets["day"] == "date"
+        assert facets["seen"] == "datetime"
+        assert facets["code"] == "string"
+        assert facets["mixed"] == "string"
+
+    def test_integer_id_is_not_a_facet(self):
+        """Test that an all-unique integer column is treated as an ID."""
+        data = [{"id": i, "name": f"item {i}", "year": 1900 + i % 50, "score": i / 4} for i in range(500)]
+        schema = BrowserGenerator(data).schema
+        facets = {f["field"]: f["type"] for f in schema["facets"]}
+        assert "id" not in facets
+        assert facets["year"] == "integer"
+        assert facets["score"] == "float"
+        assert "id" not in schema["sortableFields"]
+    
     def test_deploy_equivalent(self, test_data, temp_output_dir):
         """Test the programmatic equivalent of linkml-browser deploy."""
         # This is the programmatic equivalent of:
@@ -342,6 +373,18 @@ classes:
         assert "Test Schema Browser" in schema_js
         assert "Element Type" in schema_js
 
+    def test_deploy_schema_references(self, minimal_schema_path, temp_output_dir):
+        """Test that indexes.js links elements to the elements they name."""
+        from linkml_browser.reader import read_js_value
+
+        elements = extract_linkml_elements(minimal_schema_path)
+        BrowserGenerator(elements, get_linkml_browser_schema()).generate(temp_output_dir, force=True)
+        references = read_js_value(temp_output_dir / "indexes.js")["references"]
+        person, named_thing, status = (references["ids"][name][0] for name in ("Person", "NamedThing", "status"))
+        assert named_thing in references["forward"][person]
+        assert status in references["forward"][person]
+        assert person in references["reverse"][named_thing]
+
     @pytest.fixture
     def temp_output_dir(self):
         """Create temporary output directory."""
@@ -0,0 +1,212 @@
+"""Tests for the desktop app's cache of projects opened from GitHub.
+
+The DatasetCache class is extracted from the template and run in Node with
+node:fs standing in for Tauri's fs API, against a local HTTP server standing
+in for raw.githubusercontent.com.
+"""
+
+import hashlib
+import json
+import shutil
+import subprocess
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+TEMPLATE = ROOT / "src" / "linkml_browser" / "index.html"
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+# Runs steps ({name, url, files, optional} opens, {touch} uses) with a clock
+# that advances one tick per step, and reports each result and the number of
+# writes each streamed file took
+HARNESS = r"""
+const fsp = require('fs/promises');
+const path = require('path');
+const [source, root, maxBytes, steps] = [process.argv[1], process.argv[2], Number(process.argv[3]), JSON.parse(process.argv[4])];
+const logger = { debug() {}, info() {}, warn() {}, error() {} };
+const writes = {};
+const fs = {
+    exists: p => fsp.access(p).then(() => true, () => false),
+    mkdir: (p, options) => fsp.mkdir(p, options),
+    readTextFile: p => fsp.readFile(p, 'utf8'),
+    writeTextFile: (p, text) => fsp.writeFile(p, text),
+    create: async p => {
+        const handle = await fsp.open(p, 'w');
+        const name = path.basename(p, '.part');
+        writes[name] = 0;
+        return { write: data => { writes[name] += 1; return handle.write(data); }, close: () => handle.close() };
+    },
+    rename: (from, to) => fsp.rename(from, to),
+    remove: (p, options) => fsp.rm(p, { recursive: !!(options && options.recursive) }),
+};
+const DatasetCache = eval(`${source}; DatasetCache`);
+let tick = 0;
+const cache = new DatasetCache({ root, fs, join: async (...parts) => path.join(...parts), fetch, maxBytes, now: () => ++tick });
+(async () => {
+    const results = [];
+    for (const step of steps) {
+        try {
+            if (step.touch) {
+                results.push({ evicted: await cache.touch(step.touch) });
+            } else {
+                results.push(await cache.open(step.name, step.url, step.files, step.optional || []));
+            }
+        } catch (error) {
+            results.push({ error: error.message });
+        }
+    }
+    console.log(JSON.stringify({ results, writes }));
+})();
+"""
+
+
+def dataset_cache_source():
+    """The dataset cache constants and class from the template."""
+    html = TEMPLATE.read_text()
+    start = html.index("        const DATASET_CACHE_BYTES")
+    end = html.index("        async function tauriDatasetCache")
+    return html[start:end]
+
+
+class StandIn:
+    """A raw file server that honours ETag and Last-Modified validators."""
+
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = stand_in.files.get(self.path)
+                if body is None:
+                    stand_in.requests.append((self.path, 404))
+                    self.send_error(404)
+                    return
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:12]
+                if self.headers.get("If-None-Match") == etag:
+                    stand_in.requests.append((self.path, 304))
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                stand_in.requests.append((self.path, 200))
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", formatdate(0, usegmt=True))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def take_requests(self):
+        requests, self.requests = sorted(self.requests), []
+        return requests
+
+
+@pytest.fixture
+def stand_in():
+    """A running stand-in server."""
+    server = StandIn()
+    yield server
+    server.server.shutdown()
+
+
+def run_cache(root, steps, max_bytes=10 ** 9):
+    """Run the cache steps in Node."""
+    result = subprocess.run(["node", "-e", HARNESS, dataset_cache_source(), str(root), str(max_bytes), json.dumps(steps)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def project(stand_in, name, files=("index.html", "data.js", "schema.js"), optional=("indexes.js",)):
+    """An open step for a project served under /name."""
+    return {"name": name, "url": f"{stand_in.url}/{name}", "files": list(files), "optional": list(optional)}
+
+
+def serve_project(stand_in, name, data=b"window.searchData = [];"):
+    """Serve the files of a project."""
+    stand_in.files.update({
+        f"/{name}/index.html": b"<html></html>",
+        f"/{name}/data.js": data,
+        f"/{name}/schema.js": b"window.searchSchema = {};",
+    })
+
+
+def test_reuses_unchanged_files(stand_in, tmp_path):
+    """Test that reopening a project downloads only the files that changed."""
+    data = b"window.searchData = [" + b",".join(b'{"id": %d}' % i for i in range(40000)) + b"];"
+    serve_project(stand_in, "p", data)
+    first = run_cache(tmp_path, [project(stand_in, "p")])
+    assert first["results"][0]["files"] == {"index.html": "downloaded", "data.js": "downloaded",
+                                            "schema.js": "downloaded"}
+    assert first["writes"]["data.js"] > 1, "data.js should be streamed in chunks"
+    assert (tmp_path / "p" / "data.js").read_bytes() == data
+    assert stand_in.take_requests() == sorted([("/p/index.html", 200), ("/p/data.js", 200), ("/p/schema.js", 200),
+                                               ("/p/indexes.js", 404)])
+
+    stand_in.files["/p/schema.js"] = b"window.searchSchema = {\"title\": \"New\"};"
+    stand_in.files["/p/indexes.js"] = b"window.searchIndexes = {};"
+    second = run_cache(tmp_path, [project(stand_in, "p")])
+    assert second["results"][0]["files"] == {"index.html": "reused", "data.js": "reused", "schema.js": "downloaded",
+                                             "indexes.js": "downloaded"}
+    assert (tmp_path / "p" / "schema.js").read_bytes() == stand_in.files["/p/schema.js"]
+    assert dict(stand_in.take_requests())["/p/data.js"] == 304
+    meta = json.loads((tmp_path / "p" / "cache.json").read_text())
+    assert meta["files"]["data.js"]["bytes"] == len(data)
+    assert meta["files"]["data.js"]["lastModified"] == formatdate(0, usegmt=True)
+
+    # A file that disappears upstream is removed when optional
+    del stand_in.files["/p/indexes.js"]
+    run_cache(tmp_path, [project(stand_in, "p")])
+    assert not (tmp_path / "p" / "indexes.js").exists()
+
+
+def test_missing_required_file_keeps_cache(stand_in, tmp_path):
+    """Test that a failed download leaves the cached files in place."""
+    serve_project(stand_in, "p")
+    run_cache(tmp_path, [project(stand_in, "p")])
+    del stand_in.files["/p/data.js"]
+    result = run_cache(tmp_path, [project(stand_in, "p")])["results"][0]
+    assert "Failed to fetch data.js (404)" in result["error"]
+    assert (tmp_path / "p" / "data.js").read_bytes() == b"window.searchData = [];"
+    assert not list((tmp_path / "p").glob("*.part"))
+
+
+def test_offline_uses_cached_files(stand_in, tmp_path):
+    """Test that an unreachable server falls back to the cached files."""
+    serve_project(stand_in, "p")
+    run_cache(tmp_path, [project(stand_in, "p")])
+    step = project(stand_in, "p")
+    stand_in.server.shutdown()
+    stand_in.server.server_close()
+    result = run_cache(tmp_path, [step])["results"][0]
+    assert set(result["files"].values()) == {"offline"}
+
+
+def test_least_recently_used_projects_are_evicted(stand_in, tmp_path):
+    """Test that projects are evicted oldest first once over the size limit."""
+    for name in "abc":
+        serve_project(stand_in, name, b"x" * 1000)
+    size = 1000 + len(b"<html></html>") + len(b"window.searchSchema = {};")
+    steps = [project(stand_in, "a"), project(stand_in, "b"), {"touch": "a"}, project(stand_in, "c")]
+    results = run_cache(tmp_path, steps, max_bytes=2 * size)["results"]
+    assert [r.get("evicted") for r in results] == [[], [], [], ["b"]]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a", "c", "index.json"]
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert sorted(index["datasets"]) == ["a", "c"]
+    assert index["datasets"]["c"]["bytes"] == size
+
+    # The project being opened is kept even when it alone exceeds the limit
+    assert run_cache(tmp_path, [project(stand_in, "b")], max_bytes=10)["results"][0]["evicted"] == ["a", "c"]
+    assert (tmp_path / "b" / "data.js").exists()
@@ -0,0 +1,197 @@
+"""Tests for batch gallery builds."""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from linkml_browser import gallery
+from linkml_browser.core import TEMPLATE_PATH
+from linkml_browser.gallery import (
+    STATE_FILE,
+    build_all,
+    filter_records,
+    load_manifest,
+    split_template,
+)
+from linkml_browser.main import app
+from linkml_browser.reader import load_records
+
+LINKML_SCHEMA = """\
+id: https://example.org/books
+name: books
+prefixes:
+  linkml: https://w3id.org/linkml/
+imports:
+  - linkml:types
+default_range: string
+classes:
+  Book:
+    attributes:
+      title:
+        required: true
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A manifest of three galleries with their inputs."""
+    shutil.copy(Path(__file__).parent / "test_data.json", tmp_path / "books.json")
+    records = [{"id": f"g{i}", "status": "COMPLETE" if i % 2 else "DRAFT", "taxon_id": f"T{i % 3}"} for i in range(30)]
+    (tmp_path / "genes.js").write_text(f"window.searchData = {json.dumps(records)};\n")
+    (tmp_path / "books.yaml").write_text(LINKML_SCHEMA)
+    manifest = {
+        "output": "site",
+        "galleries": {
+            "books": {"data": "books.json", "title": "Books"},
+            "genes": {"data": "genes.js", "filter": {"status_allow": ["complete"], "max_records": 6, "balance_by": "taxon_id"}},
+            "model": {"linkml_schemas": ["books.yaml"]},
+        },
+    }
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    return tmp_path
+
+
+def statuses(results):
+    return {result["name"]: result["status"] for result in results}
+
+
+class TestTemplateAssets:
+    """Test splitting the template into shared assets."""
+
+    def test_split_template(self):
+        """Test that the page links the assets in place of the inline blocks."""
+        html = TEMPLATE_PATH.read_text()
+        page, css, js = split_template(html)
+        assert page.count("<style>") == 0
+        assert '<link rel="stylesheet" href="__ASSET_CSS__">' in page
+        assert '<script src="__ASSET_JS__"></script>' in page
+        assert "class OptimizedFacetedSearch" in js and "class OptimizedFacetedSearch" not in page
+        assert page.index('<script src="indexes.js">') < page.index("__ASSET_JS__")
+        assert len(page) < len(html) // 10
+        assert f"<style>{css}</style>" in html and f"<script>{js}</script>" in html
+
+
+class TestFilterRecords:
+    """Test gallery record selection."""
+
+    RECORDS = [{"id": str(i), "status": "draft" if i < 8 else "COMPLETE", "taxon_id": "A" if i < 9 else "B"} for i in range(12)]
+
+    def test_allow_lists(self):
+        """Test status (case-insensitive) and taxon filters."""
+        kept = filter_records(self.RECORDS, status_allow=["complete"], taxon_allow=["B"])
+        assert [r["id"] for r in kept] == ["9", "10", "11"]
+
+    def test_balance(self):
+        """Test that max_records is shared between the balance_by groups."""
+        kept = filter_records(self.RECORDS, balance_by="taxon_id", max_records=4)
+        assert [r["taxon_id"] for r in kept] == ["A", "A", "B", "B"]
+
+
+class TestBuildAll:
+    """Test manifest builds."""
+
+    def test_builds_galleries(self, project):
+        """Test the outputs of a first build."""
+        manifest = load_manifest(project / "manifest.json")
+        results = build_all(manifest, workers=1)
+
+        assert statuses(results) == {"books": "built", "genes": "built", "model": "built"}
+        site = project / "site"
+        assets = sorted(p.name for p in (site / "assets").iterdir())
+        assert len(assets) == 2
+        for name in ("books", "genes", "model"):
+            page = (site / name / "index.html").read_text()
+            for asset in assets:
+                assert f'"../assets/{asset}"' in page
+            assert (site / name / "data.js").exists()
+        genes = load_records(site / "genes" / "data.js")
+        assert len(genes) == 6 and all(r["status"] == "COMPLETE" for r in genes)
+        assert "Books" in (site / "books" / "schema.js").read_text()
+        assert json.loads((site / STATE_FILE).read_text()).keys() == {"books", "genes", "model"}
+
+    def test_skips_unchanged(self, project):
+        """Test that only galleries with changed inputs are rebuilt."""
+        manifest = load_manifest(project / "manifest.json")
+        build_all(manifest, workers=1)
+        assert set(statuses(build_all(manifest, workers=1)).values()) == {"unchanged"}
+
+        (project / "genes.js").write_text('window.searchData = [{"id": "x", "status": "complete"}];\n')
+        assert statuses(build_all(manifest, workers=1)) == {"books": "unchanged", "genes": "built", "model": "unchanged"}
+        assert statuses(build_all(manifest, workers=1, force=True, only=["books"])) == {"books": "built"}
+
+    def test_parallel_build(self, project):
+        """Test that a pooled build writes the same galleries."""
+        manifest = load_manifest(project / "manifest.json")
+        results = build_all(manifest, workers=2)
+        assert statuses(results) == {"books": "built", "genes": "built", "model": "built"}
+        assert len(load_records(project / "site" / "books" / "data.js")) == 50
+
+    def test_failure_is_isolated(self, project):
+        """Test that a failing gallery is reported without stopping the others."""
+        manifest = load_manifest(project / "manifest.json")
+        manifest["galleries"]["genes"]["schema"] = str(project / "missing.json")
+        results = build_all(manifest, workers=1)
+        assert statuses(results) == {"books": "built", "genes": "failed", "model": "built"}
+        assert "missing.json" in results[1]["error"]
+        assert "genes" not in json.loads((project / "site" / STATE_FILE).read_text())
+
+    def test_browser_directory_data(self, project):
+        """Test that a deployed browser directory can be a gallery's data."""
+        build_all(load_manifest(project / "manifest.json"), workers=1, only=["genes"])
+        shutil.copytree(project / "site" / "genes", project / "deployed")
+        (project / "mirror.json").write_text(json.dumps({"output": "mirror", "galleries": {"genes": {"data": "deployed"}}}))
+        manifest = load_manifest(project / "mirror.json")
+        assert statuses(build_all(manifest, workers=1)) == {"genes": "built"}
+        assert load_records(project / "mirror" / "genes" / "data.js") == load_records(project / "deployed")
+        assert statuses(build_all(manifest, workers=1)) == {"genes": "unchanged"}
+
+        (project / "deployed" / "data.js").write_text('window.searchData = [{"id": "x"}, {"id": "y"}];\n')
+        assert statuses(build_all(manifest, workers=1)) == {"genes": "built"}
+
+    def test_fingerprint_failure_is_isolated(self, project, monkeypatch):
+        """Test that a gallery whose inputs cannot be fingerprinted fails alone."""
+        fingerprint = gallery.gallery_fingerprint
+
+        def failing(entry, index_html):
+            if entry.get("data", "").endswith("genes.js"):
+                raise OSError("unreadable")
+            return fingerprint(entry, index_html)
+
+        monkeypatch.setattr(gallery, "gallery_fingerprint", failing)
+        results = build_all(load_manifest(project / "manifest.json"), workers=1)
+        assert statuses(results) == {"books": "built", "genes": "failed", "model": "built"}
+        assert results[1]["error"] == "unreadable"
+
+    def test_manifest_needs_input(self, tmp_path):
+        """Test that entries without data or LinkML schemas are rejected."""
+        (tmp_path / "manifest.json").write_text(json.dumps({"galleries": {"empty": {"title": "Empty"}}}))
+        with pytest.raises(ValueError, match="needs 'data'"):
+            load_manifest(tmp_path / "manifest.json")
+
+    def test_manifest_entry_must_be_mapping(self, tmp_path):
+        """Test that an empty or scalar entry is rejected with its position."""
+        (tmp_path / "manifest.yaml").write_text("galleries:\n  books:\n    data: books.json\n  stray:\n")
+        with pytest.raises(ValueError, match=r"'stray' \(entry 2 in .*manifest.yaml\) must be a mapping"):
+            load_manifest(tmp_path / "manifest.yaml")
+        (tmp_path / "manifest.yaml").write_text("galleries:\n  -\n")
+        with pytest.raises(ValueError, match="must map gallery names"):
+            load_manifest(tmp_path / "manifest.yaml")
+
+
+def test_build_all_command(project):
+    """Test the build-all command with a YAML manifest."""
+    (project / "manifest.yaml").write_text("output: site\ngalleries:\n  books:\n    data: books.json\n")
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["build-all", str(project / "manifest.yaml")])
+    assert result.exit_code == 0, result.output
+    assert "Built books (50 items" in result.output
+
+    result = runner.invoke(app, ["build-all", str(project / "manifest.yaml")])
+    assert "Unchanged books" in result.output
+
+    result = runner.invoke(app, ["build-all", str(project / "manifest.yaml"), "--only", "nope"])
+    assert result.exit_code == 1
@@ -0,0 +1,84 @@
+"""Tests for the memory-mapped index format."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from linkml_browser.core import BrowserGenerator, load_json_data
+from linkml_browser.index_format import MappedIndex, open_index, write_index
+from linkml_browser.query import DatasetIndex
+
+
+@pytest.fixture
+def test_data():
+    """Load test data fixture."""
+    return load_json_data(Path(__file__).parent / "test_data.json")
+
+
+@pytest.fixture
+def schema(test_data):
+    """Infer a schema for the test data."""
+    return BrowserGenerator(test_data).schema
+
+
+@pytest.fixture
+def mapped(test_data, schema, tmp_path):
+    """Write and open an index file."""
+    path = tmp_path / "index.lbi"
+    write_index(path, test_data, schema)
+    return open_index(path)
+
+
+class TestMappedIndex:
+    """Test that the mapped index answers queries like the in-memory one."""
+
+    QUERIES = [
+        ("", {}),
+        ("gats", {}),
+        ("novel", {}),
+        ("the great", {}),
+        ("", {"genre": ["Fiction", "Classic"]}),
+        ("", {"language": ["English", "Russian"]}),
+        ("novel", {"publication_year": {"min": 1800, "max": 1900}}),
+        ("zzzz", {}),
+    ]
+
+    def test_records_round_trip(self, mapped, test_data):
+        """Test that records decode back to the original objects."""
+        assert len(mapped) == len(test_data)
+        assert mapped.get_record(0) == test_data[0]
+        assert mapped.get_record(len(test_data) - 1) == test_data[-1]
+
+    @pytest.mark.parametrize("query,filters", QUERIES)
+    def test_matches_in_memory_index(self, mapped, test_data, schema, query, filters):
+        """Test search results and facet counts against DatasetIndex."""
+        expected_index = DatasetIndex(test_data, schema)
+        expected = expected_index.search(query, filters)
+        assert mapped.search(query, filters) == expected
+        assert mapped.facet_counts(expected) == expected_index.facet_counts(expected)
+
+    def test_zero_copy_views(self, mapped):
+        """Test that sections are NumPy views over the mapping rather than copies."""
+        postings = mapped.section("tokens.postings")
+        assert isinstance(postings, np.ndarray)
+        assert postings.dtype == np.dtype("<u4")
+        assert not postings.flags.owndata
+        assert not postings.flags.writeable
+
+    def test_facet_ranges(self, mapped, test_data, schema):
+        """Test integer facet ranges."""
+        assert mapped.facet_ranges() == DatasetIndex(test_data, schema).facet_ranges()
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that non-index files are rejected."""
+        path = tmp_path / "bogus.lbi"
+        path.write_bytes(b"not an index file at all")
+        with pytest.raises(ValueError):
+            MappedIndex(path)
+
+    def test_generate_binary_index(self, test_data, tmp_path):
+        """Test that the generator writes index.lbi on request."""
+        output_dir = tmp_path / "browser"
+        BrowserGenerator(test_data).generate(output_dir, binary_index=True)
+        assert len(open_index(output_dir / "index.lbi")) == len(test_data)
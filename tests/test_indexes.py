@@ -0,0 +1,480 @@
+"""Tests for the precomputed browser indexes."""
+
+import json
+import math
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from linkml_browser.core import BrowserGenerator, load_json_data
+from linkml_browser.indexes import (
+    build_indexes,
+    decode_array,
+    encode_array,
+    hierarchy_closure,
+    histogram,
+    prefix_completions,
+    reference_graph,
+    sort_permutation,
+    typed_column,
+)
+from linkml_browser.query import DatasetIndex
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def test_data():
+    """Load test data fixture."""
+    return load_json_data(Path(__file__).parent / "test_data.json")
+
+
+class TestSortPermutation:
+    """Test sort orders."""
+
+    def test_mixed_values(self):
+        """Test numbers before strings, case-insensitive strings, missing last."""
+        data = [
+            {"v": "banana"}, {"v": None}, {"v": 10}, {"v": "Apple"},
+            {"v": 2.5}, {}, {"v": ["cherry", "a"]}, {"v": ""}, {"v": "apple"},
+        ]
+        result = sort_permutation(data, "v")
+        assert result["order"] == [4, 2, 3, 8, 0, 6, 1, 5, 7]
+        assert result["present"] == 6
+
+    def test_build_indexes_uses_sortable_fields(self, test_data):
+        """Test that only declared fields get sort orders."""
+        indexes = build_indexes(test_data, {"sortableFields": ["publication_year"]})
+        assert indexes["count"] == len(test_data)
+        assert list(indexes["sort"]) == ["publication_year"]
+        years = [test_data[i]["publication_year"] for i in indexes["sort"]["publication_year"]["order"]]
+        assert years == sorted(years)
+
+    def test_inferred_sortable_fields(self, test_data):
+        """Test that numeric facets and a title field are sortable by default."""
+        schema = BrowserGenerator(test_data).schema
+        assert schema["sortableFields"][0] == "title"
+        assert set(schema["sortableFields"]) == {"title", "publication_year", "pages", "rating"}
+
+    def test_generate_writes_indexes_js(self, test_data, tmp_path):
+        """Test that deploy output includes indexes.js."""
+        output_dir = tmp_path / "browser"
+        BrowserGenerator(test_data).generate(output_dir)
+        text = (output_dir / "indexes.js").read_text()
+        assert text.startswith("window.searchIndexes = ")
+        indexes = json.loads(text[len("window.searchIndexes = "):].rstrip().rstrip(";"))
+        assert set(indexes["sort"]) == {"title", "publication_year", "pages", "rating"}
+        assert set(indexes["histogram"]) == {"publication_year", "pages", "rating"}
+
+
+class TestHistogram:
+    """Test numeric facet bins."""
+
+    def test_unit_bins_for_small_integer_spans(self):
+        """Test one bin per value when an integer facet spans few values."""
+        data = [{"n": 3}, {"n": 5}, {}, {"n": "4 stars"}, {"n": 5}, {"n": None}]
+        result = histogram(data, {"field": "n", "type": "integer"})
+        assert result["codes"] == [0, 2, -1, 1, 2, -1]
+        assert result["prefix"] == [0, 1, 2, 4]
+        assert result["edges"] == [3, 4, 5, 6]
+        assert result["low"] == result["high"] == [3, 4, 5]
+
+    def test_equal_width_float_bins(self):
+        """Test that float bins cover the range and record their bounds."""
+        data = [{"x": x / 10} for x in range(101)]
+        result = histogram(data, {"field": "x", "type": "float", "bins": 4})
+        assert result["prefix"] == [0, 25, 50, 75, 101]
+        assert result["edges"] == [0.0, 2.5, 5.0, 7.5, 10.0]
+        assert result["codes"][-1] == 3
+        assert result["low"][1] == 2.5 and result["high"][1] == 4.9
+
+    def test_no_values(self):
+        """Test that a facet without numbers has no histogram."""
+        assert histogram([{"x": "a"}, {}], {"field": "x", "type": "float"}) is None
+
+    def test_inferred_float_facet(self, test_data):
+        """Test that fractional numbers are inferred as float facets."""
+        facets = {f["field"]: f["type"] for f in BrowserGenerator(test_data).schema["facets"]}
+        assert facets["rating"] == "float"
+        assert facets["pages"] == "integer"
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("precomputed", [True, False])
+def test_browser_range_filters_match_query_engine(test_data, tmp_path, precomputed):
+    """Test binned range filtering against the server-side query engine."""
+    schema = BrowserGenerator(test_data).schema
+    indexes = build_indexes(test_data, schema)
+    filters = [
+        {"rating": {"min": 4.0, "max": 4.3}},
+        {"rating": {"min": 4.2, "max": 4.2}},
+        {"pages": {"min": 200, "max": 400}},
+        {"publication_year": {"min": 1800, "max": 1900}, "rating": {"min": 3.9, "max": 5}},
+        {"publication_year": {"min": 1850, "max": 1850}},
+        {"pages": {"min": 5000, "max": 6000}},
+    ]
+    report = _run_browser(tmp_path, {
+        "data": test_data,
+        "schema": schema,
+        "indexes": indexes if precomputed else None,
+        "queries": [{"query": "", "filters": f} for f in filters],
+        "reportOrder": True,
+    })
+    engine = DatasetIndex(test_data, schema)
+    for selected, result in zip(filters, report["queries"]):
+        assert result["order"] == engine.search("", selected)
+
+
+TYPED = [
+    {
+        "name": f"r{i}",
+        "flag": [True, False, None][i % 3],
+        "day": f"2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        "seen": f"2023-06-01T{i % 24:02d}:{i % 60:02d}:00Z",
+        "score": round(i * 0.37, 2),
+    }
+    for i in range(240)
+]
+
+
+class TestTypedColumns:
+    """Test typed-array columns."""
+
+    @pytest.mark.parametrize("dtype,values", [
+        ("int8", [-128, 0, 127]),
+        ("int16", [-300, 300]),
+        ("int32", [-(2 ** 31), 2 ** 31 - 1]),
+        ("uint8", [0, 1, 255]),
+        ("float64", [0.1, -2.5e300]),
+    ])
+    def test_round_trip(self, dtype, values):
+        """Test base64 little-endian encoding."""
+        assert decode_array(encode_array(values, dtype)) == values
+
+    def test_columns(self):
+        """Test column types and missing-value markers."""
+        data = [{"d": "1970-01-03", "b": True, "x": 2.5}, {"b": False}, {"d": None, "b": "yes", "x": "n/a"}]
+        assert typed_column(data, {"field": "d", "type": "date"}) == encode_array([2, -(2 ** 31), -(2 ** 31)], "int32")
+        assert decode_array(typed_column(data, {"field": "b", "type": "boolean"})) == [1, 0, 255]
+        floats = decode_array(typed_column(data, {"field": "x", "type": "float"}))
+        assert floats[0] == 2.5 and math.isnan(floats[1]) and math.isnan(floats[2])
+        assert typed_column(data, {"field": "b", "type": "string"}) is None
+
+    def test_build_indexes_encodes_columns_and_codes(self):
+        """Test that typed facets ship columns and compact bin codes."""
+        schema = BrowserGenerator(TYPED).schema
+        indexes = build_indexes(TYPED, schema)
+        assert {field: column["dtype"] for field, column in indexes["columns"].items()} == {
+            "flag": "uint8", "day": "int32", "seen": "float64", "score": "float64",
+        }
+        codes = indexes["histogram"]["day"]["codes"]
+        assert codes["dtype"] == "int8"
+        assert decode_array(codes) == histogram(TYPED, {"field": "day", "type": "date"})["codes"]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("precomputed", [True, False])
+def test_browser_typed_facets(tmp_path, precomputed):
+    """Test date, datetime and boolean filtering and date sorting in the browser."""
+    schema = BrowserGenerator(TYPED).schema
+    queries = [
+        {"query": "", "filters": {"day": {"min": 19400, "max": 19500}}},
+        {"query": "", "filters": {"seen": {"min": 1685581200000, "max": 1685620800000}}},
+        {"query": "", "filters": {"flag": ["true"]}},
+        {"query": "day:>=2023-06-15", "filters": {}},
+        {"query": "day:2023-02-01..2023-03-31 seen:<2023-06-01T12:00", "filters": {}},
+        {"query": "", "filters": {}, "sort": {"field": "day", "direction": "asc"}},
+    ]
+    report = _run_browser(tmp_path, {
+        "data": TYPED,
+        "schema": schema,
+        "indexes": build_indexes(TYPED, schema) if precomputed else None,
+        "queries": queries,
+        "reportOrder": True,
+    })
+    engine = DatasetIndex(TYPED, schema)
+    results = [result["order"] for result in report["queries"]]
+    assert results[0] == engine.search("", queries[0]["filters"])
+    assert results[1] == engine.search("", queries[1]["filters"])
+    assert results[2] == [i for i, item in enumerate(TYPED) if item["flag"] is True]
+    assert results[3] == [i for i, item in enumerate(TYPED) if item["day"] >= "2023-06-15"]
+    assert results[4] == [i for i, item in enumerate(TYPED)
+                          if "2023-02-01" <= item["day"] <= "2023-03-31" and item["seen"] < "2023-06-01T12:00"]
+    assert results[5] == sort_permutation(TYPED, "day")["order"]
+
+
+HIERARCHY = [
+    {"name": "thing"},
+    {"name": "animal", "is_a": "thing"},
+    {"name": "dog", "is_a": "animal"},
+    {"name": "pet", "is_a": "thing"},
+    {"name": "puppy", "is_a": ["dog", "pet"]},
+    {"name": "loop_a", "is_a": "loop_b"},
+    {"name": "loop_b", "is_a": "loop_a"},
+    {"is_a": "dog"},
+]
+HIERARCHY_FACET = {"field": "is_a", "label": "Parent", "type": "hierarchy", "idField": "name"}
+
+
+def _ancestor_ids(closure):
+    return [sorted(closure["nodes"][n] for n in ancestors) for ancestors in closure["ancestors"]]
+
+
+class TestHierarchyClosure:
+    """Test ancestor closures for hierarchy facets."""
+
+    def test_ancestors(self):
+        """Test multiple parents, cycles and records without an id."""
+        closure = hierarchy_closure(HIERARCHY, HIERARCHY_FACET)
+        assert _ancestor_ids(closure) == [
+            ["thing"],
+            ["animal", "thing"],
+            ["animal", "dog", "thing"],
+            ["pet", "thing"],
+            ["animal", "dog", "pet", "puppy", "thing"],
+            ["loop_a", "loop_b"],
+            ["loop_a", "loop_b"],
+            ["animal", "dog", "thing"],
+        ]
+        parents = {closure["nodes"][i]: sorted(closure["nodes"][p] for p in ps)
+                   for i, ps in enumerate(closure["parents"])}
+        assert parents["puppy"] == ["dog", "pet"]
+        assert parents["thing"] == []
+
+    def test_unknown_parents_are_nodes(self):
+        """Test that parents missing from the data still appear as nodes."""
+        closure = hierarchy_closure([{"id": "x", "p": "external"}], {"field": "p", "type": "hierarchy"})
+        assert _ancestor_ids(closure) == [["external", "x"]]
+
+    def test_build_indexes_includes_hierarchy_facets(self):
+        """Test that only hierarchy facets get closures."""
+        schema = {"facets": [HIERARCHY_FACET, {"field": "name", "type": "string"}]}
+        assert list(build_indexes(HIERARCHY, schema)["hierarchy"]) == ["is_a"]
+
+
+REFERENCES = {"idField": "name", "fields": ["is_a", "slots", "range"]}
+SCHEMA_ELEMENTS = [
+    {"name": "Thing", "type": "class_definition", "slots": ["id", "name"]},
+    {"name": "Person", "type": "class_definition", "is_a": "Thing", "slots": ["id", "name", "status"]},
+    {"name": "id", "type": "slot_definition", "range": "string"},
+    {"name": "name", "type": "slot_definition", "range": "string"},
+    {"name": "status", "type": "slot_definition", "range": "StatusEnum"},
+    {"name": "StatusEnum", "type": "enum_definition", "slots": ["status"]},
+    {"name": "Self", "type": "class_definition", "is_a": "Self"},
+]
+
+
+class TestReferenceGraph:
+    """Test links between records."""
+
+    def test_forward_and_reverse(self):
+        """Test that named records are resolved both ways, skipping unknown names and self-links."""
+        graph = reference_graph(SCHEMA_ELEMENTS, REFERENCES)
+        assert graph["ids"]["Person"] == [1]
+        assert graph["forward"] == [[2, 3], [0, 2, 3, 4], [], [], [5], [4], []]
+        assert graph["reverse"] == [[1], [], [0, 1], [0, 1], [1, 5], [4], []]
+
+    def test_duplicate_ids(self):
+        """Test that a name shared by several records links to all of them."""
+        data = [{"id": 1}, {"id": "1"}, {"id": "x", "ref": [1]}]
+        graph = reference_graph(data, {"fields": ["ref"]})
+        assert graph["forward"][2] == [0, 1]
+
+    def test_only_with_schema_setting(self):
+        """Test that indexes include references only when the schema asks for them."""
+        assert "references" not in build_indexes(SCHEMA_ELEMENTS, {})
+        assert build_indexes(SCHEMA_ELEMENTS, {"references": REFERENCES})["references"]["forward"][1] == [0, 2, 3, 4]
+
+
+def _run_browser(tmp_path, payload):
+    input_path = tmp_path / "input.json"
+    input_path.write_text(json.dumps(payload))
+    proc = subprocess.run(
+        ["node", str(ROOT / "benchmarks" / "js_bench.mjs"), str(ROOT / "src" / "linkml_browser" / "index.html"),
+         str(input_path)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(proc.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("precomputed", [True, False])
+def test_browser_hierarchy_filter_selects_subtree(tmp_path, precomputed):
+    """Test that selecting a node matches it and all its descendants."""
+    schema = {"title": "T", "searchableFields": ["name"], "facets": [HIERARCHY_FACET], "displayFields": []}
+    closure = hierarchy_closure(HIERARCHY, HIERARCHY_FACET)
+    expected = {node: sum(node in ids for ids in _ancestor_ids(closure)) for node in closure["nodes"]}
+    queries = [{"query": "", "filters": {"is_a": [node]}} for node in expected]
+    queries.append({"query": "is_a:animal", "filters": {}})
+    report = _run_browser(tmp_path, {
+        "data": HIERARCHY,
+        "schema": schema,
+        "indexes": build_indexes(HIERARCHY, schema) if precomputed else None,
+        "queries": queries,
+        "reportOrder": True,
+    })
+    results = report["queries"]
+    assert {q["filters"]["is_a"][0]: r["results"] for q, r in zip(queries[:-1], results)} == expected
+    assert results[queries.index({"query": "", "filters": {"is_a": ["dog"]}})]["order"] == [2, 4, 7]
+    assert results[-1]["results"] == expected["animal"]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("precomputed", [True, False])
+def test_browser_sort_matches_generator(test_data, tmp_path, precomputed):
+    """Test that the browser orders results like the generated permutations."""
+    schema = BrowserGenerator(test_data).schema
+    indexes = build_indexes(test_data, schema)
+    queries = [
+        {"query": query, "sort": {"field": field, "direction": direction}}
+        for query in ["", "the", "war"]
+        for field in schema["sortableFields"]
+        for direction in ["asc", "desc"]
+    ]
+    report = _run_browser(tmp_path, {
+        "data": test_data,
+        "schema": schema,
+        "indexes": indexes if precomputed else None,
+        "queries": queries,
+        "reportOrder": True,
+    })
+    for query, result in zip(queries, report["queries"]):
+        sort = indexes["sort"][query["sort"]["field"]]
+        order, present = sort["order"], sort["present"]
+        if query["sort"]["direction"] == "desc":
+            order = order[:present][::-1] + order[present:]
+        matching = set(result["order"])
+        assert result["order"] == [idx for idx in order if idx in matching]
+
+
+class TestPrefixCompletions:
+    """Test the precomputed search-box suggestions."""
+
+    def test_ranked_by_document_frequency(self):
+        """Test that completions are the most frequent tokens, ties alphabetical."""
+        data = [{"t": "gamma gamma beta"}, {"t": "Gamma gale"}, {"t": "gale gate"}, {"t": "game"}]
+        table = prefix_completions(data, ["t"], max_prefix=2, top_k=3)
+        assert table["maxPrefix"] == 2 and table["topK"] == 3
+        assert table["prefixes"]["ga"] == ["gale", 2, "gamma", 2, "game", 1]
+        assert table["prefixes"]["b"] == ["beta", 1]
+        assert "gam" not in table["prefixes"]
+
+    def test_build_indexes_uses_searchable_fields(self, test_data):
+        """Test that only searchable fields contribute tokens."""
+        indexes = build_indexes(test_data, {"searchableFields": ["title"]})
+        tokens = set(indexes["completions"]["prefixes"]["g"][::2])
+        assert "gatsby" in tokens and "fiction" not in tokens
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_browser_completions_match_generator(test_data, tmp_path):
+    """Test that browser-computed suggestions agree with the shipped table."""
+    schema = BrowserGenerator(test_data).schema
+    table = prefix_completions(test_data, schema["searchableFields"], max_prefix=4)
+    prefixes = sorted({prefix for prefix in table["prefixes"]})
+    payload = {"data": test_data, "schema": schema, "queries": [], "completions": prefixes + ["zzz"]}
+    computed = _run_browser(tmp_path, payload)["completions"]
+    payload["indexes"] = build_indexes(test_data, schema)
+    shipped = _run_browser(tmp_path, payload)["completions"]
+    for prefix in prefixes:
+        expected = [list(pair) for pair in zip(table["prefixes"][prefix][::2], table["prefixes"][prefix][1::2])]
+        assert computed[prefix] == expected
+        assert shipped[prefix] == expected
+    assert computed["zzz"] == shipped["zzz"] == []
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_browser_facet_value_search(tmp_path):
+    """Test that facet value filters return matching values with current counts."""
+    data = [{"name": f"n{i}", "kind": "even" if i % 2 == 0 else "odd",
+             "xrefs": [f"GO:{i:04d}", f"UBERON:{i % 7:04d}", "Shared:Term"]} for i in range(200)]
+    schema = {
+        "title": "T",
+        "searchableFields": ["name", "kind"],
+        "facets": [{"field": "xrefs", "label": "Xrefs", "type": "array"}],
+        "displayFields": [],
+    }
+    texts = ["go:00", "u", "uberon:0003", "term", "sh", "nothing here", "G"]
+    report = _run_browser(tmp_path, {
+        "data": data,
+        "schema": schema,
+        "queries": [{"query": "even", "filters": {}}],
+        "facetSearches": [{"field": "xrefs", "text": text} for text in texts],
+    })
+    for text, buckets in zip(texts, report["facetSearches"]):
+        needle = text.lower()
+        counts: dict = {}
+        for item in data:
+            if item["kind"] != "even":
+                continue
+            for xref in item["xrefs"]:
+                key = xref.lower()
+                if (needle in key) if len(needle) >= 3 else key.startswith(needle):
+                    counts[xref] = counts.get(xref, 0) + 1
+        assert sorted(map(tuple, buckets)) == sorted(counts.items()), text
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_browser_top_facet_counts(tmp_path):
+    """Test that top-value counting finds the most frequent values with exact counts."""
+    data = [{"name": f"n{i} {'even' if i % 2 == 0 else 'odd'}",
+             "tags": [f"t{j}" for j in range(1, 60) if i % j == 0]} for i in range(1, 400)]
+    facet = {"field": "tags", "label": "Tags", "type": "array", "sortBy": "count", "counting": "top"}
+    schema = {"title": "T", "searchableFields": ["name"], "facets": [facet], "displayFields": []}
+    queries = [
+        {"query": "", "filters": {}},
+        {"query": "even", "filters": {}},
+        {"query": "n3", "filters": {}},
+        {"query": "odd", "filters": {"tags": ["t59"]}},
+    ]
+    report = _run_browser(tmp_path, {"data": data, "schema": schema, "queries": queries, "reportFacets": True})
+    for query, result in zip(queries, report["queries"]):
+        matching = [item for item in data
+                    if all(any(word in token for token in item["name"].split()) for word in query["query"].split())
+                    and all(tag in item["tags"] for tag in query["filters"].get("tags", []))]
+        exact: dict = {}
+        for item in matching:
+            for tag in item["tags"]:
+                exact[tag] = exact.get(tag, 0) + 1
+        counts = dict(result["facets"]["tags"])
+        assert all(exact[tag] == count for tag, count in counts.items())
+        top = sorted(exact.values(), reverse=True)[:10]
+        assert sorted(counts.values(), reverse=True)[:10] == top
+        for tag in query["filters"].get("tags", []):
+            assert counts[tag] == exact[tag]
+    assert "tags" in report["queries"][0]["partialFacets"]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("precomputed", [True, False])
+def test_browser_follows_references(tmp_path, precomputed):
+    """Test that reference links render and narrow the results by lookup."""
+    schema = {"title": "T", "searchableFields": ["name"], "facets": [{"field": "type", "type": "string"}],
+              "displayFields": [{"field": "name", "label": "Name", "type": "string"},
+                                {"field": "is_a", "label": "Parent", "type": "string"},
+                                {"field": "slots", "label": "Slots", "type": "array"},
+                                {"field": "range", "label": "Range", "type": "string"}],
+              "references": REFERENCES}
+    queries = [
+        {"query": ""},
+        {"reference": {"reference": "StatusEnum"}},
+        {"reference": {"referencesFrom": "1"}},
+        {"reference": {"referencedBy": "4"}},
+        {"query": "person", "reference": {"referencedBy": "4"}},
+    ]
+    report = _run_browser(tmp_path, {
+        "data": SCHEMA_ELEMENTS,
+        "schema": schema,
+        "indexes": build_indexes(SCHEMA_ELEMENTS, schema) if precomputed else None,
+        "queries": queries,
+        "reportOrder": True,
+        "reportHtml": True,
+    })
+    results = report["queries"]
+    assert [r["order"] for r in results[1:]] == [[5], [0, 2, 3, 4], [1, 5], [1]]
+    html = results[0]["html"]
+    assert 'data-reference="Thing"' in html and 'data-reference="StatusEnum"' in html
+    assert 'data-reference="string"' not in html
+    assert 'data-referenced-by="0">Referenced by 1<' in html
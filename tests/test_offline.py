@@ -0,0 +1,177 @@
+"""Tests for the offline service worker."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from linkml_browser.core import BrowserGenerator, load_json_data
+from linkml_browser.gallery import build_all, load_manifest
+from linkml_browser.main import app
+from linkml_browser.offline import (
+    SERVICE_WORKER_TEMPLATE,
+    add_offline_meta,
+    file_revision,
+    local_assets,
+)
+
+# Runs sw.js against an in-memory Cache Storage: installs the worker with the
+# cache left by a previous one, activates it, then fetches each URL
+SW_HARNESS = r"""
+const fs = require('fs');
+const vm = require('vm');
+const [script, previous, urls] = [fs.readFileSync(process.argv[1], 'utf8'), JSON.parse(process.argv[2]), JSON.parse(process.argv[3])];
+const store = new Map(previous.map(key => [key, 'cached ' + key]));
+const fetched = [];
+const listeners = {};
+const cache = {
+    match: async key => store.has(key) ? store.get(key) : undefined,
+    put: async (key, response) => { store.set(key, response.body); },
+    keys: async () => [...store.keys()].map(url => ({ url })),
+    delete: async request => store.delete(request.url),
+};
+const self = {
+    location: 'https://example.org/gallery/sw.js',
+    registration: { scope: 'https://example.org/gallery/' },
+    addEventListener: (type, listener) => { listeners[type] = listener; },
+    skipWaiting: async () => {},
+    clients: { claim: async () => {} },
+};
+const context = {
+    self, URL, Map, Set, Promise, Error,
+    caches: { open: async () => cache },
+    fetch: async url => { fetched.push(String(url)); return { ok: true, body: 'network ' + url }; },
+};
+vm.runInNewContext(script, context);
+async function dispatch(type, event) {
+    let done = Promise.resolve();
+    listeners[type]({ ...event, waitUntil: p => { done = p; }, respondWith: p => { done = p; } });
+    return done;
+}
+(async () => {
+    await dispatch('install', {});
+    await dispatch('activate', {});
+    const installFetches = fetched.splice(0);
+    const responses = [];
+    for (const url of urls) {
+        const request = { url, method: 'GET', mode: url.endsWith('/') ? 'navigate' : 'no-cors' };
+        responses.push(await dispatch('fetch', { request }) || null);
+    }
+    console.log(JSON.stringify({ installFetches, fetched, responses, keys: [...store.keys()].sort() }));
+})();
+"""
+
+
+@pytest.fixture
+def test_data():
+    """Load test data fixture."""
+    return load_json_data(Path(__file__).parent / "test_data.json")
+
+
+def manifest_of(output_dir):
+    """Read the precache manifest back from sw.js."""
+    text = (output_dir / "sw.js").read_text()
+    return json.loads(text.split("const PRECACHE_MANIFEST = ", 1)[1].split(";\n", 1)[0])
+
+
+class TestWriteServiceWorker:
+    """Test generating offline browsers."""
+
+    def test_precache_manifest(self, test_data, tmp_path):
+        """Test that every browser file is precached under its content hash."""
+        out = tmp_path / "browser"
+        BrowserGenerator(test_data).generate(out, offline=True)
+        manifest = manifest_of(out)
+        assert [entry["url"] for entry in manifest] == ["index.html", "data.js", "schema.js", "indexes.js"]
+        for entry in manifest:
+            assert entry["revision"] == file_revision(out / entry["url"])
+
+    def test_page_meta(self, test_data, tmp_path):
+        """Test that the page names the worker and a revision of the data and schema."""
+        out = tmp_path / "browser"
+        generator = BrowserGenerator(test_data)
+        generator.generate(out, offline=True)
+        page = (out / "index.html").read_text()
+        assert '<meta name="linkml-browser-service-worker" content="sw.js">' in page
+        revision = page.split('name="linkml-browser-index-revision" content="', 1)[1][:16]
+
+        generator.data = test_data[:5]
+        generator.generate(out, force=True, offline=True)
+        assert revision not in (out / "index.html").read_text()
+
+    def test_unchanged_revisions(self, test_data, tmp_path):
+        """Test that redeploying changed data changes only the affected revisions."""
+        generator = BrowserGenerator(test_data)
+        generator.generate(tmp_path / "a", offline=True)
+        generator.data = [dict(r, title=r["title"].upper()) for r in test_data]
+        generator.generate(tmp_path / "b", offline=True)
+        before, after = manifest_of(tmp_path / "a"), manifest_of(tmp_path / "b")
+        changed = {a["url"] for a, b in zip(before, after) if a["revision"] != b["revision"]}
+        assert {"index.html", "data.js"} <= changed and "schema.js" not in changed
+
+    def test_not_offline_by_default(self, test_data, tmp_path):
+        """Test that browsers have no service worker unless asked."""
+        BrowserGenerator(test_data).generate(tmp_path / "browser")
+        assert not (tmp_path / "browser" / "sw.js").exists()
+        assert '<meta name="linkml-browser-service-worker"' not in (tmp_path / "browser" / "index.html").read_text()
+
+    def test_gallery_assets_are_precached(self, tmp_path):
+        """Test that gallery pages precache the shared assets they link."""
+        data = Path(__file__).parent / "test_data.json"
+        (tmp_path / "manifest.json").write_text(json.dumps({
+            "output": "site",
+            "galleries": {"books": {"data": str(data), "offline": True}},
+        }))
+        build_all(load_manifest(tmp_path / "manifest.json"), workers=1)
+        urls = [entry["url"] for entry in manifest_of(tmp_path / "site" / "books")]
+        assert sorted(u.rsplit(".", 1)[1] for u in urls if u.startswith("../assets/")) == ["css", "js"]
+
+
+def test_add_offline_meta_replaces_tags():
+    """Test that repeated calls leave one set of tags."""
+    page = "<html><head><title>x</title></head><body></body></html>"
+    page = add_offline_meta(add_offline_meta(page, "a" * 16), "b" * 16)
+    assert page.count("linkml-browser-service-worker") == 1
+    assert "b" * 16 in page and "a" * 16 not in page
+    with pytest.raises(ValueError):
+        add_offline_meta("<body></body>", "a")
+
+
+def test_local_assets():
+    """Test that only relative stylesheets and scripts are listed."""
+    page = ('<link rel="stylesheet" href="../assets/a.css"><script src="data.js"></script>'
+            '<script src="https://cdn.example.org/x.js"></script><script src="//cdn.example.org/y.js"></script>'
+            '<script src="data.js"></script><a href="page.html">')
+    assert local_assets(page) == ["../assets/a.css", "data.js"]
+
+
+def test_deploy_offline_command(tmp_path):
+    """Test the --offline flag."""
+    out = tmp_path / "browser"
+    result = CliRunner().invoke(app, ["deploy", str(Path(__file__).parent / "test_data.json"), str(out), "--offline"])
+    assert result.exit_code == 0, result.output
+    assert "Created sw.js" in result.output
+    assert (out / "sw.js").exists()
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_service_worker_updates_only_changed_files(tmp_path):
+    """Test that an updated worker fetches changed files only, drops stale ones and serves from the cache."""
+    manifest = [{"url": "index.html", "revision": "r1"}, {"url": "data.js", "revision": "r2"},
+                {"url": "../assets/browser.js", "revision": "r3"}]
+    script = tmp_path / "sw.js"
+    script.write_text(SERVICE_WORKER_TEMPLATE.replace("__MANIFEST__", json.dumps(manifest)))
+    key = "https://example.org/gallery/{}?__linkml_browser_revision={}".format
+    previous = [key("index.html", "r1"), key("data.js", "r0"), "https://example.org/assets/browser.js?__linkml_browser_revision=r3"]
+    urls = ["https://example.org/gallery/", "https://example.org/gallery/data.js?x=1", "https://example.org/other.js"]
+
+    result = subprocess.run(["node", "-e", SW_HARNESS, str(script), json.dumps(previous), json.dumps(urls)],
+                            capture_output=True, text=True, check=True)
+    state = json.loads(result.stdout)
+    assert state["installFetches"] == ["https://example.org/gallery/data.js"]
+    assert state["keys"] == sorted([previous[0], previous[2], key("data.js", "r2")])
+    assert state["responses"] == [f"cached {previous[0]}", "network https://example.org/gallery/data.js", None]
+    assert state["fetched"] == []
@@ -0,0 +1,173 @@
+"""Tests for the browser's search syntax, run headlessly in Node."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from linkml_browser.core import BrowserGenerator, load_json_data
+
+ROOT = Path(__file__).parent.parent
+TEMPLATE = ROOT / "src" / "linkml_browser" / "index.html"
+JS_BENCH = ROOT / "benchmarks" / "js_bench.mjs"
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+
+def words(item, field):
+    """Lowercased tokens of one field, as the browser indexes them."""
+    value = item.get(field)
+    if value is None:
+        return []
+    text = " ".join(str(v) for v in value) if isinstance(value, list) else str(value)
+    return text.lower().split()
+
+
+def has_substring(item, fields, term):
+    return any(term in token for field in fields for token in words(item, field))
+
+
+def edit_distance(a, b):
+    """Optimal string alignment distance, counting adjacent transpositions as one edit."""
+    rows = [list(range(len(b) + 1))]
+    for i in range(1, len(a) + 1):
+        row = [i]
+        for j in range(1, len(b) + 1):
+            value = min(rows[-1][j] + 1, row[j - 1] + 1, rows[-1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, rows[-2][j - 2] + 1)
+            row.append(value)
+        rows.append(row)
+    return rows[-1][-1]
+
+
+def has_similar(item, fields, term, distance):
+    return any(term in token or edit_distance(term, token) <= distance
+               for field in fields for token in words(item, field))
+
+
+def has_phrase(item, fields, phrase):
+    target = phrase.lower().split()
+    for field in fields:
+        tokens = words(item, field)
+        if any(tokens[i:i + len(target)] == target for i in range(len(tokens))):
+            return True
+    return False
+
+
+SEARCHABLE = ["author", "description", "title", "id", "genre", "publisher", "language"]
+
+CASES = [
+    ("great", lambda r: has_substring(r, SEARCHABLE, "great")),
+    ("the great", lambda r: has_substring(r, SEARCHABLE, "the") and has_substring(r, SEARCHABLE, "great")),
+    ('"jazz age"', lambda r: has_phrase(r, SEARCHABLE, "jazz age")),
+    ('"the american"', lambda r: has_phrase(r, SEARCHABLE, "the american")),
+    ("title:war", lambda r: has_substring(r, ["title"], "war")),
+    ('description:"a classic"', lambda r: has_phrase(r, ["description"], "a classic")),
+    ("rating:4.2", lambda r: str(r.get("rating")) == "4.2"),
+    ("publication_year:>1900", lambda r: r["publication_year"] > 1900),
+    ("publication_year:1800..1900", lambda r: 1800 <= r["publication_year"] <= 1900),
+    ("publication_year:<=1813", lambda r: r["publication_year"] <= 1813),
+    ("rating:>4.2", lambda r: r["rating"] > 4.2),
+    ("rating:4.0..4.3", lambda r: 4.0 <= r["rating"] <= 4.3),
+    ("novel -american", lambda r: has_substring(r, SEARCHABLE, "novel")
+     and not has_substring(r, SEARCHABLE, "american")),
+    ("gatsby OR karenina", lambda r: has_substring(r, SEARCHABLE, "gatsby")
+     or has_substring(r, SEARCHABLE, "karenina")),
+    ("-(classic OR russian)", lambda r: not has_substring(r, SEARCHABLE, "classic")
+     and not has_substring(r, SEARCHABLE, "russian")),
+    ("(war OR peace) publication_year:>=1850", lambda r: r["publication_year"] >= 1850
+     and (has_substring(r, SEARCHABLE, "war") or has_substring(r, SEARCHABLE, "peace"))),
+    ("zzzz the", lambda r: False),
+    ("unknown:field", lambda r: has_substring(r, SEARCHABLE, "unknown:field")),
+    ("gatsbi~", lambda r: has_similar(r, SEARCHABLE, "gatsbi", 1)),
+    ("fitzgeral~", lambda r: has_similar(r, SEARCHABLE, "fitzgeral", 2)),
+    ("tolstoi~2", lambda r: has_similar(r, SEARCHABLE, "tolstoi", 2)),
+    ("title:pride~ -austin~", lambda r: has_similar(r, ["title"], "pride", 1)
+     and not has_similar(r, SEARCHABLE, "austin", 1)),
+    ("gastby~", lambda r: has_similar(r, SEARCHABLE, "gastby", 1)),
+    ("tolsoty~1", lambda r: has_similar(r, SEARCHABLE, "tolsoty", 1)),
+    ("mockinbgird~1", lambda r: has_similar(r, SEARCHABLE, "mockinbgird", 1)),
+    ("gatsbi~0", lambda r: has_substring(r, SEARCHABLE, "gatsbi")),
+    ('"gatsbi~"', lambda r: has_phrase(r, SEARCHABLE, "gatsbi~")),
+]
+
+# With the Fuzzy toggle on, terms of 5+ letters allow one typo and 9+ two
+FUZZY_CASES = [
+    ("gatsbi", lambda r: has_similar(r, SEARCHABLE, "gatsbi", 1)),
+    ("dostoevsky", lambda r: has_similar(r, SEARCHABLE, "dostoevsky", 2)),
+    ("wra", lambda r: has_substring(r, SEARCHABLE, "wra")),
+    ("karneina", lambda r: has_similar(r, SEARCHABLE, "karneina", 1)),
+    ("novle classic", lambda r: has_similar(r, SEARCHABLE, "novle", 1) and has_similar(r, SEARCHABLE, "classic", 1)),
+]
+
+
+@pytest.fixture(scope="module")
+def results(tmp_path_factory):
+    """Run every case through the browser engine and return result indices by query."""
+    data = load_json_data(ROOT / "tests" / "test_data.json")
+    schema = BrowserGenerator(data).schema
+    assert sorted(schema["searchableFields"]) == sorted(SEARCHABLE)
+    input_path = tmp_path_factory.mktemp("query") / "input.json"
+    input_path.write_text(json.dumps({
+        "data": data,
+        "schema": schema,
+        "queries": [{"query": query, "filters": {}} for query, _ in CASES]
+        + [{"query": query, "filters": {}, "fuzzy": True} for query, _ in FUZZY_CASES],
+    }))
+    proc = subprocess.run(["node", str(JS_BENCH), str(TEMPLATE), str(input_path)],
+                          check=True, capture_output=True, text=True)
+    report = json.loads(proc.stdout)
+    counts = [q["results"] for q in report["queries"]]
+    return data, dict(zip([query for query, _ in CASES], counts)), dict(zip([query for query, _ in FUZZY_CASES], counts[len(CASES):]))
+
+
+@pytest.mark.parametrize("query,predicate", CASES, ids=[query for query, _ in CASES])
+def test_query_syntax(results, query, predicate):
+    """Test each syntax form against a reference implementation."""
+    data, counts, _ = results
+    assert counts[query] == sum(1 for record in data if predicate(record))
+
+
+@pytest.mark.parametrize("query,predicate", FUZZY_CASES, ids=[query for query, _ in FUZZY_CASES])
+def test_fuzzy_toggle(results, query, predicate):
+    """Test typo-tolerant matching with the Fuzzy toggle on."""
+    data, _, counts = results
+    assert counts[query] == sum(1 for record in data if predicate(record))
+
+
+def test_fuzzy_matches_typos(results):
+    """Test that misspelled names still find their records."""
+    _, counts, fuzzy_counts = results
+    assert counts["gatsbi~"] > 0 and counts["gatsbi~0"] == 0
+    assert counts["fitzgeral~"] > 0
+    # Adjacent letters swapped inside a word are one edit
+    assert counts["gastby~"] > 0 and counts["tolsoty~1"] > 0 and counts["mockinbgird~1"] > 0
+    assert fuzzy_counts["karneina"] > 0
+    assert fuzzy_counts["gatsbi"] == counts["gatsbi~"]
+
+
+def test_progressive_boot(results, tmp_path):
+    """Test that a sliced boot shows records at once and ends with the same results."""
+    data, counts, _ = results
+    schema = BrowserGenerator(data).schema
+    schema["progressiveBootRecords"] = 1
+    input_path = tmp_path / "input.json"
+    input_path.write_text(json.dumps({
+        "data": data,
+        "schema": schema,
+        "progressive": True,
+        "bootQueries": ["", "great", "-great"],
+        "queries": [{"query": query, "filters": {}} for query, _ in CASES],
+    }))
+    proc = subprocess.run(["node", str(JS_BENCH), str(TEMPLATE), str(input_path)],
+                          check=True, capture_output=True, text=True)
+    report = json.loads(proc.stdout)
+    assert report["boot_queries"] == [
+        {"query": "", "indexed": 0, "results": len(data)},
+        {"query": "great", "indexed": 0, "results": 0},
+        {"query": "-great", "indexed": 0, "results": 0},
+    ]
+    assert {q["query"]: q["results"] for q in report["queries"]} == counts
@@ -0,0 +1,164 @@
+"""Tests for streaming records out of deployed browsers."""
+
+import io
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from linkml_browser.core import BrowserGenerator, load_json_data
+from linkml_browser.main import app
+from linkml_browser.reader import (
+    iter_json_array,
+    iter_records,
+    match_records,
+    read_js_value,
+    sample_records,
+)
+from linkml_browser.serialize import write_records_js
+
+RECORDS = [
+    {"id": i, "big": 12345678901234567890 + i, "score": i * 1.5, "text": 'é "]},[{' * (i % 4), "tags": ["x", str(i % 3)],
+     "nested": [1, [2, {"n": None}]]}
+    for i in range(60)
+]
+
+
+@pytest.fixture
+def test_data():
+    """Load test data fixture."""
+    return load_json_data(Path(__file__).parent / "test_data.json")
+
+
+@pytest.fixture
+def deployed(test_data, tmp_path):
+    """A deployed browser with SQLite and binary exports."""
+    out = tmp_path / "browser"
+    BrowserGenerator(test_data).generate(out, binary_index=True, sqlite=True)
+    return out
+
+
+class TestIterJsonArray:
+    """Test the incremental array parser."""
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    @pytest.mark.parametrize("block_size", [1, 3, 64, 1 << 20])
+    def test_block_boundaries(self, indent, block_size):
+        """Test that elements split across blocks are parsed whole."""
+        text = f"window.searchData = {json.dumps(RECORDS, indent=indent)};\nwindow.dispatchEvent(new Event('x'));\n"
+        assert list(iter_json_array(io.StringIO(text), block_size=block_size)) == RECORDS
+
+    @pytest.mark.parametrize("block_size", [1, 2, 3])
+    def test_numbers_at_block_end(self, block_size):
+        """Test that numbers are not cut at block boundaries."""
+        assert list(iter_json_array(io.StringIO("[1, 22,333 ,4444]"), block_size=block_size)) == [1, 22, 333, 4444]
+
+    def test_empty(self):
+        """Test an empty array."""
+        assert list(iter_json_array(io.StringIO("x = [ ];"))) == []
+
+    @pytest.mark.parametrize("text,message", [
+        ("[1,]", "Trailing comma"),
+        ("[1 2]", "Expected ','"),
+        ("[1, 2", "Unterminated"),
+        ("[1, tru]", "Invalid JSON"),
+        ('window.searchSchema = {"a": [1]};', "JSON object"),
+        ("window.x = 1;", "No JSON array"),
+    ])
+    def test_errors(self, text, message):
+        """Test that malformed input raises ValueError."""
+        with pytest.raises(ValueError, match=message):
+            list(iter_json_array(io.StringIO(text), block_size=2))
+
+
+class TestIterRecords:
+    """Test reading every artifact format."""
+
+    @pytest.mark.parametrize("name", ["", "data.js", "data.sqlite", "index.lbi"])
+    def test_deployed_artifacts(self, deployed, test_data, name):
+        """Test that each artifact of a deployment yields the records in order."""
+        assert list(iter_records(deployed / name if name else deployed)) == test_data
+
+    def test_sqlite_path_with_uri_characters(self, deployed, test_data, tmp_path):
+        """Test that SQLite paths are escaped when opened as URIs."""
+        odd = tmp_path / "a?b#c%20d"
+        odd.mkdir()
+        shutil.copy(deployed / "data.sqlite", odd / "data.sqlite")
+        assert list(iter_records(odd / "data.sqlite")) == test_data
+
+    def test_json_and_json_lines(self, tmp_path):
+        """Test plain JSON arrays and JSON Lines."""
+        (tmp_path / "data.json").write_text(json.dumps(RECORDS))
+        (tmp_path / "data.jsonl").write_text("".join(json.dumps(r) + "\n\n" for r in RECORDS))
+        assert list(iter_records(tmp_path / "data.json", block_size=16)) == RECORDS
+        assert list(iter_records(tmp_path / "data.jsonl")) == RECORDS
+
+    def test_read_js_value(self, deployed):
+        """Test reading schema.js."""
+        schema = read_js_value(deployed / "schema.js")
+        assert schema["facets"] and schema["searchableFields"]
+
+    def test_streamed_rewrite(self, tmp_path):
+        """Test re-writing records straight from the reader."""
+        source, target = tmp_path / "a.js", tmp_path / "b.js"
+        write_records_js(source, RECORDS)
+        write_records_js(target, iter_records(source), chunk_size=7)
+        assert target.read_bytes() == source.read_bytes()
+
+
+class TestSelection:
+    """Test filtering and sampling."""
+
+    def test_match_records(self):
+        """Test field conditions on scalar and array values."""
+        assert [r["id"] for r in match_records(RECORDS, [("tags", "2"), ("score", "3")])] == [2]
+        assert len(list(match_records(RECORDS, [("tags", "x")]))) == 60
+        assert list(match_records(RECORDS, [("missing", "None")])) == []
+
+    def test_sample_records(self):
+        """Test that samples are seeded, sized and in input order."""
+        sample = sample_records(RECORDS, 10, seed=3)
+        ids = [r["id"] for r in sample]
+        assert len(ids) == 10 and ids == sorted(ids)
+        assert sample == sample_records(iter(RECORDS), 10, seed=3)
+        assert sample_records(RECORDS[:4], 10) == RECORDS[:4]
+
+
+class TestRecordsCommand:
+    """Test the records command."""
+
+    def test_json_lines_to_stdout(self, deployed, test_data):
+        """Test the default JSON Lines output."""
+        result = CliRunner().invoke(app, ["records", str(deployed), "--limit", "3"])
+        assert result.exit_code == 0, result.output
+        assert [json.loads(line) for line in result.output.splitlines()] == test_data[:3]
+
+    @pytest.mark.parametrize("suffix", [".js", ".json", ".jsonl"])
+    def test_output_files(self, deployed, test_data, tmp_path, suffix):
+        """Test filtered output in each format."""
+        output = tmp_path / f"english{suffix}"
+        result = CliRunner().invoke(app, ["records", str(deployed / "data.js"), "--where", "language=English",
+                                          "-o", str(output)])
+        expected = [r for r in test_data if r.get("language") == "English"]
+        assert result.exit_code == 0, result.output
+        assert f"Wrote {len(expected)} records" in result.output
+        assert list(iter_records(output)) == expected
+
+    def test_sample(self, deployed):
+        """Test sampling."""
+        result = CliRunner().invoke(app, ["records", str(deployed), "--sample", "5", "--seed", "1"])
+        assert len(result.output.splitlines()) == 5
+
+    def test_bad_condition(self, deployed):
+        """Test that malformed --where values are rejected."""
+        result = CliRunner().invoke(app, ["records", str(deployed), "--where", "language"])
+        assert result.exit_code == 1
+
+    def test_redeploy_from_data_js(self, deployed, test_data, tmp_path):
+        """Test that deploy accepts a deployed data.js."""
+        out = tmp_path / "again"
+        result = CliRunner().invoke(app, ["deploy", str(deployed / "data.js"), str(out)])
+        assert result.exit_code == 0, result.output
+        assert list(iter_records(out)) == test_data
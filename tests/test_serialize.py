@@ -0,0 +1,130 @@
+"""Tests for streaming serialization of data.js."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from linkml_browser import serialize
+from linkml_browser.core import BrowserGenerator, load_json_data
+from linkml_browser.reader import load_records
+from linkml_browser.serialize import READY_EVENT, write_json_js, write_records_js
+
+RECORDS = [
+    {"id": f"r{i}", "name": f"Record {i} é中", "tags": ["a", "b"][: i % 3], "score": i / 4, "flag": i % 2 == 0,
+     "nested": {"n": None}}
+    for i in range(23)
+]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run with orjson when it is installed, and with the standard library."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialize, "orjson", None)
+    return request.param
+
+
+def read_assignment(path):
+    """Split a written script into its JSON value and footer."""
+    text = path.read_text()
+    prefix, rest = text.split(" = ", 1)
+    payload, footer = rest.split(";\n", 1)
+    return prefix, payload, footer
+
+
+class TestWriteRecordsJs:
+    """Test chunked data.js output."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 23, 1000])
+    def test_minified(self, tmp_path, encoder, chunk_size):
+        """Test that minified output parses back to the records at any chunk size."""
+        path = tmp_path / "data.js"
+        written = write_records_js(path, RECORDS, chunk_size=chunk_size)
+        prefix, payload, footer = read_assignment(path)
+        assert prefix == "window.searchData"
+        assert json.loads(payload) == RECORDS
+        assert "\n" not in payload and ", " not in payload.replace("Record ", "")
+        assert footer == READY_EVENT
+        assert written == path.stat().st_size
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+    def test_pretty_matches_json_dumps(self, tmp_path, chunk_size, monkeypatch):
+        """Test that pretty output is json.dumps(records, indent=2)."""
+        monkeypatch.setattr(serialize, "orjson", None)
+        path = tmp_path / "data.js"
+        write_records_js(path, RECORDS, pretty=True, chunk_size=chunk_size)
+        assert read_assignment(path)[1] == json.dumps(RECORDS, indent=2, ensure_ascii=False)
+
+    def test_pretty_orjson(self, tmp_path):
+        """Test that orjson's pretty output is indented the same way."""
+        pytest.importorskip("orjson")
+        path = tmp_path / "data.js"
+        write_records_js(path, RECORDS, pretty=True, chunk_size=4)
+        assert read_assignment(path)[1] == json.dumps(RECORDS, indent=2, ensure_ascii=False)
+
+    @pytest.mark.parametrize("pretty", [False, True])
+    def test_empty(self, tmp_path, encoder, pretty):
+        """Test that no records give an empty array."""
+        path = tmp_path / "data.js"
+        write_records_js(path, [], pretty=pretty)
+        assert read_assignment(path)[1] == "[]"
+
+    def test_workers(self, tmp_path, encoder):
+        """Test that a process pool writes the same bytes as a single process."""
+        records = RECORDS * 20
+        serial, pooled = tmp_path / "serial.js", tmp_path / "pooled.js"
+        write_records_js(serial, records, workers=1, chunk_size=9)
+        write_records_js(pooled, records, workers=2, chunk_size=9)
+        assert pooled.read_bytes() == serial.read_bytes()
+
+    def test_orjson_fallback(self, tmp_path):
+        """Test that values orjson rejects are encoded by the standard library."""
+        pytest.importorskip("orjson")
+        records = [{"id": "big", "n": 2 ** 70}]
+        path = tmp_path / "data.js"
+        write_records_js(path, records)
+        assert json.loads(read_assignment(path)[1]) == records
+
+    @pytest.mark.parametrize("pretty", [False, True])
+    def test_encoders_agree(self, tmp_path, monkeypatch, pretty):
+        """Test that orjson and the standard library write the same records."""
+        pytest.importorskip("orjson")
+        records = RECORDS + [
+            {"id": "nan", "x": float("nan"), "y": [float("inf"), -float("inf")], "z": "naïve ☃ 𝄞"},
+            {"id": "exp", "big": 1e16, "small": 1.5e-7, "neg": -0.0},
+        ]
+        fast, standard = tmp_path / "fast.js", tmp_path / "standard.js"
+        write_records_js(fast, records, pretty=pretty, chunk_size=7)
+        monkeypatch.setattr(serialize, "orjson", None)
+        write_records_js(standard, records, pretty=pretty, chunk_size=7)
+        assert json.loads(read_assignment(fast)[1]) == json.loads(read_assignment(standard)[1])
+        assert json.loads(read_assignment(standard)[1])[-2]["y"] == [None, None]
+        # Bytes differ only in how exponents are spelled
+        assert fast.read_bytes().replace(b"e-7", b"e-07").replace(b"e16", b"e+16") == standard.read_bytes()
+
+    def test_lone_surrogates(self, tmp_path, encoder):
+        """Test that text with no UTF-8 encoding is written escaped."""
+        path = tmp_path / "data.js"
+        write_records_js(path, [{"id": "\ud800"}])
+        assert json.loads(read_assignment(path)[1]) == [{"id": "\ud800"}]
+
+
+def test_write_json_js(tmp_path):
+    """Test small value scripts in both modes."""
+    path = tmp_path / "schema.js"
+    write_json_js(path, {"title": "T", "facets": []}, "window.searchSchema")
+    assert path.read_text() == 'window.searchSchema = {"title":"T","facets":[]};\n' + READY_EVENT
+    write_json_js(path, {"title": "T"}, "window.searchSchema", pretty=True)
+    assert read_assignment(path)[1] == '{\n  "title": "T"\n}'
+
+
+def test_generate_round_trip(tmp_path):
+    """Test that generated data.js and schema.js load back."""
+    data = load_json_data(Path(__file__).parent / "test_data.json")
+    generator = BrowserGenerator(data)
+    generator.generate(tmp_path / "out")
+    assert load_records(tmp_path / "out" / "data.js") == data
+    assert json.loads(read_assignment(tmp_path / "out" / "schema.js")[1]) == generator.schema
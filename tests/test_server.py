@@ -0,0 +1,285 @@
+"""Tests for the query engine and the local search server."""
+
+import asyncio
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from urllib.parse import urlencode
+
+import pytest
+
+from linkml_browser.core import BrowserGenerator, load_json_data
+from linkml_browser.index_format import open_index, write_index
+from linkml_browser.query import (
+    DatasetIndex,
+    js_string,
+    parse_date,
+    parse_datetime,
+    parse_float,
+    search_syntax,
+)
+from linkml_browser.server import BrowserServer
+from linkml_browser.sqlite_export import open_sqlite, write_sqlite
+
+# The first record lists x twice
+REPEATED = [{"id": "a", "tags": ["x", "x", "y"]}, {"id": "b", "tags": ["x"]}]
+REPEATED_SCHEMA = {
+    "searchableFields": ["id"],
+    "facets": [{"field": "tags", "type": "array"}],
+    "displayFields": [{"field": "id", "type": "string"}],
+}
+
+ROOT = Path(__file__).parent.parent
+TEMPLATE = ROOT / "src" / "linkml_browser" / "index.html"
+JS_BENCH = ROOT / "benchmarks" / "js_bench.mjs"
+
+# A small is_a tree: thing > animal > {dog, cat}, thing > plant
+TREE = [
+    {"name": "thing", "is_a": None},
+    {"name": "animal", "is_a": "thing"},
+    {"name": "dog", "is_a": "animal"},
+    {"name": "cat", "is_a": "animal"},
+    {"name": "plant", "is_a": "thing"},
+]
+TREE_SCHEMA = {
+    "searchableFields": ["name"],
+    "facets": [{"field": "is_a", "type": "hierarchy", "idField": "name"}],
+}
+
+
+@pytest.fixture
+def test_data():
+    """Load test data fixture."""
+    return load_json_data(Path(__file__).parent / "test_data.json")
+
+
+def engines(data, schema, tmp_path):
+    """Build the in-memory, memory-mapped and SQLite engines over a dataset."""
+    write_index(tmp_path / "index.lbi", data, schema)
+    write_sqlite(tmp_path / "data.sqlite", data, schema)
+    return [DatasetIndex(data, schema), open_index(tmp_path / "index.lbi"), open_sqlite(tmp_path / "data.sqlite")]
+
+
+@pytest.fixture
+def index(test_data):
+    """Build a query engine over the test data."""
+    schema = BrowserGenerator(test_data).schema
+    return DatasetIndex(test_data, schema)
+
+
+class TestDatasetIndex:
+    """Test that the query engine follows the browser's search semantics."""
+
+    def test_js_string(self):
+        """Test facet keys match JavaScript's String()."""
+        assert js_string(True) == "true"
+        assert js_string(1925) == "1925"
+        assert js_string(4.0) == "4"
+        assert js_string(4.2) == "4.2"
+        assert js_string(["a", "b"]) == "a,b"
+
+    def test_empty_query_returns_all(self, index, test_data):
+        """Test that no query and no filters match every record."""
+        assert index.search() == list(range(len(test_data)))
+
+    def test_substring_and_implicit_and(self, index, test_data):
+        """Test partial token matching with all tokens required."""
+        results = index.search("gats")
+        assert [test_data[i]["title"] for i in results] == ["The Great Gatsby"]
+        assert index.search("gatsby mockingbird") == []
+
+    def test_facet_filters(self, index, test_data):
+        """Test array AND, scalar OR and integer range filters."""
+        results = index.search(filters={"genre": ["Fiction", "Classic"]})
+        assert results
+        assert all({"Fiction", "Classic"} <= set(test_data[i]["genre"]) for i in results)
+
+        results = index.search(filters={"publication_year": {"min": 1900, "max": 1950}})
+        assert results
+        assert all(1900 <= test_data[i]["publication_year"] <= 1950 for i in results)
+
+    def test_float_range_filter(self, index, test_data):
+        """Test that float facets filter by parsed floats."""
+        results = index.search(filters={"rating": {"min": 4.2, "max": 4.4}})
+        assert results == [i for i, item in enumerate(test_data) if 4.2 <= item["rating"] <= 4.4]
+        assert index.facet_ranges()["rating"] == {
+            "min": min(item["rating"] for item in test_data),
+            "max": max(item["rating"] for item in test_data),
+        }
+
+    def test_parse_float(self):
+        """Test parsing like JavaScript's parseFloat()."""
+        assert parse_float("4.25") == 4.25
+        assert parse_float(" -1e3x") == -1000.0
+        assert parse_float(".5") == 0.5
+        assert parse_float("abc") is None
+
+    def test_parse_dates(self):
+        """Test dates as epoch days and datetimes as epoch milliseconds."""
+        assert parse_date("1970-01-02") == 1
+        assert parse_date("1969-12-31T23:00:00Z") == -1
+        assert parse_date("2024-02-30") is None
+        assert parse_datetime("1970-01-01T00:00:01.5Z") == 1500
+        assert parse_datetime("1970-01-01T02:00:00+02:00") == 0
+        assert parse_datetime("1970-01-01T00:01") == 60_000
+
+    def test_search_syntax(self):
+        """Test that syntax is detected with the browser's lexer rules."""
+        fields = ["title", "year"]
+        assert search_syntax("great gatsby", fields) is None
+        assert search_syntax("year:>1900", fields) == "field:value terms"
+        assert search_syntax("other:value e-mail 5~x", fields) is None
+        assert search_syntax("a AND b", fields) == "the AND operator"
+
+    def test_facet_counts(self, index, test_data):
+        """Test facet counts over a result set."""
+        counts = index.facet_counts(index.search("gatsby"))
+        assert counts["genre"] == {"Fiction": 1, "Classic": 1}
+
+
+class TestEngines:
+    """Test that every server engine follows the browser's facet semantics."""
+
+    def test_hierarchy_facet(self, tmp_path):
+        """Test that a selected node matches and counts its whole subtree."""
+        for engine in engines(TREE, TREE_SCHEMA, tmp_path):
+            assert engine.search(filters={"is_a": ["animal"]}) == [1, 2, 3]
+            assert engine.search(filters={"is_a": ["dog", "plant"]}) == [2, 4]
+            counts = engine.facet_counts(engine.search("a"))
+            assert counts["is_a"] == {"thing": 3, "animal": 2, "cat": 1, "plant": 1}
+
+
+    def test_repeated_array_value(self, tmp_path):
+        """Test that a value repeated within one record counts that record once."""
+        data, schema = REPEATED, REPEATED_SCHEMA
+        for engine in engines(data, schema, tmp_path):
+            assert engine.facet_counts([0, 1])["tags"] == {"x": 2, "y": 1}
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+    def test_repeated_array_value_in_browser(self, tmp_path):
+        """Test that the browser counts a repeated value once per record too."""
+        data, schema = REPEATED, REPEATED_SCHEMA
+        (tmp_path / "input.json").write_text(json.dumps({
+            "data": data, "schema": schema, "queries": [{"query": "", "filters": {}}], "reportFacets": True,
+        }))
+        proc = subprocess.run(["node", str(JS_BENCH), str(TEMPLATE), str(tmp_path / "input.json")],
+                              check=True, capture_output=True, text=True)
+        assert dict(json.loads(proc.stdout)["queries"][0]["facets"]["tags"]) == {"x": 2, "y": 1}
+
+
+class TestBrowserServer:
+    """Test the HTTP API."""
+
+    def request(self, server, target, headers=None):
+        return asyncio.run(server.respond("GET", target, headers or {}))
+
+    def test_search_endpoint(self, index, test_data):
+        """Test that search returns a page, the total and facet counts."""
+        server = BrowserServer(index, index.schema)
+        status, _, body, headers = self.request(server, "/api/search?q=fiction&limit=5")
+        assert status == 200
+        payload = json.loads(body)
+        assert payload["total"] > 5
+        assert len(payload["records"]) == 5
+        assert "genre" in payload["facets"]
+        assert "ETag" in headers
+
+    def test_etag_not_modified(self, index):
+        """Test that a matching If-None-Match is answered with 304."""
+        server = BrowserServer(index, index.schema)
+        _, _, _, headers = self.request(server, "/api/facets?q=classic")
+        status, _, body, _ = self.request(server, "/api/facets?q=classic", {"if-none-match": headers["ETag"]})
+        assert status == 304
+        assert body == b""
+
+    def test_bad_filters(self, index):
+        """Test that malformed filters are rejected."""
+        server = BrowserServer(index, index.schema)
+        status, _, body, _ = self.request(server, "/api/search?filters=notjson")
+        assert status == 400
+        assert "error" in json.loads(body)
+
+    @pytest.mark.parametrize("filters", [
+        '{"genre": 5}',
+        '{"genre": [{"a": 1}]}',
+        '{"publication_year": {"min": "x"}}',
+        '{"publication_year": {"max": [1]}}',
+    ])
+    def test_mistyped_filters(self, index, filters):
+        """Test that filters with values of the wrong type are rejected."""
+        server = BrowserServer(index, index.schema)
+        status, _, body, _ = self.request(server, f"/api/search?filters={filters}")
+        assert status == 400
+        assert "filter" in json.loads(body)["error"]
+
+    @pytest.mark.parametrize("query", [
+        "title:gatsby", '"great gatsby"', "gatsby OR karenina", "novel -american", "(war)", "gatsbi~",
+    ])
+    def test_search_syntax_is_rejected(self, index, query):
+        """Test that browser-only search syntax is refused rather than matched literally."""
+        server = BrowserServer(index, index.schema)
+        status, _, body, _ = self.request(server, f"/api/search?{urlencode({'q': query})}")
+        assert status == 400
+        assert "plain words" in json.loads(body)["error"]
+
+    def test_plain_words_with_syntax_characters(self, index):
+        """Test that prefixes of unknown fields and inner dashes stay plain words."""
+        server = BrowserServer(index, index.schema)
+        for query in ("NCBITaxon:9606", "well-known", "gatsby"):
+            status, _, _, _ = self.request(server, f"/api/search?{urlencode({'q': query})}")
+            assert status == 200
+
+    def test_internal_error(self, index, monkeypatch):
+        """Test that an unexpected error is answered with 500."""
+        def fail(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(index, "search", fail)
+        server = BrowserServer(index, index.schema)
+        status, _, body, headers = self.request(server, "/api/search?q=x")
+        assert status == 500
+        assert json.loads(body) == {"error": "Internal server error"}
+        assert "ETag" not in headers
+
+    def test_remote_data_js(self, index):
+        """Test that data.js switches the browser into remote mode."""
+        server = BrowserServer(index, index.schema)
+        status, _, body, _ = self.request(server, "/data.js")
+        assert status == 200
+        assert b"window.searchRemote" in body
+
+    def test_indexes_js(self, index):
+        """Test that the indexes.js the page loads is served without indexes."""
+        server = BrowserServer(index, index.schema)
+        status, content_type, body, _ = self.request(server, "/indexes.js")
+        assert status == 200
+        assert content_type.startswith("application/javascript")
+        assert body == b"window.searchIndexes = null;\n"
+
+    def test_http_round_trip(self, index):
+        """Test a keep-alive HTTP exchange over a real socket."""
+        server = BrowserServer(index, index.schema)
+
+        async def exchange():
+            listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for target in ("/api/records?limit=2", "/api/schema"):
+                writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(next(line.split(b":")[1] for line in head.split(b"\r\n")
+                                  if line.lower().startswith(b"content-length")))
+                responses.append((head, await reader.readexactly(length)))
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return responses
+
+        (head1, body1), (head2, body2) = asyncio.run(exchange())
+        assert head1.startswith(b"HTTP/1.1 200")
+        assert head2.startswith(b"HTTP/1.1 200")
+        assert b"Connection: keep-alive" in head2
+        assert len(json.loads(body1)["records"]) == 2
+        assert "facets" in json.loads(body2)
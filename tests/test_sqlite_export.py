@@ -0,0 +1,77 @@
+"""Tests for the SQLite export backend."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from linkml_browser.core import BrowserGenerator, load_json_data
+from linkml_browser.query import DatasetIndex
+from linkml_browser.sqlite_export import open_sqlite, write_sqlite
+
+
+@pytest.fixture
+def test_data():
+    """Load test data fixture."""
+    return load_json_data(Path(__file__).parent / "test_data.json")
+
+
+@pytest.fixture
+def schema(test_data):
+    """Infer a schema for the test data."""
+    return BrowserGenerator(test_data).schema
+
+
+@pytest.fixture
+def db_path(test_data, schema, tmp_path):
+    """Write a SQLite export."""
+    path = tmp_path / "data.sqlite"
+    write_sqlite(path, test_data, schema)
+    return path
+
+
+class TestSqliteIndex:
+    """Test that the SQLite backend answers queries like the in-memory index."""
+
+    QUERIES = [
+        ("", {}),
+        ("gats", {}),
+        ("of", {}),
+        ("the great", {}),
+        ("", {"genre": ["Fiction", "Classic"]}),
+        ("", {"language": ["English", "Russian"]}),
+        ("novel", {"publication_year": {"min": 1800, "max": 1900}}),
+        ("zzzz", {}),
+    ]
+
+    @pytest.mark.parametrize("query,filters", QUERIES)
+    def test_matches_in_memory_index(self, db_path, test_data, schema, query, filters):
+        """Test search results and facet counts against DatasetIndex."""
+        expected_index = DatasetIndex(test_data, schema)
+        expected = expected_index.search(query, filters)
+        index = open_sqlite(db_path)
+        assert index.search(query, filters) == expected
+        assert index.facet_counts(expected) == expected_index.facet_counts(expected)
+        assert index.facet_ranges() == expected_index.facet_ranges()
+
+    def test_records_and_schema(self, db_path, test_data, schema):
+        """Test that records and schema round-trip."""
+        index = open_sqlite(db_path)
+        assert len(index) == len(test_data)
+        assert index.get_record(1) == test_data[1]
+        assert index.schema == schema
+
+    def test_plain_sqlite_group_by(self, db_path):
+        """Test that facet counts are plain SQL for other clients."""
+        conn = sqlite3.connect(db_path)
+        rows = dict(conn.execute(
+            "SELECT value, COUNT(*) FROM facet_values WHERE field = 'language' GROUP BY value"
+        ).fetchall())
+        assert rows["English"] > 0
+
+    def test_rejects_other_databases(self, tmp_path):
+        """Test that unrelated SQLite files are rejected."""
+        path = tmp_path / "other.db"
+        sqlite3.connect(path).execute("CREATE TABLE t (x)").connection.commit()
+        with pytest.raises(ValueError):
+            open_sqlite(path)
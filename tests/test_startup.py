@@ -0,0 +1,62 @@
+"""Tests for CLI startup cost.
+
+Each check runs in a fresh interpreter, since the test session has already
+imported most of the package's dependencies.
+"""
+
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Imported only by the commands that need them
+HEAVY_MODULES = [
+    "linkml",
+    "linkml_runtime",
+    "numpy",
+    "sqlite3",
+    "asyncio",
+    "multiprocessing",
+    "yaml",
+]
+
+# Importing the CLI takes under 0.1 s; importing linkml_runtime alone takes 0.7 s
+STARTUP_BUDGET_MS = 400
+
+
+def run_python(code):
+    """Run code in a fresh interpreter and return its stdout and stderr."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+
+def loaded_heavy_modules(code):
+    """Heavy modules loaded after running code."""
+    stdout, _ = run_python(f"{code}\nimport sys, json\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    return json.loads(stdout.strip().splitlines()[-1])
+
+
+def test_cli_import_is_light():
+    """Test that importing the CLI loads none of the heavy dependencies."""
+    assert loaded_heavy_modules("import linkml_browser.main") == []
+
+
+def test_cli_import_budget():
+    """Test the cumulative import time of the CLI reported by -X importtime."""
+    _, stderr = run_python("import linkml_browser.main")
+    times = re.findall(r"^import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)$", stderr, re.M)
+    cumulative_us = sum(int(us) for us, name in times if name == "linkml_browser")
+    assert 0 < cumulative_us / 1000 < STARTUP_BUDGET_MS
+
+
+def test_deploy_does_not_load_linkml(tmp_path):
+    """Test that deploying JSON data leaves the LinkML toolchain unloaded."""
+    data = Path(__file__).parent / "test_data.json"
+    code = (
+        "from typer.testing import CliRunner\n"
+        "from linkml_browser.main import app\n"
+        f"result = CliRunner().invoke(app, ['deploy', {str(data)!r}, {str(tmp_path / 'out')!r}, '--validate'])\n"
+        "assert result.exit_code == 0, result.output"
+    )
+    assert not {"linkml", "linkml_runtime"} & set(loaded_heavy_modules(code))
@@ -0,0 +1,196 @@
+"""Tests for record validation before deployment."""
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from linkml_browser.core import BrowserGenerator, load_json_data
+from linkml_browser.main import app
+from linkml_browser.validation import (
+    check_record,
+    empty_report,
+    format_report,
+    merge_reports,
+    validate_records,
+)
+
+SCHEMA = {
+    "searchableFields": ["title"],
+    "facets": [
+        {"field": "genre", "type": "string"},
+        {"field": "tags", "type": "array"},
+        {"field": "year", "type": "integer"},
+        {"field": "rating", "type": "float"},
+        {"field": "available", "type": "boolean"},
+    ],
+}
+
+LINKML_SCHEMA = """\
+id: https://example.org/books
+name: books
+prefixes:
+  linkml: https://w3id.org/linkml/
+imports:
+  - linkml:types
+default_range: string
+classes:
+  Book:
+    attributes:
+      id:
+        identifier: true
+      title:
+        required: true
+      year:
+        range: integer
+"""
+
+
+@pytest.fixture
+def test_data():
+    """Load test data fixture."""
+    return load_json_data(Path(__file__).parent / "test_data.json")
+
+
+def bad_records(n):
+    """Records alternating between valid and a wrong-typed year."""
+    return [{"title": f"Book {i}", "year": 1900 + i if i % 2 else f"c. {i}"} for i in range(n)]
+
+
+class TestCheckRecord:
+    """Test the browser schema checks on single records."""
+
+    CASES = [
+        ({"genre": ["a", "b"]}, "genre: expected a single value, got an array"),
+        ({"genre": {"name": "a"}}, "genre: expected a single value, got an object"),
+        ({"tags": [{"name": "a"}]}, "tags: holds objects"),
+        ({"year": "nineteen"}, "year: not a valid integer"),
+        ({"year": True}, "year: not a valid integer"),
+        ({"rating": "high"}, "rating: not a valid float"),
+        ({"available": "yes"}, "available: not a boolean"),
+        ({"title": {"en": "Emma"}}, "title: searchable field holds objects"),
+    ]
+
+    @pytest.mark.parametrize("record,problem", CASES)
+    def test_problem(self, record, problem):
+        """Test that each wrong value is reported under its class."""
+        assert [p for p, _ in check_record(record, SCHEMA)] == [problem]
+
+    def test_valid_record(self):
+        """Test that well-typed and missing values pass."""
+        record = {"genre": "Fiction", "tags": ["a"], "year": "1999", "rating": 4.5, "available": False}
+        assert list(check_record(record, SCHEMA)) == []
+        assert list(check_record({"genre": None}, SCHEMA)) == []
+
+    def test_not_an_object(self):
+        """Test that non-object records are reported."""
+        assert list(check_record(["a"], SCHEMA)) == [("record: not a JSON object", ["a"])]
+
+    def test_test_data_is_valid(self, test_data):
+        """Test that the inferred schema accepts the data it was inferred from."""
+        schema = BrowserGenerator(test_data).schema
+        report = validate_records(test_data, schema, workers=1)
+        assert report == {"records": len(test_data), "problems": {}}
+
+
+class TestReports:
+    """Test report aggregation."""
+
+    def test_samples_are_bounded(self):
+        """Test that counts cover every record but samples stop at sample_size."""
+        report = validate_records(bad_records(100), SCHEMA, workers=1, sample_size=3)
+        entry = report["problems"]["year: not a valid integer"]
+        assert report["records"] == 100
+        assert entry["count"] == 50
+        assert [index for index, _ in entry["samples"]] == [0, 2, 4]
+        assert entry["samples"][0][1] == "'c. 0'"
+
+    def test_merge_reports(self):
+        """Test that merging adds counts and keeps the earliest samples."""
+        report = empty_report()
+        merge_reports(report, validate_records(bad_records(4), SCHEMA, workers=1), sample_size=3)
+        merge_reports(report, validate_records(bad_records(4), SCHEMA, workers=1), sample_size=3)
+        entry = report["problems"]["year: not a valid integer"]
+        assert report["records"] == 8
+        assert entry["count"] == 4
+        assert len(entry["samples"]) == 3
+
+    def test_chunks_match_single_pass(self):
+        """Test that chunked and pooled validation give the single-pass report."""
+        data = bad_records(250)
+        expected = validate_records(data, SCHEMA, workers=1)
+        assert validate_records(data, SCHEMA, workers=1, chunk_size=7) == expected
+        assert validate_records(iter(data), SCHEMA, workers=2, chunk_size=40) == expected
+
+    def test_format_report(self):
+        """Test the console rendering."""
+        text = format_report(validate_records(bad_records(4), SCHEMA, workers=1))
+        assert text.splitlines() == [
+            "Validated 4 records: 2 problems in 1 classes",
+            "  year: not a valid integer (2 records)",
+            "    record 0: 'c. 0'",
+            "    record 2: 'c. 2'",
+        ]
+        assert format_report(empty_report()) == "Validated 0 records: no problems found"
+
+
+class TestLinkmlValidation:
+    """Test validation against a LinkML schema."""
+
+    @pytest.fixture
+    def linkml_schema(self, tmp_path):
+        """Write a small LinkML schema."""
+        path = tmp_path / "books.yaml"
+        path.write_text(LINKML_SCHEMA)
+        return path
+
+    def test_problems_are_grouped(self, linkml_schema):
+        """Test that LinkML errors for different values share a class."""
+        data = [
+            {"id": "b1", "title": "Emma", "year": 1815},
+            {"id": "b2", "year": "soon"},
+            {"id": "b3", "title": "Persuasion", "year": "later"},
+        ]
+        report = validate_records(data, {}, linkml_schema, "Book", workers=1)
+        problems = report["problems"]
+        assert problems["linkml: value is not of type 'integer', 'null' in /year"]["count"] == 2
+        assert problems["linkml: value is not of type 'integer', 'null' in /year"]["samples"] == [[1, "'b2'"], [2, "'b3'"]]
+        assert problems["linkml: 'title' is a required property in /"]["count"] == 1
+
+    def test_pool(self, linkml_schema):
+        """Test that workers build their own LinkML validator."""
+        data = [{"id": f"b{i}", "title": "T", "year": i if i % 3 else "x"} for i in range(30)]
+        expected = validate_records(data, {}, linkml_schema, "Book", workers=1)
+        assert expected["problems"]["linkml: value is not of type 'integer', 'null' in /year"]["count"] == 10
+        assert validate_records(data, {}, linkml_schema, "Book", workers=2, chunk_size=8) == expected
+
+
+class TestDeployValidate:
+    """Test the --validate option of deploy."""
+
+    def test_invalid_data_is_not_deployed(self, tmp_path):
+        """Test that problems stop the deployment with exit status 1."""
+        data_file = tmp_path / "data.json"
+        schema_file = tmp_path / "schema.json"
+        data_file.write_text(json.dumps(bad_records(6)))
+        schema_file.write_text(json.dumps({"title": "Books", **SCHEMA}))
+        output = tmp_path / "out"
+
+        result = CliRunner().invoke(app, ["deploy", str(data_file), str(output), "--schema", str(schema_file), "--validate"])
+
+        assert result.exit_code == 1
+        assert "year: not a valid integer (3 records)" in result.output
+        assert not output.exists()
+
+    def test_valid_data_is_deployed(self, tmp_path):
+        """Test that a clean report lets generation proceed."""
+        data_file = tmp_path / "data.json"
+        data_file.write_text(json.dumps([{"title": "Emma", "year": 1815}]))
+        output = tmp_path / "out"
+
+        result = CliRunner().invoke(app, ["deploy", str(data_file), str(output), "--validate"])
+
+        assert result.exit_code == 0, result.output
+        assert "Validated 1 records: no problems found" in result.output
+        assert (output / "data.js").exists()